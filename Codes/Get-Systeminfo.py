@@ -1,353 +1,343 @@
-import psutil
-import platform
-import wmi
-import re
-import subprocess
-import os
+import argparse
 import json
-import winreg
+import os
+import sys
+import time
 
-# Helper Functions
-def get_memory_type(memory_type_code):
-    """Decode SMBIOS memory type code into DDR type."""
-    memory_types = {
-        21: "DDR3",
-        24: "DDR4",
-        26: "DDR5"
-    }
-    return memory_types.get(memory_type_code, f"Unknown (Type Code: {memory_type_code})")
+from inventory import agent, diff, emit, engine, replay, sections
+from inventory.helpers import bytes_to_gb, cache_dir
+from inventory.office_cache import license_cache
 
-def get_cpu_generation(cpu_name):
-    """Estimate CPU generation based on name."""
-    if "Intel" in cpu_name:
-        match = re.search(r"i[3579]-(\d)", cpu_name)
-        if match:
-            gen = int(match.group(1))
-            generations = {
-                7: "7th Gen (Kaby Lake)",
-                8: "8th Gen (Coffee Lake)",
-                9: "9th Gen (Coffee Lake Refresh)",
-                10: "10th Gen (Comet Lake/Ice Lake)",
-                11: "11th Gen (Tiger Lake)",
-                12: "12th Gen (Alder Lake)",
-                13: "13th Gen (Raptor Lake)"
-            }
-            return generations.get(gen, f"Generation {gen} (Look up for exact architecture)")
-    elif "Ryzen" in cpu_name:
-        match = re.search(r"Ryzen.*(\d{4})", cpu_name)
-        if match:
-            series = match.group(1)
-            series_map = {
-                "1000": "Ryzen 1000 Series (Zen)",
-                "2000": "Ryzen 2000 Series (Zen+)",
-                "3000": "Ryzen 3000 Series (Zen 2)",
-                "5000": "Ryzen 5000 Series (Zen 3)",
-                "7000": "Ryzen 7000 Series (Zen 4)"
-            }
-            return series_map.get(series, f"Ryzen Series {series} (Look up for exact architecture)")
-    return "Unknown Generation"
 
-def bytes_to_gb(bytes):
-    """Convert bytes to GB with 2 decimal places."""
-    if not bytes:
-        return "0 GB"
-    return f"{bytes / (1024**3):.2f} GB"
+# Print Report
+def reported(value, missing="Unknown"):
+    """Return a field for the text report; None is a value the system did not report (null in JSON)."""
+    return missing if value is None else value
 
-def estimate_camera_megapixels(camera_name):
-    """Estimate camera megapixels based on name."""
-    if not camera_name:
-        return "N/A"
-    camera_name = camera_name.lower()
-    if "hd" in camera_name or "720p" in camera_name:
-        return "Approx. 1 MP (720p HD)"
-    elif "1080p" in camera_name or "full hd" in camera_name:
-        return "Approx. 2 MP (1080p Full HD)"
-    elif "4k" in camera_name or "uhd" in camera_name:
-        return "Approx. 8 MP (4K UHD)"
-    return "Unknown (Megapixels not directly available)"
+def print_cpu(cpu_info):
+    print("----- Processor Details -----")
+    print(f"Processor Type: {cpu_info['name']}")
+    print(f"Manufacturer: {cpu_info['manufacturer']}")
+    print(f"Generation: {cpu_info['generation']}")
+    print(f"Current Speed: {cpu_info['speed']}")
+    print(f"Max Speed: {cpu_info['max_speed']}")
+    print(f"Cores: {reported(cpu_info['cores'])}")
+    print(f"Threads: {reported(cpu_info['threads'])}")
+    print(f"L1 Cache: {cpu_info['l1_cache']}")
+    print(f"L2 Cache: {cpu_info['l2_cache']}")
+    print(f"L3 Cache: {cpu_info['l3_cache']}")
+    print(f"Family (Decoded): {cpu_info['family']}")
 
-def wh_to_mah(watt_hours, voltage):
-    """Convert watt-hours to milliamp-hours."""
-    if not watt_hours or not voltage:
-        return "N/A (Voltage or capacity data unavailable)"
-    try:
-        return round((watt_hours * 1000) / voltage)
-    except (TypeError, ValueError):
-        return "N/A (Invalid data)"
+def print_ram(ram_info):
+    print("----- RAM Details -----")
+    print(f"Total RAM: {ram_info['total']}")
+    print(f"RAM Type: {reported(ram_info['type'])}")
+    print(f"RAM Speed: {ram_info['speed']}")
+    print(f"RAM Manufacturer: {ram_info['manufacturer']}")
+    print(f"RAM Part Number: {ram_info['part_number']}")
+    print(f"RAM Serial Number: {ram_info['serial_number']}")
 
-# Initialize WMI
-try:
-    wmi_obj = wmi.WMI()
-except Exception as e:
-    print(f"Error initializing WMI: {e}")
-    wmi_obj = None
+def print_processes(processes):
+    print("----- Top Processes -----")
+    if isinstance(processes.get("cpu"), str):
+        print(processes["cpu"])
+        return
+    print(f"Running Processes: {processes['count']}")
+    for title, key in (("By CPU", "cpu"), ("By Memory", "memory")):
+        print(f"{title}:")
+        for proc in processes[key]:
+            print(f"  {proc['name']} (PID {proc['pid']}): CPU {proc['cpu']}, Memory {proc['memory']}")
 
-# Gather CPU Information
-cpu_info = {}
-try:
-    cpu = wmi_obj.Win32_Processor()[0] if wmi_obj else None
-    cpu_info = {
-        "name": cpu.Name.strip() if cpu and cpu.Name else "Unknown",
-        "manufacturer": cpu.Manufacturer if cpu and cpu.Manufacturer else "Unknown",
-        "cores": cpu.NumberOfCores if cpu and cpu.NumberOfCores else "Unknown",
-        "threads": cpu.NumberOfLogicalProcessors if cpu and cpu.NumberOfLogicalProcessors else "Unknown",
-        "speed": f"{cpu.CurrentClockSpeed / 1000:.2f}" if cpu and cpu.CurrentClockSpeed else "Unknown",
-        "max_speed": f"{cpu.MaxClockSpeed / 1000:.2f}" if cpu and cpu.MaxClockSpeed else "Unknown",
-        "l1_cache": cpu.L1CacheSize / 1024 if cpu and hasattr(cpu, 'L1CacheSize') and cpu.L1CacheSize else "Unknown",
-        "l2_cache": cpu.L2CacheSize / 1024 if cpu and hasattr(cpu, 'L2CacheSize') and cpu.L2CacheSize else "Unknown",
-        "l3_cache": cpu.L3CacheSize / 1024 if cpu and hasattr(cpu, 'L3CacheSize') and cpu.L3CacheSize else "Unknown",
-        "family": cpu.Caption if cpu and cpu.Caption else "Unknown",
-        "generation": get_cpu_generation(cpu.Name if cpu and cpu.Name else "")
-    }
-except Exception as e:
-    cpu_info = {key: f"Error: {e}" for key in ["name", "manufacturer", "cores", "threads", "speed", "max_speed", "l1_cache", "l2_cache", "l3_cache", "family", "generation"]}
+def print_board(mb_info):
+    print("----- Motherboard Details -----")
+    print(f"Manufacturer: {mb_info['manufacturer']}")
+    print(f"Model: {mb_info['model']}")
+    print(f"Serial Number: {mb_info['serial_number']}")
 
-# Gather RAM Information
-ram_info = {}
-try:
-    ram = wmi_obj.Win32_PhysicalMemory() if wmi_obj else []
-    total_ram = psutil.virtual_memory().total if hasattr(psutil, 'virtual_memory') else 0
-    first_ram = ram[0] if ram else None
-    ram_info = {
-        "total": bytes_to_gb(total_ram),
-        "type": get_memory_type(first_ram.SMBIOSMemoryType if first_ram and hasattr(first_ram, 'SMBIOSMemoryType') else 0),
-        "speed": f"{first_ram.Speed} MHz" if first_ram and first_ram.Speed else "Unknown",
-        "manufacturer": first_ram.Manufacturer if first_ram and first_ram.Manufacturer else "Unknown",
-        "part_number": first_ram.PartNumber.strip() if first_ram and first_ram.PartNumber else "Unknown",
-        "serial_number": first_ram.SerialNumber.strip() if first_ram and first_ram.SerialNumber else "Unknown"
-    }
-except Exception as e:
-    ram_info = {key: f"Error: {e}" for key in ["total", "type", "speed", "manufacturer", "part_number", "serial_number"]}
+def print_battery(battery_info):
+    print("----- Battery Details -----")
+    print(f"Battery Name: {battery_info['name']}")
+    print(f"Manufacturer: {battery_info['manufacturer']}")
+    print(f"Chemistry: {reported(battery_info['chemistry'], 'N/A')}")
+    print(f"Design Capacity: {battery_info['design_capacity_wh']} ({battery_info['design_capacity_mah']})")
+    print(f"Full Charge Capacity: {battery_info['full_capacity_wh']} ({battery_info['full_capacity_mah']})")
+    print(f"Battery Health: {battery_info['health']}")
 
-# Gather Motherboard Information
-mb_info = {}
-try:
-    mb = wmi_obj.Win32_BaseBoard()[0] if wmi_obj else None
-    mb_info = {
-        "manufacturer": mb.Manufacturer if mb and mb.Manufacturer else "Unknown",
-        "model": mb.Product if mb and mb.Product else "Unknown",
-        "serial_number": mb.SerialNumber.strip() if mb and mb.SerialNumber else "Unknown"
-    }
-except Exception as e:
-    mb_info = {key: f"Error: {e}" for key in ["manufacturer", "model", "serial_number"]}
+def print_camera(camera_info):
+    print("----- Camera Details -----")
+    print(f"Camera Name: {camera_info['name']}")
+    print(f"Manufacturer: {camera_info['manufacturer']}")
+    print(f"Device ID: {camera_info['device_id']}")
+    print(f"Megapixels: {camera_info['megapixels']}")
 
-# Gather OS Information
-os_info = {}
-try:
-    os_info = {
-        "version": f"{platform.system()} {platform.release()}",
-        "build": platform.version()
-    }
-except Exception as e:
-    os_info = {key: f"Error: {e}" for key in ["version", "build"]}
+def print_ssd(ssd_details):
+    print("----- SSD Details -----")
+    for ssd in ssd_details:
+        if isinstance(ssd, str):
+            print(ssd)
+            continue
+        print(f"Model: {ssd['model']}, Manufacturer: {ssd['manufacturer']}, Size: {ssd['size']}, "
+              f"Interface: {ssd['interface']}, Serial Number: {ssd['serial_number']}")
+    if not ssd_details:
+        print("No SSD detected")
 
-# Gather Battery Information
-battery_info = {}
-try:
-    battery = psutil.sensors_battery() if hasattr(psutil, 'sensors_battery') else None
-    if battery and wmi_obj:
-        battery_static = wmi_obj.Win32_Battery()[0] if wmi_obj.Win32_Battery() else None
-        design_capacity = battery_static.DesignCapacity / 1000 if battery_static and battery_static.DesignCapacity else None  # mWh to Wh
-        full_capacity = battery_static.FullChargeCapacity / 1000 if battery_static and battery_static.FullChargeCapacity else None
-        voltage = battery_static.DesignVoltage / 1000 if battery_static and battery_static.DesignVoltage else 3.7  # mV to V, default 3.7V
-        health = round((full_capacity / design_capacity) * 100, 2) if design_capacity and full_capacity and design_capacity != 0 else "Unknown"
-        battery_info = {
-            "name": battery_static.Name if battery_static and battery_static.Name else "Battery",
-            "manufacturer": battery_static.Manufacturer if battery_static and battery_static.Manufacturer else "Unknown",
-            "chemistry": battery_static.Chemistry if battery_static and battery_static.Chemistry else "Unknown",
-            "design_capacity_wh": f"{design_capacity:.2f} Wh" if design_capacity else "Unknown",
-            "full_capacity_wh": f"{full_capacity:.2f} Wh" if full_capacity else "Unknown",
-            "design_capacity_mah": wh_to_mah(design_capacity, voltage) if design_capacity else "N/A",
-            "full_capacity_mah": wh_to_mah(full_capacity, voltage) if full_capacity else "N/A",
-            "health": f"{health} %" if health != "Unknown" else "Unknown"
-        }
-    else:
-        battery_info = {key: "N/A" for key in ["name", "manufacturer", "chemistry", "design_capacity_wh", "full_capacity_wh", "design_capacity_mah", "full_capacity_mah", "health"]}
-        battery_info["name"] = "No battery detected"
-except Exception as e:
-    battery_info = {key: f"Error: {e}" for key in ["name", "manufacturer", "chemistry", "design_capacity_wh", "full_capacity_wh", "design_capacity_mah", "full_capacity_mah", "health"]}
+def print_network(network_details):
+    print("----- Network Details -----")
+    for adapter in network_details:
+        if isinstance(adapter, str):
+            print(adapter)
+            continue
+        print(f"Adapter: {adapter['description']}")
+        print(f"  MAC Address: {adapter['mac']}")
+        print(f"  IP Address: {', '.join(adapter['ip']) or 'None'}")
+        print(f"  Subnet Mask: {', '.join(adapter['subnet']) or 'None'}")
+        print(f"  Default Gateway: {', '.join(adapter['gateway']) or 'None'}")
+        print(f"  DNS Servers: {', '.join(adapter['dns']) or 'None'}")
+    if not network_details:
+        print("No network adapters detected")
 
-# Gather Camera Information
-camera_info = {}
-try:
-    if wmi_obj:
-        cameras = [dev for dev in wmi_obj.Win32_PnPEntity() if getattr(dev, 'PNPClass', None) in ["Image", "Camera"]]
-        if cameras:
-            camera = cameras[0]
-            camera_info = {
-                "name": camera.Name if camera.Name else "Unknown",
-                "manufacturer": camera.Manufacturer if camera.Manufacturer else "Unknown",
-                "device_id": camera.DeviceID if camera.DeviceID else "Unknown",
-                "megapixels": estimate_camera_megapixels(camera.Name if camera.Name else "")
-            }
-        else:
-            camera_info = {"name": "No camera detected", "manufacturer": "N/A", "device_id": "N/A", "megapixels": "N/A"}
-    else:
-        camera_info = {"name": "No camera detected", "manufacturer": "N/A", "device_id": "N/A", "megapixels": "N/A"}
-except Exception as e:
-    camera_info = {key: f"Error: {e}" for key in ["name", "manufacturer", "device_id", "megapixels"]}
+def print_tpm(tpm_info):
+    print("----- TPM Details -----")
+    print(f"TPM Present: {tpm_info['present']}")
+    print(f"TPM Version: {tpm_info['version']}")
+    print(f"TPM Status: {tpm_info['status']}")
+
+def print_uefi(uefi_info):
+    print("----- UEFI Details -----")
+    print(f"UEFI Status: {uefi_info['status']}")
+    print(f"Secure Boot: {uefi_info['secure_boot']}")
 
-# Gather SSD Information
-ssd_details = []
-try:
-    if wmi_obj:
-        disks = wmi_obj.Win32_DiskDrive()
-        for disk in disks:
-            media_type = getattr(disk, 'MediaType', '').lower()
-            model = disk.Model.lower() if disk.Model else ""
-            if "ssd" in media_type or "ssd" in model:
-                ssd_details.append(
-                    f"Model: {disk.Model}, Manufacturer: {disk.Manufacturer if disk.Manufacturer else 'Unknown'}, "
-                    f"Size: {bytes_to_gb(int(disk.Size) if disk.Size else 0)}, Interface: {disk.InterfaceType if disk.InterfaceType else 'Unknown'}, "
-                    f"Serial Number: {disk.SerialNumber.strip() if disk.SerialNumber else 'Unknown'}"
-                )
-        if not ssd_details:
-            ssd_details.append("No SSD detected")
+def print_office(office):
+    print("----- Microsoft Office Details -----")
+    if isinstance(office["installed"], str):
+        # An error or timeout fills every field with its message
+        print(office["installed"])
+    elif not office["installed"]:
+        print("No Microsoft Office detected")
+    elif office["install_type"] == "Legacy":
+        print(f"Version: {office['version']}, Edition: Legacy Installation (Check Programs and Features for details), "
+              "License Status: Unknown (Legacy installation; use ospp.vbs manually)")
     else:
-        ssd_details.append("No SSD detected")
-except Exception as e:
-    ssd_details = [f"Error: {e}"]
+        status = office["license_status"] or "Unable to verify (ospp.vbs not found)"
+        key = f", Product Key (Last 5 chars): {office['product_key']}" if office["product_key"] else ""
+        print(f"Version: {office['version']}, Edition: {office['edition']}, License Status: {status}{key}")
 
-# Gather TPM Information
-tpm_info = {}
-try:
-    tpm_output = subprocess.check_output(["powershell", "-Command", "Get-Tpm | ConvertTo-Json"], text=True, stderr=subprocess.STDOUT)
-    tpm_data = json.loads(tpm_output)
-    tpm_info = {
-        "present": str(tpm_data.get("TpmPresent", False)),
-        "ready": str(tpm_data.get("TpmReady", False)),
-        "version": tpm_data.get("ManufacturerVersion", "Unknown"),
-        "status": "Enabled and Ready" if tpm_data.get("TpmPresent") and tpm_data.get("TpmReady") else "Not Ready or Disabled"
-    }
-except subprocess.CalledProcessError:
-    tpm_info = {"present": "False", "ready": "False", "version": "N/A", "status": "No TPM detected"}
-except Exception as e:
-    tpm_info = {key: f"Error: {e}" for key in ["present", "ready", "version", "status"]}
+def print_os(os_info):
+    print("----- Operating System Details -----")
+    print(f"OS: {os_info['version']}")
+    print(f"Build: {os_info['build']}")
 
-# Gather UEFI Status
-uefi_info = {}
-try:
-    systeminfo = subprocess.check_output("systeminfo", text=True)
-    if "BIOS Mode: UEFI" in systeminfo:
-        try:
-            secure_boot = subprocess.check_output(["powershell", "-Command", "Confirm-SecureBootUEFI"], text=True).strip()
-            uefi_info["status"] = "Enabled (UEFI Mode with Secure Boot)" if secure_boot == "True" else "Enabled (UEFI Mode without Secure Boot)"
-            uefi_info["secure_boot"] = "Enabled" if secure_boot == "True" else "Disabled"
-        except subprocess.CalledProcessError:
-            uefi_info["status"] = "Enabled (UEFI Mode, Secure Boot status unknown)"
-            uefi_info["secure_boot"] = "Unknown"
-    else:
-        uefi_info["status"] = "Disabled (Legacy/BIOS Mode)"
-        uefi_info["secure_boot"] = "N/A"
-except Exception as e:
-    uefi_info = {"status": f"Error: {e}", "secure_boot": "Unknown"}
+# Report order; the OS section has always come last
+PRINTERS = {
+    "cpu": print_cpu,
+    "ram": print_ram,
+    "processes": print_processes,
+    "board": print_board,
+    "battery": print_battery,
+    "camera": print_camera,
+    "ssd": print_ssd,
+    "network": print_network,
+    "tpm": print_tpm,
+    "uefi": print_uefi,
+    "office": print_office,
+    "os": print_os,
+}
 
-# Gather Microsoft Office Details
-def get_office_details():
-    try:
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"Software\Microsoft\Office\ClickToRun\Configuration")
-        office_version = winreg.QueryValueEx(key, "ProductReleaseIds")[0]
-        office_edition = office_version
-        winreg.CloseKey(key)
-        ospp_path = None
-        for base_path in [os.environ.get("ProgramFiles", "C:\\Program Files"), os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)")]:
-            for ver in ["Office16", "Office15", "Office14"]:
-                path = os.path.join(base_path, "Microsoft Office", ver, "ospp.vbs")
-                if os.path.exists(path):
-                    ospp_path = path
-                    break
-            if ospp_path:
-                break
-        if ospp_path:
-            license_output = subprocess.check_output(f'cscript //nologo "{ospp_path}" /dstatus', text=True)
-            license_status = "Unknown"
-            if "LICENSE STATUS:  ---LICENSED---" in license_output:
-                license_status = "Activated"
-            elif "LICENSE STATUS:  ---UNLICENSED---" in license_output:
-                license_status = "Not Activated"
-            elif "LICENSE STATUS:  ---GRACE---" in license_output:
-                license_status = "In Grace Period (Trial or Expired)"
-            match = re.search(r"Last 5 characters of installed product key: (\w{5})", license_output)
-            if match:
-                return f"Version: {office_version}, Edition: {office_edition}, License Status: {license_status}, Product Key (Last 5 chars): {match.group(1)}"
-            return f"Version: {office_version}, Edition: {office_edition}, License Status: {license_status}"
-        return f"Version: {office_version}, Edition: {office_edition}, License Status: Unable to verify (ospp.vbs not found)"
-    except FileNotFoundError:
-        try:
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"Software\Microsoft\Office")
-            subkeys = [winreg.EnumKey(key, i) for i in range(winreg.QueryInfoKey(key)[0]) if re.match(r"^\d+\.\d+$", winreg.EnumKey(key, i))]
-            winreg.CloseKey(key)
-            if subkeys:
-                office_version = max(subkeys)
-                return f"Version: {office_version}, Edition: Legacy Installation (Check Programs and Features for details), License Status: Unknown (Legacy installation; use ospp.vbs manually)"
-            return "No Microsoft Office detected"
-        except:
-            return "No Microsoft Office detected"
-    except Exception as e:
-        return f"Error retrieving Microsoft Office details: {str(e)}"
+def print_report(results):
+    print("===== System Information Report =====")
+    first = True
+    for name, printer in PRINTERS.items():
+        if name not in results:
+            continue
+        if not first:
+            print()
+        first = False
+        printer(results[name])
+    print("===== End of Report =====")
 
-office_details = get_office_details()
+def shown(value):
+    """Return a plain (JSON) value as the report would print it."""
+    if isinstance(value, dict) and "unit" in value and "value" in value:
+        if value.get("text"):
+            return value["text"]
+        return bytes_to_gb(value["value"]) if value["unit"] == "B" else f"{value['value']} {value['unit']}"
+    if isinstance(value, dict):
+        return ", ".join(f"{key}: {shown(item)}" for key, item in value.items())
+    if isinstance(value, list):
+        return "; ".join(shown(item) for item in value)
+    return "N/A" if value is None else str(value)
 
-# Print Report
-print("===== System Information Report =====")
-print("----- Processor Details -----")
-print(f"Processor Type: {cpu_info['name']}")
-print(f"Manufacturer: {cpu_info['manufacturer']}")
-print(f"Generation: {cpu_info['generation']}")
-print(f"Current Speed: {cpu_info['speed']} GHz")
-print(f"Max Speed: {cpu_info['max_speed']} GHz")
-print(f"Cores: {cpu_info['cores']}")
-print(f"Threads: {cpu_info['threads']}")
-print(f"L1 Cache: {cpu_info['l1_cache']} KB")
-print(f"L2 Cache: {cpu_info['l2_cache']} KB")
-print(f"L3 Cache: {cpu_info['l3_cache']} KB")
-print(f"Family (Decoded): {cpu_info['family']}")
+def print_changes(changes, since):
+    """Print the changes found by diff.diff(), grouped by section."""
+    print(f"===== Changes since {since} =====")
+    if not changes:
+        print("No changes")
+    section = None
+    for change in changes:
+        if change["section"] != section:
+            section = change["section"]
+            print(f"[{section}]")
+        where = f"{change['device']}: " if "device" in change else ""
+        field = f"{change['field']}: " if "field" in change else ""
+        if change["change"] == "changed":
+            print(f"  {where}{field}{shown(change['old'])} -> {shown(change['new'])}")
+        elif change["change"] == "unavailable":
+            print(f"  status: {change['old']} -> {change['new']}")
+        elif change["change"] == "added":
+            print(f"  Added {where}{field}{shown(change['new']) if 'new' in change else ''}".rstrip())
+        else:
+            print(f"  Removed {where}{field}{shown(change['old']) if 'old' in change else ''}".rstrip())
+    print("===== End of Changes =====")
 
-print("\n----- RAM Details -----")
-print(f"Total RAM: {ram_info['total']}")
-print(f"RAM Type: {ram_info['type']}")
-print(f"RAM Speed: {ram_info['speed']}")
-print(f"RAM Manufacturer: {ram_info['manufacturer']}")
-print(f"RAM Part Number: {ram_info['part_number']}")
-print(f"RAM Serial Number: {ram_info['serial_number']}")
+def print_timings(report, file=sys.stdout):
+    """Print how long each section and resource took, slowest first."""
+    print("----- Timings -----", file=file)
+    for name, elapsed in sorted(report.timings.items(), key=lambda item: -item[1]):
+        note = " (timed out)" if name in report.timed_out else ""
+        print(f"{name:<14} {elapsed * 1000:9.1f} ms{note}", file=file)
+    for name in sorted(report.cached):
+        print(f"{name:<14} {'cached':>12}", file=file)
+    print(f"{'total (wall)':<14} {report.wall * 1000:9.1f} ms", file=file)
 
-print("\n----- Motherboard Details -----")
-print(f"Manufacturer: {mb_info['manufacturer']}")
-print(f"Model: {mb_info['model']}")
-print(f"Serial Number: {mb_info['serial_number']}")
+def print_sample(sample):
+    """Print one sampler reading as a single line."""
+    parts = [time.strftime("%H:%M:%S", time.localtime(sample["time"]))]
+    if "memory_free_bytes" in sample:
+        parts.append(f"Free Memory: {bytes_to_gb(sample['memory_free_bytes']) if sample['memory_free_bytes'] is not None else 'N/A'}")
+    if "cpu_mhz" in sample:
+        parts.append(f"CPU Clock: {sample['cpu_mhz'] / 1000:.2f} GHz" if sample["cpu_mhz"] else "CPU Clock: N/A")
+    if "battery_percent" in sample:
+        parts.append(f"Battery: {sample['battery_percent']:.0f}%" if sample["battery_percent"] is not None else "Battery: N/A")
+    for mount, free in sample.get("disk_free_bytes", {}).items():
+        parts.append(f"{mount} Free: {bytes_to_gb(free) if free is not None else 'N/A'}")
+    print("  ".join(parts), flush=True)
 
-print("\n----- Battery Details -----")
-print(f"Battery Name: {battery_info['name']}")
-print(f"Manufacturer: {battery_info['manufacturer']}")
-print(f"Chemistry: {battery_info['chemistry']}")
-print(f"Design Capacity: {battery_info['design_capacity_wh']} ({battery_info['design_capacity_mah']} mAh)")
-print(f"Full Charge Capacity: {battery_info['full_capacity_wh']} ({battery_info['full_capacity_mah']} mAh)")
-print(f"Battery Health: {battery_info['health']}")
+def sample(args):
+    """Poll the dynamic metrics until interrupted or --samples readings were taken."""
+    from inventory import sampler
+    if args.sample_out:
+        sink = sampler.NdjsonFile(args.sample_out)
+    elif args.format == "text":
+        sink = print_sample
+    else:
+        sink = sampler.NdjsonFile(sys.stdout)
+    poller = sampler.Sampler(interval=args.sample, sink=sink)
+    try:
+        poller.run(count=args.samples)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.close()
+        if isinstance(sink, sampler.NdjsonFile):
+            sink.close()
+    if args.timings and poller.samples:
+        print(f"Sampling cost: {poller.cpu_seconds / poller.samples * 1000:.3f} ms CPU per sample over {poller.samples} samples",
+              file=sys.stderr)
 
-print("\n----- Camera Details -----")
-print(f"Camera Name: {camera_info['name']}")
-print(f"Manufacturer: {camera_info['manufacturer']}")
-print(f"Device ID: {camera_info['device_id']}")
-print(f"Megapixels: {camera_info['megapixels']}")
+def section_list(text):
+    """Parse a comma-separated list of section names for --only/--skip."""
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    known = sections.SECTIONS + sections.OPTIONAL
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown section {', '.join(unknown)} (choose from {', '.join(known)})")
+    return names
 
-print("\n----- SSD Details -----")
-for ssd in ssd_details:
-    print(ssd)
+def collect(selected, args, on_section=None):
+    """Return the report from the resident agent if one is running, else collect it here."""
+    report = None
+    client = None if args.no_agent else agent.connect()
+    if client is not None:
+        with client:
+            report = client.report(selected, refresh=args.no_cache, refresh_office=args.refresh_office,
+                                   timeout=args.timeout, deadline=args.deadline, on_section=on_section)
+        selected = [name for name in selected if name not in report.sections]
+        if not selected:
+            return report
+        # The agent went away part-way; collect the rest here
 
-print("\n----- TPM Details -----")
-print(f"TPM Present: {tpm_info['present']}")
-print(f"TPM Version: {tpm_info['version']}")
-print(f"TPM Status: {tpm_info['status']}")
+    # Unselected sections are never imported, so neither are the resources
+    # (WMI, PowerShell, cscript) that only they need. Nor is the snapshot
+    # cache and psutil under it, when the agent answered everything
+    from inventory.snapshot_cache import SnapshotCache
+    sections.load(selected)
+    # A replayed run must not read or overwrite this machine's snapshot
+    cache = None if args.no_cache or args.replay else SnapshotCache()
+    # Every section runs concurrently; see inventory/engine.py
+    local = engine.run(selected, cache=cache, on_section=on_section, timeout=args.timeout, deadline=args.deadline)
+    if report is None:
+        return local
+    report.merge(local)
+    return report
 
-print("\n----- UEFI Details -----")
-print(f"UEFI Status: {uefi_info['status']}")
-print(f"Secure Boot: {uefi_info['secure_boot']}")
+def main():
+    parser = argparse.ArgumentParser(description="Print a system information report.")
+    parser.add_argument("--replay", metavar="FIXTURE", help="serve WMI, PowerShell and Office results from a recorded fixture instead of the live system")
+    parser.add_argument("--replay-latency", metavar="SECONDS", help="sleep this long per replayed query, or 'recorded' to reuse the recorded timings")
+    parser.add_argument("--record", metavar="FIXTURE", help="save every WMI, PowerShell and Office result of this run to a fixture")
+    parser.add_argument("--only", metavar="SECTIONS", type=section_list, help="collect only these comma-separated sections, e.g. ram,ssd")
+    parser.add_argument("--skip", metavar="SECTIONS", type=section_list, default=[], help="leave out these comma-separated sections, e.g. tpm,uefi,office")
+    parser.add_argument("--top", action="store_true", help="add the busiest processes by CPU and memory after the RAM section")
+    parser.add_argument("--timings", action="store_true", help="print how long each section took")
+    parser.add_argument("--timeout", metavar="SECONDS", type=float, default=30.0,
+                        help="give up on a section that takes longer than this and report it as timed out (default: 30)")
+    parser.add_argument("--deadline", metavar="SECONDS", type=float,
+                        help="finish the whole report within this time, reporting unfinished sections as timed out")
+    parser.add_argument("--format", choices=["text", "json", "ndjson"], default="text",
+                        help="text report (default), or JSON/NDJSON with raw values and units, written section by section as each finishes")
+    parser.add_argument("--since", metavar="SNAPSHOT",
+                        help="print only what changed since SNAPSHOT, a report saved earlier with --format json or ndjson")
+    parser.add_argument("--no-cache", action="store_true", help="collect every section live and leave the snapshot cache untouched")
+    parser.add_argument("--refresh-office", action="store_true", help="re-run ospp.vbs even if the cached licence status is still valid")
+    parser.add_argument("--sample", metavar="SECONDS", type=float,
+                        help="instead of a report, print free memory, CPU clock, battery charge and disk free space every SECONDS")
+    parser.add_argument("--samples", metavar="N", type=int, help="with --sample, stop after N readings (default: run until Ctrl+C)")
+    parser.add_argument("--sample-out", metavar="FILE", help="with --sample, append the readings to FILE as NDJSON")
+    parser.add_argument("--no-agent", action="store_true", help="collect here even if the resident agent (sysinfo_agent.py) is running")
+    parser.add_argument("--office-cache-stats", action="store_true", help="print the Office licence cache hit/miss counts and exit")
+    args = parser.parse_args()
 
-print("\n----- Microsoft Office Details -----")
-print(office_details)
+    if args.office_cache_stats:
+        stats = license_cache.stats()
+        print(f"Office licence cache: {stats['hits']} hits, {stats['misses']} misses ({license_cache.path})")
+        return
+    if args.sample:
+        sample(args)
+        return
+    license_cache.refresh = args.refresh_office
+    if args.replay or args.record:
+        replay.configure(replay=args.replay, record=args.record, latency=args.replay_latency)
+    if args.replay:
+        # A replayed licence must not replace the one cached for this machine
+        license_cache.path = os.path.join(cache_dir(), "office_license_replay.json")
 
-print("\n----- Operating System Details -----")
-print(f"OS: {os_info['version']}")
-print(f"Build: {os_info['build']}")
+    wanted = list(sections.SECTIONS if args.only is None else args.only) + (["processes"] if args.top else [])
+    selected = [name for name in PRINTERS if name in wanted and name not in args.skip]
+    if args.since:
+        try:
+            old = diff.load(args.since)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(f"--since: cannot read {args.since}: {e}")
+        current = {}
+        report = collect(selected, args, on_section=lambda result: current.setdefault(result.name, result.to_dict()))
+        # Sections left out of this run are not reported as removed
+        changes = diff.diff({name: entry for name, entry in old.items() if name in current}, current)
+        changes.sort(key=lambda change: selected.index(change["section"]))
+        if args.format == "text":
+            print_changes(changes, args.since)
+        else:
+            for line in changes if args.format == "ndjson" else [{"since": args.since, "changes": changes}]:
+                print(json.dumps(line))
+    elif args.format == "text":
+        report = collect(selected, args)
+        print_report(report.sections)
+    else:
+        emitter = emit.JsonEmitter(sys.stdout) if args.format == "json" else emit.NdjsonEmitter(sys.stdout)
+        report = collect(selected, args, on_section=emitter.section)
+        emitter.finish(report)
+    if args.timings:
+        # Keep the structured output parseable
+        print_timings(report, sys.stdout if args.format == "text" else sys.stderr)
 
-print("===== End of Report =====")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Per-collector latency, allocation and memory benchmark over a replayed fixture.
+
+Every target runs in its own child process against the recorded fixture, so
+the suite runs the same on a Linux build box as on Windows, and each target's
+peak RSS is its own. Each child:
+
+  1. opens the target's resources once and makes one untimed warm-up call,
+  2. times --runs calls (p50/p95/p99, mean and max in milliseconds),
+  3. reads the process's peak RSS,
+  4. repeats --alloc-runs calls under tracemalloc to measure the Python memory
+     allocated at peak during one call and still held after it.
+
+Collector targets get a fresh WmiSession before every call, because a report
+run starts with an empty session cache. The fetch_* targets reuse one
+SystemModel, just as a refreshing SystemInfoFrame window does. "office" measures
+the licence cache hit and "office:cold" re-parses the ospp.vbs output every call.
+
+    python bench_collectors.py --out before.json
+    python bench_collectors.py --out after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from inventory import details, engine, replay, sections
+from inventory.office_cache import license_cache
+from inventory.tiers import SystemModel
+from inventory.wmi_session import WmiSession
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURE = os.path.join(HERE, "fixtures", "windows11_laptop.json")
+
+COLLECTORS = ("cpu", "ram", "board", "battery", "camera", "ssd", "network", "tpm", "uefi", "office", "office:cold")
+FETCHES = {
+    "fetch_os_details": details.os_details,
+    "fetch_hw_details": details.hw_details,
+    "fetch_cpu_details": details.cpu_details,
+    "fetch_network_details": details.network_details,
+}
+TARGETS = COLLECTORS + tuple(FETCHES)
+BASELINE = "baseline"
+
+
+class CollectorTarget:
+    """One section collector, called with a fresh WMI session and shared worker resources."""
+
+    def __init__(self, name):
+        self.name, _, mode = name.partition(":")
+        sections.load([self.name])
+        self.node = engine.lookup(self.name)
+        self.provider = replay.make_wmi_provider() if "wmi" in self.node.requires else None
+        self.shared = {}
+        for dep in self.node.requires:
+            if dep != "wmi":
+                self.shared[dep] = engine.lookup(dep).factory()
+        if self.name == "office":
+            license_cache.path = os.path.join(tempfile.mkdtemp(prefix="bench_office_"), "office_license.json")
+            license_cache.refresh = mode == "cold"
+
+    def prepare(self):
+        """Return (call, cleanup) for one measured call."""
+        session = WmiSession(self.provider) if self.provider is not None else None
+        args = [session if dep == "wmi" else self.shared[dep] for dep in self.node.requires]
+        return (lambda: self.node.func(*args)), (session.close if session is not None else _nothing)
+
+    def close(self):
+        for dep, value in self.shared.items():
+            close = engine.lookup(dep).close
+            if close and value is not None:
+                close(value)
+
+
+class FetchTarget:
+    """One SystemInfoFrame fetch_* method over a long-lived SystemModel."""
+
+    def __init__(self, name):
+        self.fetch = FETCHES[name]
+        self.session = WmiSession()
+        self.model = SystemModel(self.session)
+
+    def prepare(self):
+        return (lambda: self.fetch(self.model)), _nothing
+
+    def close(self):
+        self.session.close()
+
+
+class BaselineTarget:
+    """An empty call, giving the interpreter's own footprint with the inventory imported."""
+
+    def prepare(self):
+        return _nothing, _nothing
+
+    def close(self):
+        pass
+
+
+def _nothing():
+    pass
+
+def make_target(name):
+    if name == BASELINE:
+        return BaselineTarget()
+    if name in FETCHES:
+        return FetchTarget(name)
+    return CollectorTarget(name)
+
+def peak_rss():
+    """Return the peak resident set size of this process in bytes."""
+    if sys.platform == "win32":
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def percentiles(samples):
+    """Return the p50, p95 and p99 of samples."""
+    if len(samples) < 2:
+        return samples[0], samples[0], samples[0]
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def measure(name, runs, alloc_runs):
+    """Benchmark one target in this process and return its result dict."""
+    target = make_target(name)
+    try:
+        call, cleanup = target.prepare()
+        call()
+        cleanup()
+
+        times = []
+        for _ in range(runs):
+            call, cleanup = target.prepare()
+            start = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - start)
+            cleanup()
+        rss = peak_rss()
+
+        alloc_peaks = []
+        alloc_kept = []
+        tracemalloc.start()
+        for _ in range(alloc_runs):
+            call, cleanup = target.prepare()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call()
+            current, peak = tracemalloc.get_traced_memory()
+            alloc_peaks.append(peak - before)
+            alloc_kept.append(current - before)
+            cleanup()
+        tracemalloc.stop()
+    finally:
+        target.close()
+
+    p50, p95, p99 = percentiles(times)
+    return {
+        "runs": runs,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "mean_ms": statistics.fmean(times) * 1000,
+        "max_ms": max(times) * 1000,
+        "alloc_peak_bytes": int(statistics.median(alloc_peaks)) if alloc_peaks else None,
+        "alloc_retained_bytes": int(statistics.median(alloc_kept)) if alloc_kept else None,
+        "rss_peak_bytes": rss,
+    }
+
+def run_child(name, args):
+    """Run one target in a fresh interpreter and return its result dict."""
+    command = [sys.executable, os.path.abspath(__file__), "--child", name, "--fixture", args.fixture,
+               "--runs", str(args.runs), "--alloc-runs", str(args.alloc_runs)]
+    if args.latency:
+        command += ["--latency", args.latency]
+    proc = subprocess.run(command, capture_output=True, text=True, cwd=HERE)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return {"error": (proc.stderr.strip().splitlines() or ["child exited with code %d" % proc.returncode])[-1]}
+    return json.loads(lines[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=HERE).stdout.strip() or None
+    except OSError:
+        return None
+
+def print_results(data):
+    print(f"{'target':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'alloc KiB':>10} {'rss MiB':>8}")
+    for name, result in data["results"].items():
+        if "error" in result:
+            print(f"{name:<22} error: {result['error']}")
+            continue
+        print(f"{name:<22} {result['p50_ms']:9.3f} {result['p95_ms']:9.3f} {result['p99_ms']:9.3f} "
+              f"{result['alloc_peak_bytes'] / 1024:10.1f} {result['rss_peak_bytes'] / 2**20:8.1f}")
+    print(f"{'(baseline rss)':<22} {'':>9} {'':>9} {'':>9} {'':>10} {data['baseline_rss_bytes'] / 2**20:8.1f}")
+
+def compare(old, new, threshold):
+    """Print the change of every metric against an earlier results file; return the regressed targets."""
+    print(f"\n----- Against {old['meta'].get('commit') or 'baseline file'} -----")
+    print(f"{'target':<22} {'p50':>16} {'p95':>16} {'p99':>16} {'alloc':>8}")
+    regressed = []
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if not before or "error" in before or "error" in result:
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            change = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            cells.append(f"{before[key]:.3f}>{result[key]:.3f}".rjust(10) + f"{change:+5.0f}%")
+            if key == "p95_ms" and change > threshold:
+                regressed.append(name)
+        alloc = result["alloc_peak_bytes"] - before["alloc_peak_bytes"]
+        print(f"{name:<22} {cells[0]:>16} {cells[1]:>16} {cells[2]:>16} {alloc / 1024:+7.1f}K")
+    if regressed:
+        print(f"p95 regressed by more than {threshold:g}%: {', '.join(regressed)}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every collector against a replayed fixture.")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="fixture to replay (default: fixtures/windows11_laptop.json)")
+    parser.add_argument("--runs", type=int, default=200, help="timed calls per target (default: 200)")
+    parser.add_argument("--alloc-runs", type=int, default=20, help="calls per target under tracemalloc (default: 20)")
+    parser.add_argument("--latency", metavar="SECONDS", help="replayed query latency, or 'recorded'; default none, to measure the code alone")
+    parser.add_argument("--only", metavar="TARGET", nargs="+", choices=TARGETS, help="benchmark only these targets")
+    parser.add_argument("--out", metavar="JSON", help="write the results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="print the change against an earlier --out file")
+    parser.add_argument("--threshold", type=float, default=10.0, help="with --compare, exit 1 when a p95 grows by more than this percent (default: 10)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        replay.configure(replay=args.fixture, latency=args.latency)
+        print(json.dumps(measure(args.child, args.runs, args.alloc_runs)))
+        return
+
+    args.fixture = os.path.abspath(args.fixture)
+    data = {
+        "schema": 1,
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fixture": os.path.basename(args.fixture),
+            "runs": args.runs,
+            "alloc_runs": args.alloc_runs,
+            "latency": args.latency,
+        },
+        "baseline_rss_bytes": run_child(BASELINE, args).get("rss_peak_bytes"),
+        "results": {},
+    }
+    for name in args.only or TARGETS:
+        data["results"][name] = run_child(name, args)
+    print_results(data)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        if compare(old, data, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
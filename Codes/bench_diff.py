@@ -0,0 +1,91 @@
+"""Benchmark for the snapshot diff engine (inventory/diff.py).
+
+Two sweeps of --hosts synthetic hosts are made from a replay fixture's
+report, the second a JSON round trip of the first with --changed of the hosts
+altered: more RAM, a new disk, a TPM that timed out, a different Office
+licence. The benchmark times diff_hosts() over every pair
+
+  1. with both sides hashed from scratch,
+  2. with the old sweep's digests() passed back in, as a watcher comparing
+     each sweep against the last one would keep them, and
+  3. without the hash short-circuit, every section compared field by field,
+
+and checks that all three find the same changes.
+
+    python bench_diff.py --hosts 10000 --changed 0.05
+"""
+import argparse
+import json
+import random
+import time
+
+from bench_ingest import base_sections, synthesize
+from inventory import diff, fleet_standin
+
+
+def alter(sections, rng):
+    """Change one section of a host's report in place, as a hardware or licence change would."""
+    kind = rng.randrange(4)
+    if kind == 0:
+        sections["ram"]["data"]["total"]["value"] *= 2
+    elif kind == 1:
+        disk = dict(sections["ssd"]["data"][0], serial_number=f"NEW{rng.randrange(10 ** 8):08d}")
+        sections["ssd"]["data"].append(disk)
+    elif kind == 2:
+        sections["tpm"] = {"status": "timeout", "seconds": 30.0, "data": None}
+    else:
+        sections["office"]["data"]["license_status"] = "Notification"
+
+def full_walk(old, new):
+    """diff.diff() without the hash short-circuit: every section is compared field by field."""
+    changes = []
+    for name, entry in new.items():
+        if name in diff.IGNORED and diff.IGNORED[name] is None:
+            continue
+        before, after = old[name].get("status", "ok"), entry.get("status", "ok")
+        if before not in diff.GOOD or after not in diff.GOOD:
+            if before != after:
+                changes.append({"section": name, "change": "unavailable", "old": before, "new": after})
+            continue
+        diff._diff_value(name, diff._comparable(name, old[name].get("data")), diff._comparable(name, entry.get("data")), changes)
+    return changes
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark diffing two inventory sweeps.")
+    parser.add_argument("--hosts", type=int, default=10000, help="host pairs to diff (default: 10000)")
+    parser.add_argument("--changed", type=float, default=0.05, help="fraction of hosts that changed (default: 0.05)")
+    parser.add_argument("--fixture", default=fleet_standin.DEFAULT_FIXTURE, help="replay fixture the reports are made from")
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    base = base_sections(args.fixture)
+    # JSON round trips, so no two snapshots share objects, as when both sweeps are read from files
+    old = {host: json.loads(json.dumps(sections)) for host, sections in synthesize(base, args.hosts)}
+    new = {host: json.loads(json.dumps(sections)) for host, sections in old.items()}
+    changed = rng.sample(sorted(new), int(args.hosts * args.changed))
+    for host in changed:
+        alter(new[host], rng)
+    print(f"{args.hosts} host pairs, {len(changed)} changed, {len(base)} sections each")
+
+    fresh, seconds = timed(lambda: diff.diff_hosts({host: diff.Snapshot(s) for host, s in old.items()},
+                                                   {host: diff.Snapshot(s) for host, s in new.items()}))
+    print(f"  hashed from scratch   {seconds * 1000:8.1f} ms  {seconds / args.hosts * 1e6:6.1f} us/pair")
+
+    kept = {host: diff.Snapshot(s, diff.Snapshot(s).digests()) for host, s in old.items()}
+    cached, seconds = timed(lambda: diff.diff_hosts(kept, {host: diff.Snapshot(s) for host, s in new.items()}))
+    print(f"  old hashes kept       {seconds * 1000:8.1f} ms  {seconds / args.hosts * 1e6:6.1f} us/pair")
+
+    walked, seconds = timed(lambda: {host: changes for host, s in new.items() if (changes := full_walk(old[host], s))})
+    print(f"  field by field        {seconds * 1000:8.1f} ms  {seconds / args.hosts * 1e6:6.1f} us/pair")
+
+    assert fresh == cached == walked, "the three diffs disagree"
+    assert sorted(fresh) == sorted(changed), "changed hosts were missed or unchanged ones reported"
+    print(f"  {sum(len(changes) for changes in fresh.values())} changes on {len(fresh)} hosts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Fleet sweep throughput against stand-in agents on loopback.
+
+The stand-ins (inventory/fleet_standin.py) run in a child process, so the
+sweep has this process to itself. Each of --sweeps sweeps asks every host
+for the full report; the first one opens the connections and the later ones
+reuse them.
+
+    python bench_fleet.py --hosts 5000 --faults 0.01
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+
+from inventory import fleet, fleet_standin
+
+
+def run_standins(count, key, faults, latency, fixture, conn):
+    """Child process: start the stand-ins and send their addresses and faults back over conn."""
+    fleet_standin.raise_fd_limit(count * 2 + 256)
+
+    async def main():
+        frames = fleet_standin.canned_report(fixture)
+        servers, hosts, plan = await fleet_standin.start(count, frames, key, faults, latency)
+        conn.send((hosts, plan))
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+
+    asyncio.run(main())
+
+async def sweeps(args, key, hosts, plan):
+    client = fleet.Fleet(key, concurrency=args.concurrency, host_timeout=args.host_timeout, max_idle=len(hosts))
+    expected = {"hang": "timeout", "drop": "partial", "down": "error", "badkey": "error", None: "ok"}
+    faults = {f"127.0.0.1:{fleet.parse_host(host)[1]}": fault for host, fault in zip(hosts, plan)}
+    with open(os.devnull, "w") as sink:
+        for n in range(args.sweeps):
+            writer = fleet.NdjsonWriter(sink)
+            start = time.monotonic()
+            cpu = time.process_time()
+            wrong = 0
+            async for result in client.sweep(hosts):
+                writer.write(result)
+                wrong += result["status"] != expected[faults[result["host"]]]
+            wall = time.monotonic() - start
+            tally = writer.finish(wall)
+            print(f"Sweep {n + 1}: {len(hosts)} hosts in {wall:.2f}s ({len(hosts) / wall:.0f} hosts/s, "
+                  f"{time.process_time() - cpu:.2f}s CPU); {tally['ok']} ok, {tally['partial']} partial, "
+                  f"{tally['timeout']} timed out, {tally['error']} failed; {wrong} misclassified")
+    await client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure fleet sweeps against stand-in agents on loopback.")
+    parser.add_argument("--hosts", type=int, default=5000, help="number of stand-in agents (default: 5000)")
+    parser.add_argument("--sweeps", type=int, default=2, help="sweeps to run; later ones reuse connections (default: 2)")
+    parser.add_argument("--concurrency", type=int, default=256, help="hosts queried at once (default: 256)")
+    parser.add_argument("--host-timeout", type=float, default=5.0, help="per-host deadline in seconds (default: 5)")
+    parser.add_argument("--faults", type=float, default=0.01, help="fraction of misbehaving stand-ins (default: 0.01)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds each stand-in delays a report (default: 0)")
+    parser.add_argument("--fixture", default=fleet_standin.DEFAULT_FIXTURE, help="replay fixture the canned report comes from")
+    args = parser.parse_args()
+
+    fleet_standin.raise_fd_limit(args.hosts + 256)
+    key = os.urandom(32)
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=run_standins, daemon=True,
+                                     args=(args.hosts, key, args.faults, args.latency, args.fixture, child))
+    server.start()
+    hosts, plan = parent.recv()
+    try:
+        asyncio.run(sweeps(args, key, hosts, plan))
+    finally:
+        server.terminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Bulk-ingest benchmark for the SQLite inventory history (inventory/history.py).
+
+Writes --snapshots synthetic snapshots (see bench_ingest.py) into a fresh
+database file, then times a few fleet queries against it. Last, --clients
+threads post --posts reports to the ingestion server at once, each appended
+to a second history, and every one of them must be stored.
+
+    python bench_history.py --snapshots 100000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from bench_ingest import base_sections, post_all, synthesize
+from inventory import ingest
+from inventory.history import History
+from inventory.fleet_standin import DEFAULT_FIXTURE
+
+QUERIES = {
+    "battery health < 70": ("battery", "health < ?", (70,)),
+    "no TPM": ("tpm", "status = ?", ("No TPM detected",)),
+    "Office not activated": ("office", "license_status = ?", ("Not Activated",)),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bulk ingest and queries of the inventory history.")
+    parser.add_argument("--snapshots", type=int, default=100000, help="snapshots to write (default: 100000)")
+    parser.add_argument("--hosts", type=int, default=20000, help="distinct hosts they belong to (default: 20000)")
+    parser.add_argument("--clients", type=int, default=8, help="threads posting to the ingestion server at once (default: 8)")
+    parser.add_argument("--posts", type=int, default=2000, help="reports they post, one per request (default: 2000)")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="replay fixture the reports are based on")
+    args = parser.parse_args()
+
+    reports = synthesize(base_sections(args.fixture), args.hosts)
+    rng = random.Random(2)
+    for host, report in reports:
+        health = round(rng.uniform(40, 100), 2)
+        report["battery"] = {**report["battery"], "data": {**report["battery"]["data"], "health": {"value": health, "unit": "%"}}}
+    now = time.time()
+    snapshots = [(reports[n % args.hosts][0], reports[n % args.hosts][1], now - (args.snapshots - n)) for n in range(args.snapshots)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        history = History(os.path.join(folder, "history.sqlite"))
+        start = time.perf_counter()
+        stored = history.add_many(snapshots)
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder))
+        print(f"Ingest: {stored} snapshots in {elapsed:.2f}s ({stored / elapsed:.0f}/s), {size / 1024**2:.0f} MB on disk")
+        for label, (table, where, params) in QUERIES.items():
+            start = time.perf_counter()
+            rows = history.latest(table, where, params)
+            print(f"{label + ':':<22}{len(rows):6} hosts in {(time.perf_counter() - start) * 1000:7.1f} ms")
+        history.close()
+
+        history = History(os.path.join(folder, "posted.sqlite"))
+        server = ingest.make_server(("127.0.0.1", 0), history=history)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        bodies = [json.dumps({"host": host, "sections": report}).encode("utf-8")
+                  for host, report, received in snapshots[:args.posts]]
+        elapsed = post_all(server.server_address[1], bodies, args.clients)
+        server.shutdown()
+        stored = history.count()
+        print(f"Concurrent ingest: {stored} of {len(bodies)} posted snapshots stored by {args.clients} clients in {elapsed:.2f}s")
+        history.close()
+        assert stored == len(bodies), f"{len(bodies) - stored} posted snapshots were lost"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Load generator and query benchmark for the ingestion server (inventory/ingest.py).
+
+Synthetic hosts are made from the report of a replay fixture, with the
+indexed fields (CPU generation, RAM type, TPM, Secure Boot, Office licence)
+varied between hosts. The benchmark then:
+
+  1. fills an InventoryStore directly and times put() and the queries,
+  2. starts the HTTP server on loopback and posts every host again from
+     --clients threads over keep-alive connections, one report per request,
+  3. posts them once more as NDJSON batches of --batch hosts,
+  4. times /count and /hosts round trips over HTTP.
+
+    python bench_ingest.py --hosts 100000
+"""
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+
+from inventory import engine, fleet_standin, ingest, replay, sections
+from inventory.sections import office
+
+GENERATIONS = ["Generation 8 (Coffee Lake)", "Generation 10 (Comet Lake/Ice Lake)", "Generation 11 (Tiger Lake)",
+               "Generation 12 (Alder Lake)", "Ryzen 5000 Series", "Unknown Generation"]
+RAM_TYPES = ["DDR3", "DDR4", "DDR5", "LPDDR4X", None]
+TPM_STATUSES = ["Enabled and Ready", "Not Ready or Disabled", "No TPM detected"]
+SECURE_BOOT = ["Enabled", "Disabled", "N/A", "Unknown"]
+LICENCES = ["Activated", "Activated", "Activated", "Not Activated", "In Grace Period (Trial or Expired)", None]
+OFFICE = {"installed": True, "install_type": "ClickToRun", "version": "ProPlus2021Volume", "edition": "ProPlus2021Volume",
+          "license_status": None, "product_key": None}
+
+
+def base_sections(fixture):
+    """Return the sections of the fixture's report as Get-Systeminfo.py --format json writes them."""
+    replay.configure(replay=fixture)
+    sections.load()
+    results = {}
+    engine.run(sections.SECTIONS, on_section=lambda result: results.update({result.name: result.to_dict()}))
+    for entry in results.values():
+        del entry["section"]
+    return results
+
+def synthesize(base, count, seed=1):
+    """Return [(host, sections)] for count hosts with the indexed fields varied."""
+    rng = random.Random(seed)
+    hosts = []
+    for n in range(count):
+        report = dict(base)
+        report["cpu"] = {**base["cpu"], "data": {**base["cpu"]["data"], "generation": rng.choice(GENERATIONS)}}
+        report["ram"] = {**base["ram"], "data": {**base["ram"]["data"], "type": rng.choice(RAM_TYPES)}}
+        report["tpm"] = {**base["tpm"], "data": {**base["tpm"]["data"], "status": rng.choice(TPM_STATUSES)}}
+        report["uefi"] = {**base["uefi"], "data": {**base["uefi"]["data"], "secure_boot": rng.choice(SECURE_BOOT)}}
+        licence = rng.choice(LICENCES)
+        report["office"] = {**base["office"], "data": {**OFFICE, "license_status": licence} if licence else office.not_installed()}
+        hosts.append((f"pc-{n:06d}", report))
+    return hosts
+
+def per_call(func, runs):
+    """Return the median microseconds per call of func over runs calls, timed in blocks of 100."""
+    samples = []
+    for _ in range(max(1, runs // 100)):
+        start = time.perf_counter()
+        for _ in range(100):
+            func()
+        samples.append((time.perf_counter() - start) / 100 * 1e6)
+    return statistics.median(samples)
+
+QUERIES = {
+    "count one value": lambda store: store.count(tpm_status="No TPM detected"),
+    "count two indexes": lambda store: store.count(tpm_status="No TPM detected", secure_boot="Disabled"),
+    "count OR + 3 indexes": lambda store: store.count(ram_type=["DDR3", "DDR4"], secure_boot=["Disabled", "N/A"],
+                                                      office_licence="Not Activated"),
+    "hosts, first 100": lambda store: store.hosts(limit=100, ram_type="DDR5", tpm_status="Enabled and Ready"),
+    "facets": lambda store: store.facets("cpu_generation"),
+}
+
+def post_all(port, bodies, clients, path="/inventory"):
+    """POST every body from clients threads over keep-alive connections; return seconds taken."""
+    chunks = [bodies[k::clients] for k in range(clients)]
+    failures = []
+
+    def client(chunk):
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        for body in chunk:
+            conn.request("POST", path, body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                failures.append(response.status)
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise RuntimeError(f"{len(failures)} posts failed")
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inventory ingestion and indexed queries.")
+    parser.add_argument("--hosts", type=int, default=20000, help="synthetic hosts (default: 20000)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent HTTP clients (default: 8)")
+    parser.add_argument("--batch", type=int, default=500, help="hosts per NDJSON post in the batch phase (default: 500)")
+    parser.add_argument("--queries", type=int, default=2000, help="HTTP query round trips to time (default: 2000)")
+    parser.add_argument("--fixture", default=fleet_standin.DEFAULT_FIXTURE, help="replay fixture the reports are based on")
+    args = parser.parse_args()
+
+    hosts = synthesize(base_sections(args.fixture), args.hosts)
+
+    print(f"----- InventoryStore, {args.hosts} hosts -----")
+    store = ingest.InventoryStore()
+    start = time.perf_counter()
+    for name, report in hosts:
+        store.put(name, report)
+    elapsed = time.perf_counter() - start
+    print(f"put, new hosts:       {elapsed / args.hosts * 1e6:8.1f} us/host ({args.hosts / elapsed:.0f} hosts/s)")
+    start = time.perf_counter()
+    for name, report in hosts:
+        store.put(name, report)
+    elapsed = time.perf_counter() - start
+    print(f"put, unchanged hosts: {elapsed / args.hosts * 1e6:8.1f} us/host ({args.hosts / elapsed:.0f} hosts/s)")
+    for label, query in QUERIES.items():
+        print(f"{label + ':':<22}{per_call(lambda: query(store), 2000):8.1f} us  (result {len(query(store)) if not isinstance(query(store), int) else query(store)})")
+
+    server = ingest.make_server(("127.0.0.1", 0))
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"\n----- HTTP on 127.0.0.1:{port}, {args.clients} clients -----")
+    bodies = [json.dumps({"host": name, "sections": report}).encode("utf-8") for name, report in hosts]
+    elapsed = post_all(port, bodies, args.clients)
+    print(f"one report per POST:  {args.hosts / elapsed:8.0f} reports/s ({elapsed:.2f}s)")
+    batches = [b"\n".join(bodies[k:k + args.batch]) for k in range(0, len(bodies), args.batch)]
+    elapsed = post_all(port, batches, args.clients)
+    print(f"NDJSON x{args.batch}:{'':<10}{args.hosts / elapsed:8.0f} reports/s ({elapsed:.2f}s)")
+
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for label, path in (("GET /count", "/count?tpm_status=No+TPM+detected&secure_boot=Disabled"),
+                        ("GET /hosts limit 100", "/hosts?ram_type=DDR5&limit=100")):
+        times = []
+        for _ in range(args.queries):
+            start = time.perf_counter()
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            times.append((time.perf_counter() - start) * 1e6)
+        times.sort()
+        print(f"{label + ':':<22}p50 {times[len(times) // 2]:7.0f} us, p99 {times[int(len(times) * 0.99)]:7.0f} us")
+    conn.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
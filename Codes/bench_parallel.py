@@ -0,0 +1,69 @@
+"""Wall-clock comparison of the sequential and concurrent report paths.
+
+The sequential path runs the same collectors one at a time in dependency
+order, as the original Get-Systeminfo.py ran its probes as module-level code;
+the concurrent path is the scheduler every report now uses. Both run every
+section live (no snapshot cache, and ospp.vbs re-run each time).
+
+On the machine being measured:
+    python bench_parallel.py --runs 5
+
+Anywhere else, replay a recorded fixture. Each WMI query, PowerShell command
+and cscript call then sleeps for the time it took when it was recorded, so
+the comparison shows what the scheduler saves on that machine:
+    python bench_parallel.py --replay fixtures/windows11_laptop.json
+"""
+import argparse
+import os
+import statistics
+import tempfile
+
+from inventory import engine, fleet_standin, replay, sections
+from inventory.office_cache import license_cache
+
+
+def measure(sequential, runs):
+    """Run the full report runs times and return (wall times, last report)."""
+    walls = []
+    report = None
+    for _ in range(runs):
+        report = engine.run(sections.SECTIONS, sequential=sequential)
+        walls.append(report.wall)
+    return walls, report
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and concurrent collector wall time.")
+    parser.add_argument("--runs", type=int, default=3, help="report runs per mode (default: 3)")
+    parser.add_argument("--replay", metavar="FIXTURE", nargs="?", const=os.path.normpath(fleet_standin.DEFAULT_FIXTURE),
+                        help="replay a recorded fixture instead of the live system (default: fixtures/windows11_laptop.json)")
+    parser.add_argument("--replay-latency", metavar="SECONDS", default="recorded",
+                        help="with --replay, sleep this long per replayed query, or 'recorded' (the default) for the recorded timings")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay.configure(replay=args.replay, latency=args.replay_latency)
+        # Keep this machine's cached licence out of it
+        license_cache.path = os.path.join(tempfile.mkdtemp(prefix="bench_parallel_"), "office_license.json")
+    # Every run pays for ospp.vbs, as every run of the original script did
+    license_cache.refresh = True
+    sections.load()
+    seq_walls, seq_report = measure(True, args.runs)
+    par_walls, _ = measure(False, args.runs)
+    errors = {name: str(e) for name, e in seq_report.errors.items()}
+    if errors:
+        print(f"Sections that failed: {errors}")
+
+    print(f"----- Per-section time (sequential run, {'replayed from ' + args.replay if args.replay else 'live'}) -----")
+    for name, elapsed in sorted(seq_report.timings.items(), key=lambda item: -item[1]):
+        print(f"{name:<12} {elapsed * 1000:9.1f} ms")
+    print(f"{'sum':<12} {sum(seq_report.timings.values()) * 1000:9.1f} ms")
+
+    seq_median = statistics.median(seq_walls)
+    par_median = statistics.median(par_walls)
+    print("\n----- Full report wall time -----")
+    print(f"Sequential: median {seq_median * 1000:.1f} ms, best {min(seq_walls) * 1000:.1f} ms")
+    print(f"Concurrent: median {par_median * 1000:.1f} ms, best {min(par_walls) * 1000:.1f} ms")
+    print(f"Speedup: {seq_median / par_median:.2f}x" if par_median else "Speedup: n/a")
+
+if __name__ == "__main__":
+    main()
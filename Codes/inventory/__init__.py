@@ -0,0 +1 @@
+"""System inventory collectors shared by the report script and the sysinfo GUIs."""
@@ -0,0 +1,180 @@
+"""Client of the resident inventory agent.
+
+Every run of the report script or a GUI pays for interpreter start, the
+imports, the WMI connection and the static WMI reads before it shows
+anything. The agent is a background process that keeps a WMI session,
+the PowerShell worker, the Office probe and both snapshot caches warm. It
+answers queries over a Unix socket (or a named pipe on Windows) in a few
+milliseconds:
+
+    python sysinfo_agent.py            # start the agent
+    python sysinfo_agent.py --status   # ask whether one is running
+    python sysinfo_agent.py --stop
+
+Clients call connect(), which returns None when no agent is running so the
+caller collects directly, as it always did. Messages are JSON documents sent
+as multiprocessing.connection frames. The connection is authenticated with
+a key file in the per-user cache folder, so only the same user can query the
+agent.
+
+    {"op": "report", "names": [...], "refresh": false, ...}  -> {"section": ...}*, {"summary": ...}
+    {"op": "view", "name": "os"}                              -> {"rows": [{...}, ...]}
+    {"op": "history", "metric": "cpu_mhz", "seconds": 3600}   -> {"step": ..., "time": [...], "mean": [...], ...}
+    {"op": "ping"} / {"op": "refresh_static"} / {"op": "stop"}
+
+With listen set the agent also accepts report, view, history and ping
+requests from other machines over TCP, for fleet sweeps (see fleet.py).
+
+The agent itself is in agent_server.py. This module is what the report
+script and the GUIs import on every start, so it imports nothing the client
+does not use: no psutil, no sampler, no snapshot cache.
+"""
+import getpass
+import json
+import os
+import sys
+import threading
+from multiprocessing.connection import Client
+
+from . import engine, replay
+from .helpers import cache_dir, secret
+from .model import SectionResult, from_plain
+from .wmi_session import Record
+
+FAMILY = "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+
+
+class AgentError(Exception):
+    """The agent refused a request or the connection to it broke."""
+
+
+def address():
+    """Return the agent's socket path or pipe name; SYSINFO_AGENT overrides it."""
+    if os.environ.get("SYSINFO_AGENT"):
+        return os.environ["SYSINFO_AGENT"]
+    if FAMILY == "AF_PIPE":
+        return rf"\\.\pipe\sysinfo-agent-{getpass.getuser()}"
+    return os.path.join(cache_dir(), "agent.sock")
+
+def authkey():
+    """Return the shared secret for the agent connection, creating it on first use."""
+    return secret("agent.key")
+
+
+def _send(conn, message):
+    conn.send_bytes(json.dumps(message, default=str).encode("utf-8"))
+
+def _receive(conn):
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+class AgentClient:
+    """One connection to the agent; requests on it are serialized."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._lock = threading.Lock()
+
+    def request(self, message):
+        """Send a single-reply request and return the reply."""
+        with self._lock:
+            try:
+                _send(self._conn, message)
+                reply = _receive(self._conn)
+            except (OSError, EOFError) as e:
+                raise AgentError(f"Lost the connection to the agent: {e}") from e
+        if "error" in reply:
+            raise AgentError(reply["error"])
+        return reply
+
+    def report(self, names, refresh=False, refresh_office=False, timeout=None, deadline=None, on_section=None):
+        """Have the agent collect names and return an engine.Report, calling on_section as each arrives.
+
+        If the agent fails part-way the report holds only the sections that
+        arrived; the caller collects the rest itself.
+        """
+        report = engine.Report()
+        message = {"op": "report", "names": list(names), "refresh": refresh, "refresh_office": refresh_office,
+                   "timeout": timeout, "deadline": deadline}
+        with self._lock:
+            try:
+                _send(self._conn, message)
+                while True:
+                    reply = _receive(self._conn)
+                    if "section" not in reply:
+                        break
+                    result = SectionResult(reply["section"], from_plain(reply["data"]), reply["status"], reply["seconds"])
+                    report.sections[result.name] = result.value
+                    if on_section:
+                        on_section(result)
+            except (OSError, EOFError):
+                return report
+        summary = reply.get("summary")
+        if summary is not None:
+            report.wall = summary["wall_seconds"]
+            report.cached = set(summary["cached"])
+            report.timed_out = set(summary["timed_out"])
+            report.errors = dict(summary["errors"])
+            report.timings = dict(summary["timings"])
+        return report
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def connect():
+    """Return an AgentClient, or None when no agent is running or a fixture is being replayed or recorded."""
+    if replay.replaying() or replay.recording():
+        return None
+    try:
+        return AgentClient(Client(address(), FAMILY, authkey=authkey()))
+    except (OSError, EOFError):
+        return None
+
+
+class RemoteModel:
+    """A SystemModel whose reads are answered by the agent.
+
+    If the agent goes away the model switches for good to the local one that
+    fallback() builds.
+    """
+
+    def __init__(self, client, fallback):
+        self._client = client
+        self._fallback = fallback
+        self._local = None
+
+    def read(self, name):
+        if self._client is not None:
+            try:
+                return [Record(**row) for row in self._client.request({"op": "view", "name": name})["rows"]]
+            except AgentError:
+                self._client.close()
+                self._client = None
+        return self._local_model().read(name)
+
+    def refresh_static(self):
+        if self._client is not None:
+            try:
+                self._client.request({"op": "refresh_static"})
+                return
+            except AgentError:
+                self._client.close()
+                self._client = None
+        self._local_model().refresh_static()
+
+    def _local_model(self):
+        if self._local is None:
+            self._local = self._fallback()
+        return self._local
+
+def gui_model(fallback):
+    """Return the model for a GUI: the agent's if one is running, else fallback()."""
+    client = connect()
+    return RemoteModel(client, fallback) if client is not None else fallback()
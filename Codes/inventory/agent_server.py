@@ -0,0 +1,257 @@
+"""The resident inventory agent: warm resources and caches behind the agent's socket.
+
+Only sysinfo_agent.py imports this module. The report script and the GUIs
+import agent.py, the client, which leaves out the sampler, the snapshot and
+GUI caches, the time-series store and psutil, so a client starts quickly.
+The protocol is described there.
+"""
+import os
+import socket
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from . import emit, engine, sections
+from .agent import FAMILY, AgentError, _receive, _send, address, authkey
+from .model import to_plain
+from .office_cache import license_cache
+from .sampler import Sampler
+from .snapshot_cache import SnapshotCache
+from .tiers import SystemModel, gui_cache
+from .timeseries import SeriesStore
+
+# How often a report request re-checks the hardware signature of the warm snapshot
+HARDWARE_CHECK_SECONDS = 10
+
+
+class Agent:
+    """Serves report sections and GUI views from warm resources and caches.
+
+    With sample_interval set it also samples the dynamic metrics (see
+    sampler.py) into a SeriesStore and answers history queries from it. With
+    listen, a (host, port) pair, it serves fleet sweeps over TCP as well,
+    to clients holding fleet_key.
+    """
+
+    def __init__(self, sample_interval=None, listen=None, fleet_key=None):
+        sections.load(sections.SECTIONS + sections.OPTIONAL)
+        self.cache = SnapshotCache()
+        self.resources = {}
+        self.started = time.time()
+        self._checked = time.monotonic()
+        self._model = None
+        self._lock = threading.Lock()
+        self._listener = None
+        self._stopping = False
+        self.history = None
+        self.sampler = None
+        self._history_lock = threading.Lock()
+        self.listen = listen
+        self.fleet_key = fleet_key
+        self._tcp = None
+        if sample_interval:
+            self.history = SeriesStore()
+            self.sampler = Sampler(interval=sample_interval, sink=self._record)
+
+    def serve(self):
+        """Accept connections until a stop request arrives, one thread per client."""
+        key = authkey()
+        path = address()
+        if FAMILY == "AF_UNIX" and os.path.exists(path):
+            try:
+                Client(path, FAMILY, authkey=key).close()
+            except (OSError, EOFError):
+                # Left behind by an agent that did not shut down cleanly
+                os.unlink(path)
+            else:
+                raise AgentError(f"An agent is already listening on {path}")
+        self._listener = Listener(path, FAMILY, authkey=key)
+        if self.listen is not None:
+            self._tcp = socket.create_server(self.listen)
+            threading.Thread(target=self._accept_remote, name="agent-fleet", daemon=True).start()
+        if self.sampler is not None:
+            threading.Thread(target=self.sampler.run, name="agent-sampler", daemon=True).start()
+        try:
+            while not self._stopping:
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError) as e:
+                    # A client that failed the handshake or hung up during it
+                    print(f"Agent: refused a connection: {e}", file=sys.stderr)
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), name="agent-client", daemon=True).start()
+        finally:
+            self._listener.close()
+            if self._tcp is not None:
+                self._tcp.close()
+            self.close()
+
+    def _accept_remote(self):
+        """Accept fleet connections on the TCP endpoint; each must pass the key handshake first."""
+        while not self._stopping:
+            try:
+                sock, peer = self._tcp.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle_remote, args=(sock,), name="agent-fleet-client", daemon=True).start()
+
+    def _handle_remote(self, sock):
+        # Only an agent started with listen needs the fleet protocol, and asyncio with it
+        from . import fleet
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = fleet.SocketConnection(sock)
+        if not fleet.accept_handshake(conn, sock, self.fleet_key):
+            conn.close()
+            return
+        self._handle(conn, ops=fleet.REMOTE_OPS)
+
+    def _handle(self, conn, ops=None):
+        """Answer the requests on conn until it closes; ops, if given, limits the requests accepted."""
+        with conn:
+            while True:
+                try:
+                    message = _receive(conn)
+                except (OSError, EOFError, ValueError):
+                    return
+                try:
+                    if ops is not None and message.get("op") not in ops:
+                        _send(conn, {"error": f"{message.get('op')!r} is only accepted on the local socket"})
+                    elif message.get("op") == "report":
+                        self.report(conn, message)
+                    else:
+                        _send(conn, self.answer(message))
+                except (OSError, EOFError):
+                    return
+                except Exception as e:
+                    _send(conn, {"error": f"{type(e).__name__}: {e}"})
+                if message.get("op") == "stop" and ops is None:
+                    self._stop()
+                    return
+
+    def answer(self, message):
+        """Return the reply to a single-reply request."""
+        op = message.get("op")
+        if op == "ping":
+            return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 3), "backend": sections.backend(),
+                    "resources": sorted(self.resources), "sampling": self.sampler.interval if self.sampler else None}
+        if op == "view":
+            with self._lock:
+                return {"rows": [vars(row) for row in self.model().read(message["name"])]}
+        if op == "refresh_static":
+            with self._lock:
+                self.model().refresh_static()
+                self.cache.clear()
+                self.cache.save()
+            return {}
+        if op == "history":
+            return self.window(message.get("metric"), message.get("seconds"))
+        if op == "stop":
+            return {}
+        raise ValueError(f"Unknown request {op!r}")
+
+    def report(self, conn, message):
+        """Stream the requested sections to conn as they finish, then the summary."""
+        names = message["names"]
+        unknown = [name for name in names if name not in sections.SECTIONS + sections.OPTIONAL]
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+
+        def section(result):
+            _send(conn, {"section": result.name, "status": result.status, "seconds": result.seconds,
+                         "data": to_plain(result.value, text=True)})
+
+        with self._lock:
+            if time.monotonic() - self._checked > HARDWARE_CHECK_SECONDS:
+                self._checked = time.monotonic()
+                self.cache.revalidate()
+            self._open(names)
+            if "wmi" in self.resources:
+                # Sections missing from the snapshot cache must read WMI afresh
+                self.resources["wmi"].clear()
+            license_cache.refresh = message.get("refresh_office", False)
+            try:
+                report = engine.run(names, cache=None if message.get("refresh") else self.cache, on_section=section,
+                                    timeout=message.get("timeout"), deadline=message.get("deadline"),
+                                    resources=self.resources)
+            finally:
+                license_cache.refresh = False
+            self.cache.save()
+            if report.timed_out:
+                self._drop([dep for name in report.timed_out for dep in engine.lookup(name).requires])
+        _send(conn, {"summary": emit.summary(report)})
+
+    def _record(self, sample):
+        with self._history_lock:
+            self.history.append(sample)
+
+    def window(self, metric, seconds=None):
+        """Return the sampled history of metric as lists, or the metric names when metric is None."""
+        if self.history is None:
+            raise RuntimeError("The agent is not sampling; start it with --sample")
+        with self._history_lock:
+            if metric is None:
+                return {"metrics": self.history.metrics()}
+            window = self.history.window(metric, seconds)
+            if window is None:
+                raise ValueError(f"No samples of {metric!r}")
+            return {"step": window.step, "time": window.time.tolist(), "min": window.min.tolist(),
+                    "max": window.max.tolist(), "mean": window.mean.tolist()}
+
+    def model(self):
+        """Return the GUI model over the warm WMI session."""
+        if self._model is None:
+            if self._resource("wmi") is None:
+                raise RuntimeError("No WMI session")
+            self._model = SystemModel(self.resources["wmi"], cache=gui_cache())
+        return self._model
+
+    def _open(self, names):
+        """Open the resources the named sections need that are not open yet."""
+        for name in names:
+            for dep in engine.lookup(name).requires:
+                self._resource(dep)
+
+    def _resource(self, name):
+        """Return the warm resource called name, opening it if needed; None if it cannot be opened."""
+        if name not in self.resources:
+            try:
+                value = engine.lookup(name).factory()
+            except Exception:
+                # Left to the run, which reports the error in the sections that need it
+                return None
+            if value is None:
+                return None
+            self.resources[name] = value
+        return self.resources[name]
+
+    def _drop(self, names):
+        """Kill the resources an abandoned collector was using; they are reopened on the next request."""
+        for name in set(names):
+            value = self.resources.pop(name, None)
+            cancel = engine.lookup(name).cancel
+            if value is not None and cancel:
+                cancel(value)
+            if name == "wmi":
+                self._model = None
+
+    def _stop(self):
+        self._stopping = True
+        # Wake the accept() in serve() so it sees the flag
+        try:
+            Client(address(), FAMILY, authkey=authkey()).close()
+        except (OSError, EOFError):
+            pass
+
+    def close(self):
+        """Close every warm resource and save the caches."""
+        if self.sampler is not None:
+            self.sampler.stop()
+        with self._lock:
+            self.cache.save()
+            for name, value in self.resources.items():
+                close = engine.lookup(name).close
+                if close:
+                    close(value)
+            self.resources = {}
+            self._model = None
@@ -0,0 +1,74 @@
+"""asyncio front end to the collector engine, for services with an event loop.
+
+    async for result in aio.collect(sections=["cpu", "ram", "office"]):
+        print(result.name, result.status, result.value)
+
+collect() drives engine.run() from the loop's default executor. The probes
+run on the engine's worker threads and the subprocesses on their own
+process handles, so nothing blocks the event loop. Each model.SectionResult
+is handed back to the loop the moment its section finishes. At most
+max_concurrency collectors run at once.
+
+Cancelling the consuming task, or leaving the `async for` early, stops the
+run: unfinished sections are abandoned and the resources they were using
+are cancelled, which kills the PowerShell worker and any cscript child.
+collect() returns only after every resource has been closed or cancelled.
+
+Code that is not async uses collect_sync(), and await fetch(...) runs one of
+the blocking GUI fetches (inventory/details.py) off the loop.
+"""
+import asyncio
+from concurrent.futures import Future
+
+from . import engine
+from . import sections as section_modules
+
+_FINISHED = object()
+
+
+async def collect(sections=None, max_concurrency=4, cache=None, timeout=None, deadline=None, resources=None):
+    """Yield a model.SectionResult for each of sections (all by default) as it finishes.
+
+    cache, timeout, deadline and resources mean the same as for engine.run().
+    """
+    names = list(section_modules.SECTIONS if sections is None else sections)
+    section_modules.load(names)
+    loop = asyncio.get_running_loop()
+    results = asyncio.Queue()
+    stop = Future()
+
+    def deliver(item):
+        loop.call_soon_threadsafe(results.put_nowait, item)
+
+    def work():
+        try:
+            engine.run(names, max_workers=max_concurrency, cache=cache, on_section=deliver,
+                       timeout=timeout, deadline=deadline, resources=resources, stop=stop)
+        except Exception as e:
+            deliver(e)
+        else:
+            deliver(_FINISHED)
+
+    runner = loop.run_in_executor(None, work)
+    try:
+        while True:
+            item = await results.get()
+            if item is _FINISHED:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        if not stop.done():
+            stop.set_result(None)
+        await runner
+
+def collect_sync(sections=None, **options):
+    """Blocking collect(): return {name: SectionResult} in the order the sections finished."""
+    async def gather():
+        return {result.name: result async for result in collect(sections, **options)}
+    return asyncio.run(gather())
+
+async def fetch(func, *args):
+    """Await a blocking call, such as details.os_details(model), on the loop's default executor."""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
@@ -0,0 +1,121 @@
+"""Text of the sysinfo GUI detail windows, built from a SystemModel.
+
+The tk and wx front ends show the same text, so they share these functions
+instead of each formatting the WMI records itself. Nothing here imports a GUI
+toolkit.
+"""
+
+
+def os_details(model):
+    os_info = model.read("os")[0]
+    return f"""
+OS Name: {os_info.Name.split('|')[0]}
+Version: {os_info.Version}
+Manufacturer: {os_info.Manufacturer}
+Architecture: {os_info.OSArchitecture}
+Boot Device: {os_info.BootDevice}
+System Drive: {os_info.SystemDrive}
+Total Visible Memory: {int(os_info.TotalVisibleMemorySize) // 1024} MB
+Free Physical Memory: {int(os_info.FreePhysicalMemory) // 1024} MB
+Windows Directory: {os_info.WindowsDirectory}
+""".strip()
+
+def hw_details(model, io=None):
+    computer_info = model.read("computer")[0]
+    bios_info = model.read("bios")[0]
+
+    # Getting disk information
+    disk_details = disk_info(model, io)
+
+    return f"""
+Manufacturer: {computer_info.Manufacturer}
+Model: {computer_info.Model}
+Serial Number: {bios_info.SerialNumber}
+Number of Processors: {computer_info.NumberOfProcessors}
+System Type: {computer_info.SystemType}
+BIOS Version: {bios_info.SMBIOSBIOSVersion}
+Total Physical Memory: {int(computer_info.TotalPhysicalMemory) // (1024**2)} MB
+Domain Name: {computer_info.Domain}
+{disk_details}
+""".strip()
+
+def disk_info(model, io=None):
+    disk_info = ""
+    for disk in model.read("disks"):
+        total_size = int(disk.Size) // (1024**3)  # Convert to GB
+        free_space = int(disk.FreeSpace) // (1024**3)  # Convert to GB
+        disk_info += f"\nDisk {disk.DeviceID} ({disk.MediaType}):\n"
+        disk_info += f"  Total Size: {total_size} GB\n"
+        disk_info += f"  Free Space: {free_space} GB\n"
+
+    if io is not None:
+        disk_info += disk_io_details(io)
+
+    return disk_info.strip()
+
+def disk_io_details(io):
+    """Activity of each physical disk since the previous call, from a diskio.DiskIoSampler."""
+    seconds = io.update()
+    io_info = f"\nDisk Activity (last {seconds:.1f} s):\n"
+    for disk in io.disks:
+        busy = io.rate(disk, "busy_percent")
+        io_info += f"Physical Disk {disk}:\n"
+        io_info += f"  Read: {io.rate(disk, 'read_bytes_per_s') / 1024**2:.2f} MB/s, {io.rate(disk, 'read_iops'):.0f} IOPS\n"
+        io_info += f"  Write: {io.rate(disk, 'write_bytes_per_s') / 1024**2:.2f} MB/s, {io.rate(disk, 'write_iops'):.0f} IOPS\n"
+        io_info += f"  Queue Depth: {io.rate(disk, 'queue_depth'):.2f}\n"
+        io_info += f"  Busy: {f'{busy:.0f}%' if busy is not None else 'N/A'}\n"
+    return io_info
+
+def cpu_details(model):
+    cpu_info = model.read("cpu")[0]
+    return f"""
+CPU Name: {cpu_info.Name}
+Number of Cores: {cpu_info.NumberOfCores}
+Number of Logical Processors: {cpu_info.NumberOfLogicalProcessors}
+Current Clock Speed: {cpu_info.CurrentClockSpeed} MHz
+Max Clock Speed: {cpu_info.MaxClockSpeed} MHz
+L2 Cache Size: {cpu_info.L2CacheSize} KB
+""".strip()
+
+def process_details(procs):
+    """The busiest processes since the previous call, from a procs.ProcessSampler."""
+    seconds = procs.update()
+    process_info = f"Running Processes: {procs.count} (last {seconds:.1f} s)\n"
+    for title, key in (("Top CPU", "cpu"), ("Top Memory", "memory")):
+        process_info += f"\n{title}:\n"
+        for row in procs.rows(key):
+            process_info += f"  {row['name']} (PID {row['pid']}): CPU {row['cpu_percent']:.1f}%, Memory {row['rss_bytes'] // 1024**2} MB"
+            process_info += f" ({row['rss_delta_bytes'] / 1024**2:+.1f} MB)\n" if row["rss_delta_bytes"] else "\n"
+    return process_info.strip()
+
+def network_details(model, net=None):
+    if net is not None:
+        net.update()
+    network_info = ""
+    for adapter in model.read("network"):
+        network_info += f"""
+Network Adapter: {adapter.Description}
+MAC Address: {adapter.MACAddress}
+IP Address: {', '.join(adapter.IPAddress) if adapter.IPAddress else 'None'}
+Subnet Mask: {adapter.IPSubnet[0] if adapter.IPSubnet else 'None'}
+Default Gateway: {', '.join(adapter.DefaultIPGateway) if adapter.DefaultIPGateway else 'None'}
+DNS Servers: {', '.join(adapter.DNSServerSearchOrder) if adapter.DNSServerSearchOrder else 'None'}
+"""
+        name = net.adapter_for_mac(adapter.MACAddress) if net is not None else None
+        if name is not None:
+            network_info += network_io_details(net, name)
+
+    if net is not None and net.adapters:
+        descriptions = {net.adapter_for_mac(adapter.MACAddress): adapter.Description for adapter in model.read("network")}
+        network_info += "\nTop Talkers (last minute):\n"
+        for rank, (name, rate) in enumerate(net.top_talkers(3, seconds=60), 1):
+            network_info += f"  {rank}. {descriptions.get(name) or name}: {rate / 1024:.1f} KB/s\n"
+    return network_info.strip()
+
+def network_io_details(net, name):
+    """Live traffic of one adapter over the last netio.NetIoSampler update."""
+    return f"""Receive: {net.rate(name, 'rx_bytes_per_s') / 1024:.1f} KB/s, {net.rate(name, 'rx_packets_per_s'):.0f} packets/s, \
+{net.rate(name, 'rx_errors_per_s'):.0f} errors/s, {net.rate(name, 'rx_drops_per_s'):.0f} drops/s
+Send: {net.rate(name, 'tx_bytes_per_s') / 1024:.1f} KB/s, {net.rate(name, 'tx_packets_per_s'):.0f} packets/s, \
+{net.rate(name, 'tx_errors_per_s'):.0f} errors/s, {net.rate(name, 'tx_drops_per_s'):.0f} drops/s
+"""
@@ -0,0 +1,32 @@
+"""Device-class lookups with the PNPClass filter pushed into the WQL query.
+
+Filtering Win32_PnPEntity in Python materializes every device on the machine
+(thousands behind a docking station) to find a single webcam. These helpers
+let WMI do the filtering and stop the enumeration early when only one device
+is wanted.
+"""
+
+# Friendly names for groups of PNPClass values; any other name is used as-is
+DEVICE_CLASSES = {
+    "camera": ["Image", "Camera"],
+    "audio": ["AudioEndpoint", "MEDIA"],
+    "hid": ["HIDClass", "Keyboard", "Mouse"],
+    "display": ["Display", "Monitor"],
+}
+
+DEVICE_PROPS = ["Name", "Manufacturer", "DeviceID", "PNPClass"]
+
+
+def device_class_filter(kind):
+    """Return the WQL WHERE clause matching every PNPClass of kind."""
+    classes = DEVICE_CLASSES.get(kind, [kind])
+    return " OR ".join(f"PNPClass = '{name}'" for name in classes)
+
+def find_devices(session, kind, props=DEVICE_PROPS):
+    """Return every device of kind, fetched in a single query."""
+    return session.query("Win32_PnPEntity", props, where=device_class_filter(kind))
+
+def find_device(session, kind, props=DEVICE_PROPS):
+    """Return the first device of kind, or None; enumeration stops at the first match."""
+    devices = session.query("Win32_PnPEntity", props, where=device_class_filter(kind), limit=1)
+    return devices[0] if devices else None
@@ -0,0 +1,188 @@
+"""Change detection between two inventory snapshots, section by section.
+
+A snapshot is the "sections" object of a JSON report (name -> {"status",
+"data", ...}), as Get-Systeminfo.py --format json writes it. diff() compares
+two of them and returns one change per added, removed or changed field or
+device:
+
+    {"section": "ram", "change": "changed", "field": "total", "old": {...}, "new": {...}}
+    {"section": "ssd", "change": "added", "device": "S4EWNX0R123456", "new": {...}}
+    {"section": "ssd", "change": "changed", "device": "S4EWNX0R123456", "field": "size", "old": ..., "new": ...}
+    {"section": "tpm", "change": "unavailable", "old": "ok", "new": "timeout"}
+
+Every section gets a 128-bit content hash of its data, computed once per
+Snapshot. Sections whose hashes match are skipped without looking inside,
+which is most of them when the same machines are compared run after run. A
+watcher diffing each sweep against the last keeps the last sweep's digests()
+and passes them back in, so only the new side is hashed (bench_diff.py).
+Fields that change on every run (IGNORED) are left out of the hash and the
+comparison.
+
+List sections are matched device by device on DEVICE_KEYS (disks by serial
+number, adapters by MAC address), so a reordered list is not a change.
+Lists without a key, and lists where the key is missing or repeated (two
+disks with serial "Unknown", an adapter without a MAC), are compared as
+multisets of whole devices.
+"""
+import hashlib
+import json
+import marshal
+
+GOOD = ("ok", "cached")
+# Sections and fields that differ between any two runs
+IGNORED = {"cpu": ("speed",), "processes": None}
+DEVICE_KEYS = {"ssd": "serial_number", "network": "mac"}
+# marshal version 2 writes no back-references, so equal data always gives equal bytes;
+# it is several times faster than json.dumps for the small dicts a section holds
+_MARSHAL_VERSION = 2
+
+
+def canonical(value):
+    """Return value in the form that is compared: the "text" of a Quantity is dropped, it follows from value and unit."""
+    if isinstance(value, dict):
+        if "text" in value and "unit" in value and "value" in value:
+            return {"value": value["value"], "unit": value["unit"]}
+        return {key: canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [canonical(item) for item in value]
+    return value
+
+def _comparable(name, data):
+    ignored = IGNORED.get(name, ())
+    if isinstance(data, dict) and ignored:
+        data = {key: item for key, item in data.items() if key not in ignored}
+    return canonical(data)
+
+
+class Snapshot:
+    """The sections of one report, with the comparable data and hash of each worked out on first use.
+
+    hashes takes the digests() of an earlier Snapshot of the same sections,
+    so a caller that keeps them need not hash the old side again.
+    """
+
+    def __init__(self, sections, hashes=None):
+        self.sections = sections
+        self._data = {}
+        self._hashes = dict(hashes or {})
+
+    def status(self, name):
+        entry = self.sections.get(name)
+        return entry.get("status", "ok") if entry else None
+
+    def data(self, name):
+        if name not in self._data:
+            self._data[name] = _comparable(name, self.sections[name].get("data"))
+        return self._data[name]
+
+    def hash(self, name):
+        digest = self._hashes.get(name)
+        if digest is None:
+            # The raw data is hashed, skipping canonical(). A report with Quantity texts and one without,
+            # or the same fields in another order, then only miss the short-circuit: the comparison
+            # itself still finds them equal
+            data = self.sections[name].get("data")
+            ignored = IGNORED.get(name)
+            if ignored and isinstance(data, dict):
+                data = {key: item for key, item in data.items() if key not in ignored}
+            digest = self._hashes[name] = hashlib.blake2b(marshal.dumps(data, _MARSHAL_VERSION), digest_size=16).digest()
+        return digest
+
+    def digests(self):
+        """Return {section: hash} for every section."""
+        return {name: self.hash(name) for name in self.sections}
+
+
+def diff(old, new):
+    """Return the changes from old to new, two Snapshots or two sections dicts."""
+    old = old if isinstance(old, Snapshot) else Snapshot(old)
+    new = new if isinstance(new, Snapshot) else Snapshot(new)
+    changes = []
+    for name in list(old.sections) + [name for name in new.sections if name not in old.sections]:
+        if name in IGNORED and IGNORED[name] is None:
+            continue
+        before, after = old.status(name), new.status(name)
+        if before is None or after is None:
+            entry = {"section": name, "change": "added" if before is None else "removed"}
+            if after is not None and after in GOOD:
+                entry["new"] = new.data(name)
+            elif before is not None and before in GOOD:
+                entry["old"] = old.data(name)
+            changes.append(entry)
+            continue
+        if before not in GOOD or after not in GOOD:
+            if before != after:
+                changes.append({"section": name, "change": "unavailable", "old": before, "new": after})
+            continue
+        if old.hash(name) == new.hash(name):
+            continue
+        _diff_value(name, old.data(name), new.data(name), changes)
+    return changes
+
+def _diff_value(name, old, new, changes):
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_fields(name, old, new, changes, {})
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_devices(name, old, new, changes)
+    elif old != new:
+        changes.append({"section": name, "change": "changed", "old": old, "new": new})
+
+def _diff_fields(name, old, new, changes, where):
+    for field in list(old) + [field for field in new if field not in old]:
+        if field not in new:
+            changes.append({"section": name, "change": "removed", **where, "field": field, "old": old[field]})
+        elif field not in old:
+            changes.append({"section": name, "change": "added", **where, "field": field, "new": new[field]})
+        elif old[field] != new[field]:
+            changes.append({"section": name, "change": "changed", **where, "field": field, "old": old[field], "new": new[field]})
+
+def _unique_keys(items, key):
+    """Return True when every item is a dict with its own, present value of key."""
+    if not all(isinstance(item, dict) for item in items):
+        return False
+    keys = [item.get(key) for item in items]
+    return None not in keys and len(set(keys)) == len(keys)
+
+def _diff_devices(name, old, new, changes):
+    key = DEVICE_KEYS.get(name)
+    if key is None or not _unique_keys(old, key) or not _unique_keys(new, key):
+        # Matched as a multiset of whole items: two disks that both report serial "Unknown" are
+        # still two disks, and one of them being swapped is still a change
+        unmatched = list(new)
+        for item in old:
+            if item in unmatched:
+                unmatched.remove(item)
+            else:
+                changes.append({"section": name, "change": "removed", "old": item})
+        for item in unmatched:
+            changes.append({"section": name, "change": "added", "new": item})
+        return
+    before = {item[key]: item for item in old}
+    after = {item[key]: item for item in new}
+    for device, item in before.items():
+        if device not in after:
+            changes.append({"section": name, "change": "removed", "device": device, "old": item})
+        elif item != after[device]:
+            _diff_fields(name, item, after[device], changes, {"device": device})
+    for device, item in after.items():
+        if device not in before:
+            changes.append({"section": name, "change": "added", "device": device, "new": item})
+
+def diff_hosts(old, new):
+    """Compare two fleets, host -> Snapshot (or sections); return host -> changes for the hosts that changed or appeared."""
+    result = {}
+    for host, snapshot in new.items():
+        changes = diff(old[host], snapshot) if host in old else [{"section": None, "change": "added"}]
+        if changes:
+            result[host] = changes
+    return result
+
+def load(path):
+    """Return the sections of a report file written by Get-Systeminfo.py --format json or ndjson."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        return json.loads(text)["sections"]
+    except ValueError:
+        lines = [json.loads(line) for line in text.splitlines() if line.strip()]
+        return {line["section"]: line for line in lines if "section" in line}
@@ -0,0 +1,124 @@
+"""Per-physical-disk I/O rates from the OS counters: bytes/s, IOPS, queue depth and busy %.
+
+A DiskIoSampler diffs the kernel's cumulative disk counters between calls.
+On Linux it re-reads /proc/diskstats into a buffer kept between calls, grown
+when the file outgrows it. Elsewhere it uses psutil.disk_io_counters(
+perdisk=True). Counters and rates live in array('d') blocks allocated once,
+with RATES consecutive rates per disk, so update() allocates only the
+parsing temporaries.
+
+    io = DiskIoSampler()
+    ...
+    io.update()                        # rates since the previous call
+    io.rate("sda", "busy_percent")
+
+The disks are found once, when the sampler is created; one plugged in
+later needs a new sampler. Queue depth is the average number of requests in
+flight over the interval (iostat's aqu-sz). Windows has no busy time, so
+busy_percent is None there.
+"""
+import math
+import os
+import sys
+import time
+from array import array
+
+import psutil
+
+from . import sysfs
+from .sampler import Poller, read_whole
+
+RATES = ("read_bytes_per_s", "write_bytes_per_s", "read_iops", "write_iops", "queue_depth", "busy_percent")
+# Cumulative counters kept per disk: reads, read bytes, writes, written bytes, busy ms, weighted (queue) ms
+_COUNTERS = 6
+SECTOR_BYTES = 512  # /proc/diskstats always counts 512-byte sectors
+
+
+class DiskIoSampler(Poller):
+    """Rates of every physical disk since the previous update(); also usable as a Poller."""
+
+    def __init__(self, interval=1.0, sink=None, root="/"):
+        super().__init__(interval, sink)
+        self._procfs = None
+        if sys.platform.startswith("linux"):
+            self.disks = [disk["name"] for disk in sysfs.disks(root)]
+            self._procfs = os.open(os.path.join(root, "proc/diskstats"), os.O_RDONLY)
+            self._buffer = bytearray(1 << 16)
+        else:
+            self.disks = sorted(psutil.disk_io_counters(perdisk=True) or {})
+        self._index = {name: i for i, name in enumerate(self.disks)}
+        self._previous = array("d", bytes(8 * _COUNTERS * len(self.disks)))
+        self._current = array("d", bytes(8 * _COUNTERS * len(self.disks)))
+        self.rates = array("d", bytes(8 * len(RATES) * len(self.disks)))
+        self.interval_seconds = 0.0
+        self._read(self._previous)
+        self._time = time.monotonic()
+
+    def _read(self, counters):
+        if self._procfs is not None:
+            self._buffer, size = read_whole(self._procfs, self._buffer)
+            for line in self._buffer[:size].splitlines():
+                fields = line.split()
+                i = self._index.get(fields[2].decode())
+                if i is None:
+                    continue
+                base = i * _COUNTERS
+                counters[base] = int(fields[3])
+                counters[base + 1] = int(fields[5]) * SECTOR_BYTES
+                counters[base + 2] = int(fields[7])
+                counters[base + 3] = int(fields[9]) * SECTOR_BYTES
+                counters[base + 4] = int(fields[12])
+                counters[base + 5] = int(fields[13])
+            return
+        for name, io in (psutil.disk_io_counters(perdisk=True) or {}).items():
+            i = self._index.get(name)
+            if i is None:
+                continue
+            base = i * _COUNTERS
+            counters[base] = io.read_count
+            counters[base + 1] = io.read_bytes
+            counters[base + 2] = io.write_count
+            counters[base + 3] = io.write_bytes
+            counters[base + 4] = getattr(io, "busy_time", math.nan)
+            # Without a weighted counter, time spent in reads and writes gives the same average
+            counters[base + 5] = io.read_time + io.write_time
+
+    def update(self):
+        """Refresh rates with the activity since the previous call and return the interval in seconds."""
+        self._read(self._current)
+        now = time.monotonic()
+        elapsed = now - self._time
+        if elapsed <= 0:
+            return self.interval_seconds
+        cur, prev, rates = self._current, self._previous, self.rates
+        for i in range(len(self.disks)):
+            c = i * _COUNTERS
+            r = i * len(RATES)
+            rates[r] = (cur[c + 1] - prev[c + 1]) / elapsed
+            rates[r + 1] = (cur[c + 3] - prev[c + 3]) / elapsed
+            rates[r + 2] = (cur[c] - prev[c]) / elapsed
+            rates[r + 3] = (cur[c + 2] - prev[c + 2]) / elapsed
+            rates[r + 4] = (cur[c + 5] - prev[c + 5]) / (elapsed * 1000)
+            rates[r + 5] = min(100.0, (cur[c + 4] - prev[c + 4]) / (elapsed * 10))
+        self._previous, self._current = cur, prev
+        self._time = now
+        self.interval_seconds = elapsed
+        return elapsed
+
+    def rate(self, disk, name):
+        """Return one rate of one disk from the last update(); None where the OS does not count it."""
+        value = self.rates[self._index[disk] * len(RATES) + RATES.index(name)]
+        return None if math.isnan(value) else value
+
+    def sample(self):
+        """update() and return the rates as {"time": ..., rate: {disk: value}}, the shape SeriesStore takes."""
+        self.update()
+        sample = {"time": time.time()}
+        for name in RATES:
+            sample[name] = {disk: self.rate(disk, name) for disk in self.disks}
+        return sample
+
+    def close(self):
+        if self._procfs is not None:
+            os.close(self._procfs)
+            self._procfs = None
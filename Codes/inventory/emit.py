@@ -0,0 +1,65 @@
+"""Streaming JSON and NDJSON writers for the report.
+
+Pass an emitter's section method as engine.run(on_section=...) and every
+section is written and flushed the moment its collector finishes, so a
+consumer reading the stream can start before the slowest probe returns. Call
+finish(report) once the run is over to write the summary.
+
+NDJSON, one object per line:
+
+    {"section": "ram", "status": "ok", "seconds": 0.01, "data": {...}}
+    {"summary": {"wall_seconds": 0.9, "cached": [...], "timed_out": [...], "errors": {...}}}
+
+JSON, one document written incrementally:
+
+    {"sections": {"ram": {...}, ...}, "summary": {...}}
+"""
+import json
+
+
+def summary(report):
+    """Return the run-level facts written after the last section."""
+    return {
+        "wall_seconds": round(report.wall, 6),
+        "cached": sorted(report.cached),
+        "timed_out": sorted(report.timed_out),
+        "errors": {name: str(e) for name, e in report.errors.items()},
+        "timings": {name: round(seconds, 6) for name, seconds in report.timings.items()},
+    }
+
+
+class NdjsonEmitter:
+    """Writes each section as one JSON line, then a summary line."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def section(self, result):
+        self.stream.write(json.dumps(result.to_dict()) + "\n")
+        self.stream.flush()
+
+    def finish(self, report):
+        self.stream.write(json.dumps({"summary": summary(report)}) + "\n")
+        self.stream.flush()
+
+
+class JsonEmitter:
+    """Writes one JSON document whose "sections" object grows as sections finish."""
+
+    def __init__(self, stream, indent=None):
+        self.stream = stream
+        self.indent = indent
+        self._count = 0
+
+    def section(self, result):
+        entry = result.to_dict()
+        del entry["section"]
+        self.stream.write('{"sections": {' if self._count == 0 else ", ")
+        self.stream.write(f"{json.dumps(result.name)}: {json.dumps(entry, indent=self.indent)}")
+        self.stream.flush()
+        self._count += 1
+
+    def finish(self, report):
+        self.stream.write('{"sections": {' if self._count == 0 else "")
+        self.stream.write(f'}}, "summary": {json.dumps(summary(report), indent=self.indent)}}}\n')
+        self.stream.flush()
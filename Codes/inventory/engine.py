@@ -0,0 +1,340 @@
+"""Collector registry and concurrent scheduler for the system information report.
+
+Each report section is a registered collector that declares the resources it
+needs (for example the WMI session). The scheduler starts every collector as
+soon as its dependencies are ready, so a full report costs roughly as much as
+its slowest probe instead of the sum of all of them.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from .model import SectionResult
+
+_collectors = {}
+_resources = {}
+
+
+class CollectorTimeout(TimeoutError):
+    """A collector or resource missed its deadline and was abandoned."""
+
+
+class CollectorCancelled(Exception):
+    """The run was stopped before a collector or resource finished."""
+
+
+class Resource:
+    """A shared handle, such as the WMI session, that collectors depend on.
+
+    cancel, if given, is called instead of close when a node using the handle
+    was abandoned; it must not block, and should kill any subprocess the
+    handle is waiting on.
+    """
+
+    def __init__(self, name, factory, close=None, cancel=None):
+        self.name = name
+        self.factory = factory
+        self.close = close
+        self.cancel = cancel
+        self.requires = ()
+        self.timeout = None
+
+
+class Collector:
+    """A report section produced by calling func with its resolved dependencies."""
+
+    def __init__(self, name, func, requires=(), fields=None, live=None, timeout=None):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.fields = fields
+        self.live = live
+        self.timeout = timeout
+
+    def error_result(self, exc):
+        """Build the section value reported when the collector raises."""
+        if self.fields is None:
+            return [f"Error: {exc}"]
+        return {key: f"Error: {exc}" for key in self.fields}
+
+    def timeout_result(self, exc):
+        """Build the section value reported when the collector was abandoned."""
+        if self.fields is None:
+            return [str(exc)]
+        return {key: str(exc) for key in self.fields}
+
+
+class Report:
+    """Section results and per-node timings from one scheduler run."""
+
+    def __init__(self):
+        self.sections = {}
+        self.timings = {}
+        self.errors = {}
+        self.cached = set()
+        self.timed_out = set()
+        self.wall = 0.0
+
+    def merge(self, other):
+        """Add the sections of another run, such as one that finished what an agent started."""
+        self.sections.update(other.sections)
+        self.timings.update(other.timings)
+        self.errors.update(other.errors)
+        self.cached |= other.cached
+        self.timed_out |= other.timed_out
+        self.wall += other.wall
+
+
+def resource(name, close=None, cancel=None):
+    """Register the decorated factory as the shared resource called name."""
+    def register(factory):
+        _resources[name] = Resource(name, factory, close, cancel)
+        return factory
+    return register
+
+def collector(name, requires=(), fields=None, live=None, timeout=None):
+    """Register the decorated function as the collector for section name.
+
+    live is an optional cheap function returning just the section's volatile
+    fields; it refreshes a section that was served from a cache. timeout, in
+    seconds, overrides the per-collector default passed to run().
+    """
+    def register(func):
+        _collectors[name] = Collector(name, func, requires, fields, live, timeout)
+        return func
+    return register
+
+def unavailable(name, exc):
+    """Register a collector for a section whose module could not be imported."""
+    def fail():
+        raise exc
+    _collectors[name] = Collector(name, fail)
+    _collectors[name].error_result = lambda e: f"Error: {e}"
+    _collectors[name].timeout_result = lambda e: str(e)
+
+def registered():
+    """Return the names of all registered collectors."""
+    return list(_collectors)
+
+def lookup(name):
+    """Return the registered Collector or Resource called name."""
+    if name in _collectors:
+        return _collectors[name]
+    if name in _resources:
+        return _resources[name]
+    raise KeyError(f"Unknown collector or resource: {name}")
+
+
+def _plan(names):
+    """Return the collectors for names plus every node they transitively need."""
+    nodes = {}
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name in nodes:
+            continue
+        if name in _collectors:
+            nodes[name] = _collectors[name]
+            stack.extend(nodes[name].requires)
+        elif name in _resources:
+            nodes[name] = _resources[name]
+        else:
+            raise KeyError(f"Unknown collector or resource: {name}")
+    cycle = _find_cycle(nodes)
+    if cycle:
+        # No node on a cycle could ever start, and run() would wait for them until its deadline
+        raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+    return nodes
+
+def _find_cycle(nodes):
+    """Return the names along a requires cycle among nodes, first name repeated at the end, or None."""
+    done = set()
+    for root in nodes:
+        if root in done:
+            continue
+        path = [root]
+        on_path = {root}
+        stack = [iter(nodes[root].requires)]
+        while stack:
+            dep = next(stack[-1], None)
+            if dep is None:
+                stack.pop()
+                name = path.pop()
+                on_path.discard(name)
+                done.add(name)
+                continue
+            if dep in on_path:
+                return path[path.index(dep):] + [dep]
+            if dep not in done:
+                path.append(dep)
+                on_path.add(dep)
+                stack.append(iter(nodes[dep].requires))
+    return None
+
+def spawn(func, *args, name="collector"):
+    """Call func(*args) on a new daemon thread and return a Future for its result.
+
+    Daemon threads let the run abandon a call that hangs (a stuck WMI provider
+    or cscript) without the hung thread keeping the process alive at exit.
+    """
+    future = Future()
+
+    def target():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+    threading.Thread(target=target, name=name, daemon=True).start()
+    return future
+
+def run(names=None, max_workers=8, sequential=False, cache=None, on_section=None, timeout=None, deadline=None, resources=None, stop=None):
+    """Run the named collectors (all registered ones by default) and return a Report.
+
+    With sequential=True the nodes run one at a time in dependency order,
+    which reproduces the original one-after-another report path. A cache (see
+    snapshot_cache.SnapshotCache) serves still-valid sections without running
+    their collectors or opening the resources they need. on_section is called
+    on the calling thread with a model.SectionResult as each named section
+    finishes, cached ones first.
+
+    timeout is the default limit in seconds for each collector and resource,
+    and deadline the limit for the whole run. A node that runs over is
+    abandoned: its section reports "Timed out after Ns", the resources it was
+    using are cancelled (killing their subprocesses), and the rest of the
+    report carries on.
+
+    resources maps resource names to handles the caller has already opened,
+    such as the resident agent's long-lived WMI session. The run uses them as
+    they are and never closes or cancels them.
+
+    stop is an optional concurrent.futures.Future; once it is done the run
+    abandons every unfinished node as "cancelled" and returns.
+
+    Raises ValueError, before anything starts, when the requires of the
+    planned nodes form a cycle.
+    """
+    names = list(_collectors) if names is None else list(names)
+    report = Report()
+    values = {}
+    started = time.perf_counter()
+    stop_at = started + deadline if deadline is not None else None
+    if cache is not None:
+        for name in names:
+            hit, value = cache.get(name)
+            if hit:
+                values[name] = _refresh_live(_collectors[name], value)
+                report.cached.add(name)
+                if on_section:
+                    on_section(SectionResult(name, values[name], "cached"))
+    nodes = _plan([name for name in names if name not in report.cached])
+    supplied = {name: value for name, value in (resources or {}).items() if name in nodes}
+    values.update(supplied)
+    # The caller's own handles are treated as already cancelled: never cancelled or closed here
+    cancelled = set(supplied)
+
+    def execute(node, args):
+        start = time.perf_counter()
+        try:
+            if isinstance(node, Resource):
+                value = node.factory()
+            else:
+                value = node.func(*args)
+            error = None
+        except Exception as e:
+            error = e
+            value = None if isinstance(node, Resource) else node.error_result(e)
+        return value, error, time.perf_counter() - start
+
+    def finished(name, status):
+        if on_section and name in names:
+            on_section(SectionResult(name, values[name], status, report.timings.get(name, 0.0)))
+
+    def abandon(node, elapsed, error, status="timeout"):
+        report.timings[node.name] = elapsed
+        report.errors[node.name] = error
+        if status == "timeout":
+            report.timed_out.add(node.name)
+        values[node.name] = None if isinstance(node, Resource) else node.timeout_result(error)
+        for dep in node.requires:
+            resource = nodes.get(dep)
+            if isinstance(resource, Resource) and resource.cancel and dep not in cancelled and values.get(dep) is not None:
+                cancelled.add(dep)
+                resource.cancel(values[dep])
+        finished(node.name, status)
+
+    def limit(node):
+        return node.timeout if node.timeout is not None else timeout
+
+    waiting = {name: node for name, node in nodes.items() if name not in supplied}
+    running = {}
+    workers = 1 if sequential else max_workers
+    while waiting or running:
+        for name, node in list(waiting.items()):
+            if len(running) >= workers:
+                break
+            if all(dep in values for dep in node.requires):
+                del waiting[name]
+                running[spawn(execute, node, [values[dep] for dep in node.requires], name=f"collector-{name}")] = (node, time.perf_counter())
+
+        due = [start + limit(node) for node, start in running.values() if limit(node) is not None]
+        if stop_at is not None:
+            due.append(stop_at)
+        wait_for = max(0.0, min(due) - time.perf_counter()) if due else None
+        done, _ = wait(list(running) + ([stop] if stop is not None else []), timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future is stop:
+                continue
+            node, _ = running.pop(future)
+            values[node.name], error, report.timings[node.name] = future.result()
+            if error is not None:
+                report.errors[node.name] = error
+            finished(node.name, "error" if error is not None else "ok")
+
+        now = time.perf_counter()
+        for future, (node, start) in list(running.items()):
+            if limit(node) is not None and now - start >= limit(node):
+                del running[future]
+                abandon(node, now - start, CollectorTimeout(f"Timed out after {limit(node):g}s"))
+        if stop is not None and stop.done():
+            error, status = CollectorCancelled("Cancelled"), "cancelled"
+        elif stop_at is not None and now >= stop_at:
+            error, status = CollectorTimeout(f"Timed out (report deadline of {deadline:g}s)"), "timeout"
+        else:
+            continue
+        for future, (node, start) in list(running.items()):
+            del running[future]
+            abandon(node, now - start, error, status)
+        for node in list(waiting.values()):
+            abandon(node, 0.0, error, status)
+        waiting.clear()
+
+    _close_resources(nodes, values, cancelled)
+    if cache is not None:
+        for name in names:
+            if name in report.cached or name in report.errors:
+                continue
+            # A section built without one of its resources is degraded, not cacheable
+            if all(values.get(dep) is not None for dep in nodes[name].requires):
+                cache.put(name, values[name])
+        cache.save()
+
+    report.wall = time.perf_counter() - started
+    for name in names:
+        report.sections[name] = values[name]
+    return report
+
+def _refresh_live(node, value):
+    """Overlay a cached section with the current values of its volatile fields."""
+    if node.live is None or not isinstance(value, dict):
+        return value
+    try:
+        return {**value, **node.live()}
+    except Exception:
+        return value
+
+def _close_resources(nodes, values, cancelled=()):
+    """Release every resource that was opened during the run and not cancelled."""
+    for name, node in nodes.items():
+        if isinstance(node, Resource) and node.close and values.get(name) is not None and name not in cancelled:
+            node.close(values[name])
@@ -0,0 +1,63 @@
+"""Firmware boot mode and Secure Boot state, read directly from the OS.
+
+Replaces running the full `systeminfo` command (which also enumerates hotfixes
+and network cards) just to find "BIOS Mode: UEFI". Both values come from one
+probe() call and no subprocess is started.
+"""
+import os
+import sys
+
+# EFI global variable GUID that owns the SecureBoot variable
+EFI_GLOBAL_VARIABLE = "8be4df61-93ca-11d2-aa0d-00e098032b8c"
+
+
+class FirmwareUnavailable(OSError):
+    """There is no way to read the firmware mode on this platform."""
+
+
+def probe():
+    """Return {"mode": "UEFI" | "BIOS" | "Unknown", "secure_boot": True | False | None}.
+
+    secure_boot is None when the firmware does not report it. Raises
+    FirmwareUnavailable on a platform without a probe (macOS), which the
+    uefi section reports as an error.
+    """
+    if sys.platform == "win32":
+        return _probe_windows()
+    if sys.platform.startswith("linux"):
+        return _probe_linux()
+    raise FirmwareUnavailable(f"No firmware probe for {sys.platform}")
+
+def _probe_windows():
+    import ctypes
+    import winreg
+
+    firmware_type = ctypes.c_uint()
+    if not ctypes.windll.kernel32.GetFirmwareType(ctypes.byref(firmware_type)):
+        raise ctypes.WinError()
+    mode = {1: "BIOS", 2: "UEFI"}.get(firmware_type.value, "Unknown")
+
+    secure_boot = None
+    if mode == "UEFI":
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Control\SecureBoot\State") as key:
+                secure_boot = bool(winreg.QueryValueEx(key, "UEFISecureBootEnabled")[0])
+        except FileNotFoundError:
+            pass
+    return {"mode": mode, "secure_boot": secure_boot}
+
+def _probe_linux(firmware_root="/sys/firmware"):
+    efi_dir = os.path.join(firmware_root, "efi")
+    if not os.path.isdir(efi_dir):
+        return {"mode": "BIOS", "secure_boot": None}
+
+    secure_boot = None
+    try:
+        with open(os.path.join(efi_dir, "efivars", f"SecureBoot-{EFI_GLOBAL_VARIABLE}"), "rb") as f:
+            data = f.read()
+        # efivarfs prefixes the one-byte value with four bytes of attributes
+        if len(data) >= 5:
+            secure_boot = data[4] == 1
+    except OSError:
+        pass
+    return {"mode": "UEFI", "secure_boot": secure_boot}
@@ -0,0 +1,324 @@
+"""Fleet sweeps: fetch the inventory from the agent on many hosts at once.
+
+Each host runs `python sysinfo_agent.py --listen`, which opens a TCP endpoint
+on the agent next to its local socket (port PORT by default). A Fleet
+connects to the hosts over asyncio, at most concurrency at a time, and yields
+one result per host as soon as that host is done:
+
+    fleet = Fleet(fleet_key())
+    async for result in fleet.sweep(read_hosts("hosts.txt"), ["cpu", "ram"]):
+        writer.write(result)
+
+A result is a plain dict, written as one NDJSON line by NdjsonWriter:
+
+    {"host": "pc-001:47011", "status": "ok", "seconds": 0.08,
+     "sections": {"cpu": {"status": "ok", "seconds": 0.0, "data": {...}}, ...},
+     "summary": {...}, "error": null}
+
+status is "ok" when the agent sent every section without errors, "partial"
+when only some came back (a collector failed or timed out on the host, the
+connection dropped mid-report, or the host deadline passed), "timeout" when
+the deadline passed before any section arrived, and "error" when the host
+could not be reached or refused the key. One host failing never stops the
+sweep. The agent is asked to finish within AGENT_SHARE of the host deadline,
+so a slow collector comes back timed out instead of costing the whole report.
+
+Connections stay open after a sweep and the next sweep of the same Fleet
+reuses them, skipping the TCP and key handshakes; at most max_idle are kept.
+
+On the wire every message is a 4-byte big-endian length and a UTF-8 JSON
+document, the framing of multiprocessing.connection. The agent opens with
+{"challenge": <hex>}, the client answers {"op": "hello", "digest":
+HMAC-SHA256(key, challenge)}, and after an empty {} reply the requests are
+those of the local socket (see agent.py), limited to REMOTE_OPS. All hosts
+share one key, fleet.key in the cache folder; copy it to every host or point
+both ends at the same file.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import struct
+import time
+
+from .helpers import secret
+from .model import GOOD
+from .sections import SECTIONS
+
+PORT = 47011
+# Requests a remote client may make; stopping the agent or rebuilding its caches stays local
+REMOTE_OPS = ("ping", "report", "view", "history")
+# Fraction of the host deadline the agent gets for its own report deadline
+AGENT_SHARE = 0.8
+HANDSHAKE_SECONDS = 10
+MAX_FRAME = 64 << 20
+_LENGTH = struct.Struct("!i")
+
+
+class FleetError(Exception):
+    """A host broke the protocol, refused the key or rejected a request."""
+
+
+def fleet_key(path=None):
+    """Return the key shared by the fleet: the contents of path, or fleet.key in the cache folder."""
+    if path:
+        with open(path, "rb") as f:
+            return f.read()
+    return secret("fleet.key")
+
+def parse_host(text, port=PORT):
+    """Return (host, port) for "name", "name:port", "10.0.0.5" or "[fe80::1]:port"."""
+    text = text.strip()
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else port
+    if text.count(":") == 1:
+        host, _, number = text.partition(":")
+        return host, int(number)
+    return text, port
+
+def read_hosts(path):
+    """Return the hosts listed in path, one per line; blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [line.split("#")[0].strip() for line in f if line.split("#")[0].strip()]
+
+def encode(message):
+    data = json.dumps(message, default=str).encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+def digest(key, challenge):
+    return hmac.new(key, bytes.fromhex(challenge), hashlib.sha256).hexdigest()
+
+
+class SocketConnection:
+    """A TCP socket with the send_bytes/recv_bytes interface of a multiprocessing Connection, for the agent."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._file = sock.makefile("rb")
+
+    def send_bytes(self, data):
+        self._sock.sendall(_LENGTH.pack(len(data)) + data)
+
+    def recv_bytes(self):
+        header = self._file.read(_LENGTH.size)
+        if len(header) < _LENGTH.size:
+            raise EOFError("Connection closed")
+        (size,) = _LENGTH.unpack(header)
+        if not 0 <= size <= MAX_FRAME:
+            raise OSError(f"Bad frame length {size}")
+        data = self._file.read(size)
+        if len(data) < size:
+            raise EOFError("Connection closed mid-frame")
+        return data
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def accept_handshake(conn, sock, key):
+    """Challenge a new client on conn; return True if it proved it holds key."""
+    challenge = os.urandom(32).hex()
+    sock.settimeout(HANDSHAKE_SECONDS)
+    try:
+        conn.send_bytes(json.dumps({"challenge": challenge}).encode("utf-8"))
+        hello = json.loads(conn.recv_bytes().decode("utf-8"))
+        if hello.get("op") != "hello" or not hmac.compare_digest(str(hello.get("digest")), digest(key, challenge)):
+            conn.send_bytes(json.dumps({"error": "Wrong fleet key"}).encode("utf-8"))
+            return False
+        conn.send_bytes(b"{}")
+    except (OSError, EOFError, ValueError, AttributeError):
+        return False
+    sock.settimeout(None)
+    return True
+
+
+class HostConnection:
+    """The client end of one authenticated connection to a host's agent."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host, port, key):
+        reader, writer = await asyncio.open_connection(host, port)
+        conn = cls(reader, writer)
+        try:
+            hello = await conn.receive()
+            conn.send({"op": "hello", "digest": digest(key, hello["challenge"])})
+            reply = await conn.receive()
+        except BaseException:
+            conn.close()
+            raise
+        if "error" in reply:
+            conn.close()
+            raise FleetError(reply["error"])
+        return conn
+
+    def send(self, message):
+        self.writer.write(encode(message))
+
+    async def receive(self):
+        (size,) = _LENGTH.unpack(await self.reader.readexactly(_LENGTH.size))
+        if not 0 <= size <= MAX_FRAME:
+            raise FleetError(f"Bad frame length {size}")
+        return json.loads(await self.reader.readexactly(size))
+
+    async def request(self, message):
+        """Send a single-reply request and return the reply."""
+        self.send(message)
+        reply = await self.receive()
+        if "error" in reply:
+            raise FleetError(reply["error"])
+        return reply
+
+    def close(self):
+        self.writer.close()
+
+
+class Fleet:
+    """Sweeps hosts concurrently, keeping their connections for the next sweep."""
+
+    def __init__(self, key, concurrency=256, host_timeout=10.0, max_idle=1024, port=PORT):
+        self.key = key
+        self.concurrency = concurrency
+        self.host_timeout = host_timeout
+        self.max_idle = max_idle
+        self.port = port
+        # "host:port" -> HostConnection, least recently used first
+        self._idle = {}
+
+    async def sweep(self, hosts, sections=None, timeout=None, refresh=False):
+        """Yield a result dict for every host, in the order they finish.
+
+        A fixed pool of concurrency workers pulls hosts from the list, so
+        memory stays flat however many hosts there are. timeout is the agent's
+        per-collector timeout; refresh skips the agent's snapshot cache.
+        """
+        hosts = list(hosts)
+        message = {"op": "report", "names": list(SECTIONS if sections is None else sections), "refresh": refresh,
+                   "timeout": timeout, "deadline": self.host_timeout * AGENT_SHARE}
+        pending = iter(hosts)
+        results = asyncio.Queue()
+
+        async def worker():
+            # The iterator is shared; no await separates next() from its use
+            for host in pending:
+                results.put_nowait(await self.query(host, message))
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, len(hosts)))]
+        try:
+            for _ in hosts:
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def query(self, host, message):
+        """Send message, a report request, to host and return its result dict; never raises for a failing host."""
+        address = parse_host(host, self.port)
+        label = f"{address[0]}:{address[1]}"
+        result = {"host": label, "status": "error", "seconds": None, "sections": {}, "summary": None, "error": None}
+        start = time.monotonic()
+        timed_out = False
+        try:
+            conn = await asyncio.wait_for(self._report(label, address, message, result), self.host_timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            result["error"] = f"No complete answer within {self.host_timeout:g}s"
+        except asyncio.IncompleteReadError:
+            result["error"] = f"Connection closed after {len(result['sections'])} sections"
+        except (OSError, EOFError, FleetError, ValueError, KeyError) as e:
+            result["error"] = str(e) or type(e).__name__
+        else:
+            self._keep(label, conn)
+        result["seconds"] = round(time.monotonic() - start, 6)
+        summary = result["summary"]
+        if summary is not None:
+            result["status"] = "partial" if summary["errors"] or summary["timed_out"] else "ok"
+        elif result["sections"]:
+            result["status"] = "partial"
+        elif timed_out:
+            result["status"] = "timeout"
+        return result
+
+    async def _report(self, label, address, message, result):
+        conn = self._idle.pop(label, None)
+        if conn is not None:
+            try:
+                return await self._ask(conn, message, result)
+            except (OSError, asyncio.IncompleteReadError):
+                if result["sections"]:
+                    raise
+                # The agent dropped the idle connection (restarted, or closed it); dial again
+        conn = await HostConnection.open(*address, self.key)
+        return await self._ask(conn, message, result)
+
+    async def _ask(self, conn, message, result):
+        """Stream one report from conn into result; return conn if it is still usable."""
+        try:
+            conn.send(message)
+            while True:
+                reply = await conn.receive()
+                if "section" in reply:
+                    # As in Get-Systeminfo.py --format json: a section that did not finish has no data
+                    result["sections"][reply["section"]] = {"status": reply["status"], "seconds": reply["seconds"],
+                                                            "data": reply["data"] if reply["status"] in GOOD else None}
+                    continue
+                if "error" in reply:
+                    raise FleetError(reply["error"])
+                result["summary"] = reply.get("summary")
+                return conn
+        except BaseException:
+            conn.close()
+            raise
+
+    def _keep(self, label, conn):
+        old = self._idle.pop(label, None)
+        if old is not None:
+            old.close()
+        self._idle[label] = conn
+        while len(self._idle) > self.max_idle:
+            self._idle.pop(next(iter(self._idle))).close()
+
+    async def close(self):
+        """Close every kept connection."""
+        conns = list(self._idle.values())
+        self._idle = {}
+        for conn in conns:
+            conn.close()
+        await asyncio.gather(*(conn.writer.wait_closed() for conn in conns), return_exceptions=True)
+
+
+class NdjsonWriter:
+    """Writes sweep results one per line, then a {"fleet": ...} line with the tally and the failed hosts."""
+
+    STATUSES = ("ok", "partial", "timeout", "error")
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.counts = dict.fromkeys(self.STATUSES, 0)
+        self.failed = {}
+
+    def write(self, result):
+        self.stream.write(json.dumps(result) + "\n")
+        self.counts[result["status"]] += 1
+        if result["status"] != "ok":
+            self.failed[result["host"]] = result["error"] or "Sections failed: " + ", ".join(
+                sorted(set(result["summary"]["errors"]) | set(result["summary"]["timed_out"])))
+
+    def finish(self, wall):
+        """Write the sweep summary line and return it."""
+        summary = {"hosts": sum(self.counts.values()), **self.counts, "wall_seconds": round(wall, 3), "failed": self.failed}
+        self.stream.write(json.dumps({"fleet": summary}) + "\n")
+        self.stream.flush()
+        return summary
@@ -0,0 +1,156 @@
+"""Stand-in fleet agents on loopback, for exercising fleet sweeps without a fleet.
+
+    python -m inventory.fleet_standin --count 5000 --hosts-out hosts.txt [--faults 0.02]
+    python sysinfo_fleet.py hosts.txt --key <the key file it prints>
+
+Starts count listeners on 127.0.0.1 in one event loop. Each speaks the
+agent's TCP protocol (see fleet.py) and answers every report request with
+the same report, collected once from a replay fixture, and ping with a
+canned reply. --latency delays each report.
+
+With --faults a fraction of the hosts misbehave, taking turns at FAULTS:
+"hang" never answers a report, "drop" closes the connection half-way through
+one, "down" refuses connections and "badkey" rejects the key.
+"""
+import argparse
+import asyncio
+import hmac
+import json
+import os
+import sys
+
+from . import emit, engine, replay, sections
+from .fleet import MAX_FRAME, _LENGTH, digest, encode
+from .model import to_plain
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURE = os.path.join(HERE, "..", "fixtures", "windows11_laptop.json")
+FAULTS = ("hang", "drop", "down", "badkey")
+
+
+def canned_report(fixture=DEFAULT_FIXTURE):
+    """Collect the report from fixture and return it as the frames an agent would stream."""
+    replay.configure(replay=fixture)
+    sections.load()
+    messages = []
+    report = engine.run(sections.SECTIONS, on_section=lambda result: messages.append(
+        {"section": result.name, "status": result.status, "seconds": result.seconds,
+         "data": to_plain(result.value, text=True)}))
+    return [encode(message) for message in messages] + [encode({"summary": emit.summary(report)})]
+
+def fault_plan(count, faults):
+    """Return the fault of each of count hosts (None for a healthy one), spread evenly."""
+    plan = [None] * count
+    faulty = int(count * faults)
+    for k in range(faulty):
+        plan[k * count // faulty] = FAULTS[k % len(FAULTS)]
+    return plan
+
+
+class StandIn:
+    """One stand-in agent; fault is None or one of FAULTS."""
+
+    def __init__(self, frames, key, fault=None, latency=0.0):
+        self.frames = frames
+        self.key = key
+        self.fault = fault
+        self.latency = latency
+
+    async def handle(self, reader, writer):
+        try:
+            challenge = os.urandom(32).hex()
+            writer.write(encode({"challenge": challenge}))
+            hello = await self._receive(reader)
+            if self.fault == "badkey" or not hmac.compare_digest(str(hello.get("digest")), digest(self.key, challenge)):
+                writer.write(encode({"error": "Wrong fleet key"}))
+                return
+            writer.write(encode({}))
+            while True:
+                message = await self._receive(reader)
+                if message.get("op") == "ping":
+                    writer.write(encode({"pid": os.getpid(), "uptime": 0.0, "backend": "replay", "resources": [], "sampling": None}))
+                    continue
+                if message.get("op") != "report":
+                    writer.write(encode({"error": f"Unknown request {message.get('op')!r}"}))
+                    continue
+                if self.fault == "hang":
+                    # Hold the connection without answering until the client gives up
+                    await reader.read()
+                    return
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if self.fault == "drop":
+                    writer.write(b"".join(self.frames[:len(self.frames) // 2]))
+                    return
+                writer.write(b"".join(self.frames))
+                await writer.drain()
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _receive(reader):
+        (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        if not 0 <= size <= MAX_FRAME:
+            raise ValueError(f"Bad frame length {size}")
+        return json.loads(await reader.readexactly(size))
+
+
+async def start(count, frames, key, faults=0.0, latency=0.0, host="127.0.0.1"):
+    """Start count stand-ins on host; return (servers, ["host:port", ...], plan)."""
+    servers = []
+    hosts = []
+    plan = fault_plan(count, faults)
+    for fault in plan:
+        server = await asyncio.start_server(StandIn(frames, key, fault, latency).handle, host, 0, backlog=64)
+        port = server.sockets[0].getsockname()[1]
+        if fault == "down":
+            # Nothing listens on the port once it is closed, so connecting is refused
+            server.close()
+        else:
+            servers.append(server)
+        hosts.append(f"{host}:{port}")
+    return servers, hosts, plan
+
+def raise_fd_limit(needed):
+    """Raise the soft open-file limit towards needed, where the OS has one."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed if hard == resource.RLIM_INFINITY else min(needed, hard), hard))
+
+async def serve(args):
+    with open(args.key, "rb") as f:
+        key = f.read()
+    frames = canned_report(args.fixture)
+    servers, hosts, plan = await start(args.count, frames, key, args.faults, args.latency)
+    with open(args.hosts_out, "w", encoding="utf-8") as f:
+        for address, fault in zip(hosts, plan):
+            f.write(f"{address}  # {fault}\n" if fault else f"{address}\n")
+    print(f"{args.count} stand-in agents on 127.0.0.1, {plan.count(None)} healthy; hosts in {args.hosts_out}, key {args.key}")
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run stand-in fleet agents on loopback.")
+    parser.add_argument("--count", type=int, default=100, help="number of stand-in agents (default: 100)")
+    parser.add_argument("--hosts-out", default="standin_hosts.txt", help="where to write the host list (default: standin_hosts.txt)")
+    parser.add_argument("--key", default="standin_fleet.key", help="key file, created if missing (default: standin_fleet.key)")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="replay fixture the report is collected from")
+    parser.add_argument("--faults", type=float, default=0.0, help="fraction of hosts that misbehave (default: 0)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds each report is delayed (default: 0)")
+    args = parser.parse_args()
+    if not os.path.exists(args.key):
+        with open(args.key, "wb") as f:
+            f.write(os.urandom(32))
+    raise_fd_limit(args.count * 2 + 256)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Inventory history in SQLite: every snapshot of every host, one table per section.
+
+Each snapshot is a row of `snapshots` (id, host, received, failed). Its
+sections go into cpu, ram, board, battery, tpm, uefi and office, one row per
+snapshot keyed by snapshot_id, and into disks, one row per device. The
+column names are the section field names the report already
+uses (the FIELDS of each section module), so
+
+    SELECT s.host, b.health FROM battery b JOIN snapshots s ON s.id = b.snapshot_id WHERE b.health < 70
+
+reads as the report does. Quantities are stored as their number in the
+report's unit: bytes, MHz, KB, Wh, mAh and percent. A value the host did not
+report (null in the JSON) is NULL. The true/false fields (FLAGS) are stored as 1 and 0. Sections that failed or timed out in a snapshot
+get no row; their names are in snapshots.failed.
+
+    history = History()                       # history.sqlite in the cache folder
+    history.add_many((host, sections, received) for ...)
+    history.latest("battery", "health < ?", (70,))
+
+The database runs in WAL mode, so readers are not blocked while a batch is
+written. add_many() writes BATCH snapshots per transaction, with one
+executemany() per table. One connection serves every thread, so a lock keeps
+each transaction, and each query, to itself.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .helpers import cache_dir
+from .sections import battery, board, cpu, office, ram, ssd, tpm, uefi
+
+GOOD = ("ok", "cached")
+BATCH = 5000
+# Stored as PRAGMA user_version; bumped whenever a table changes
+SCHEMA = 2
+FLAGS = {"present", "ready", "installed"}
+# table -> (report section, fields, numeric fields, one row per device)
+TABLES = {
+    "cpu": ("cpu", cpu.FIELDS, {"cores", "threads", "speed", "max_speed", "l1_cache", "l2_cache", "l3_cache"}, False),
+    "ram": ("ram", ram.FIELDS, {"total", "speed"}, False),
+    "board": ("board", board.FIELDS, set(), False),
+    "battery": ("battery", battery.FIELDS, {"chemistry", "design_capacity_wh", "full_capacity_wh",
+                                            "design_capacity_mah", "full_capacity_mah", "health"}, False),
+    "disks": ("ssd", ssd.FIELDS, {"size"}, True),
+    "tpm": ("tpm", tpm.FIELDS, set(), False),
+    "uefi": ("uefi", uefi.FIELDS, set(), False),
+    "office": ("office", office.FIELDS, set(), False),
+}
+INDEXES = (
+    "snapshots (host, id)",
+    "snapshots (received)",
+    "cpu (generation)",
+    "ram (type)",
+    "board (serial_number)",
+    "battery (health)",
+    "disks (serial_number)",
+    "tpm (status)",
+    "uefi (secure_boot)",
+    "office (license_status)",
+)
+
+
+# Exact class checks: these run for every field of every snapshot, and bool must not pass as a number
+def _number(value):
+    if value.__class__ is dict:
+        value = value.get("value")
+    return value if value.__class__ is int or value.__class__ is float else None
+
+def _text(value):
+    if value is None or value.__class__ is str:
+        return value
+    if isinstance(value, dict) and "value" in value:
+        return value.get("text") or f"{value['value']} {value.get('unit', '')}".strip()
+    return str(value)
+
+def _flag(value):
+    return int(value) if value.__class__ is bool else None
+
+def _type(name, numeric):
+    return "INTEGER" if name in FLAGS else "NUMERIC" if name in numeric else "TEXT"
+
+def _columns(table):
+    section, fields, numeric, many = TABLES[table]
+    key = "snapshot_id INTEGER NOT NULL REFERENCES snapshots (id), position INTEGER NOT NULL" if many else \
+          "snapshot_id INTEGER PRIMARY KEY REFERENCES snapshots (id)"
+    columns = ", ".join(f"{name} {_type(name, numeric)}" for name in fields)
+    return f"{key}, {columns}" + (", PRIMARY KEY (snapshot_id, position)" if many else "")
+
+
+class History:
+    """A SQLite inventory history; safe to share between threads of one process."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "history.sqlite")
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # Transactions belong to the connection, not the thread: two threads inside BEGIN ... COMMIT
+        # at once would nest them, and one's ROLLBACK would undo the other's batch
+        self._lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode = WAL")
+        # With WAL a commit survives a crash of the process; NORMAL only risks the last commits on power loss
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA and self.db.execute("SELECT 1 FROM sqlite_master WHERE name = 'snapshots'").fetchone():
+            self.db.close()
+            raise ValueError(f"{self.path} holds history schema {version}, not {SCHEMA}; move it aside to start a new one")
+        self.db.execute(f"PRAGMA user_version = {SCHEMA}")
+        self.db.execute("CREATE TABLE IF NOT EXISTS snapshots (id INTEGER PRIMARY KEY, host TEXT NOT NULL, "
+                        "received REAL NOT NULL, failed TEXT)")
+        for table in TABLES:
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({_columns(table)})")
+        for index in INDEXES:
+            name = "idx_" + re.sub(r"\W+", "_", index).strip("_")
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {index}")
+        self._converters = {table: [(name, _flag if name in FLAGS else _number if name in numeric else _text) for name in fields]
+                             for table, (section, fields, numeric, many) in TABLES.items()}
+        self._inserts = {table: f"INSERT INTO {table} VALUES ({', '.join('?' * (len(TABLES[table][1]) + (2 if TABLES[table][3] else 1)))})"
+                         for table in TABLES}
+
+    def add(self, host, sections, received=None):
+        """Store one snapshot and return its id."""
+        return self._write([(host, sections, received)])[0]
+
+    def add_many(self, reports):
+        """Store (host, sections, received) snapshots, BATCH per transaction; return how many were stored.
+
+        sections is the "sections" object of a JSON report: name -> {"status", "data", ...}.
+        """
+        stored = 0
+        batch = []
+        for report in reports:
+            batch.append(report)
+            if len(batch) >= BATCH:
+                stored += len(self._write(batch))
+                batch = []
+        if batch:
+            stored += len(self._write(batch))
+        return stored
+
+    def _write(self, batch):
+        """Store batch in one transaction and return the new snapshot ids."""
+        with self._lock:
+            return self._transaction(batch)
+
+    def _transaction(self, batch):
+        snapshots = []
+        rows = {table: [] for table in TABLES}
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            # Ids are assigned here, so a whole batch needs no lastrowid round trips
+            next_id = self.db.execute("SELECT COALESCE(MAX(id), 0) FROM snapshots").fetchone()[0] + 1
+            for host, sections, received in batch:
+                snapshot_id = next_id
+                next_id += 1
+                failed = sorted(name for name, entry in sections.items() if entry.get("status") not in GOOD)
+                snapshots.append((snapshot_id, host, received if received is not None else time.time(), ",".join(failed) or None))
+                for table, (section, fields, numeric, many) in TABLES.items():
+                    converters = self._converters[table]
+                    entry = sections.get(section)
+                    if not entry or entry.get("status") not in GOOD:
+                        continue
+                    data = entry.get("data")
+                    if many:
+                        rows[table].extend([snapshot_id, position] + [convert(item.get(name)) for name, convert in converters]
+                                           for position, item in enumerate(data or []) if isinstance(item, dict))
+                    elif isinstance(data, dict):
+                        rows[table].append([snapshot_id] + [convert(data.get(name)) for name, convert in converters])
+            self.db.executemany("INSERT INTO snapshots VALUES (?, ?, ?, ?)", snapshots)
+            for table, table_rows in rows.items():
+                if table_rows:
+                    self.db.executemany(self._inserts[table], table_rows)
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        return [snapshot[0] for snapshot in snapshots]
+
+    def latest(self, table, where="1", params=()):
+        """Return the rows of table in each host's newest snapshot that match where, as dicts with host and received."""
+        if table not in TABLES:
+            raise ValueError(f"Unknown table {table!r} (choose from {', '.join(TABLES)})")
+        with self._lock:
+            cursor = self.db.execute(
+                f"SELECT s.host, s.received, t.* FROM {table} t JOIN snapshots s ON s.id = t.snapshot_id "
+                f"WHERE ({where}) AND s.id = (SELECT MAX(id) FROM snapshots WHERE host = s.host) ORDER BY s.host", params)
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor]
+
+    def snapshots(self, host):
+        """Return [(id, received, failed)] for host, oldest first."""
+        with self._lock:
+            return self.db.execute("SELECT id, received, failed FROM snapshots WHERE host = ? ORDER BY id", (host,)).fetchall()
+
+    def count(self):
+        """Return how many snapshots are stored."""
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.db.close()
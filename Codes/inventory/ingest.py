@@ -0,0 +1,280 @@
+"""Inventory ingestion: the latest snapshot of every host, indexed for fleet queries.
+
+An InventoryStore keeps the newest sections posted for each host and one
+index per entry of INDEXES: CPU generation, RAM type, TPM status, Secure
+Boot state and Office licence status. Each index maps a value to a bitmap of
+hosts, a Python int with one bit per host slot. A filter is then a few big-int
+ANDs and ORs and a count is int.bit_count(), a handful of microseconds even
+with 100,000 hosts:
+
+    store = InventoryStore()
+    store.put("pc-001", report["sections"])
+    store.count(tpm_status="No TPM detected", secure_boot=["Disabled", "N/A"])
+    store.hosts(ram_type="DDR4", limit=50)
+
+Repeating a filter name ORs its values; different names are ANDed.
+
+A section that failed or timed out on the host keeps its previous good value,
+so a partial report (see fleet.py) never erases what is already known. A host
+whose index values did not change costs no index updates.
+
+make_server() puts the store behind HTTP (sysinfo_ingest.py):
+
+    POST /inventory[?host=NAME]    Get-Systeminfo.py --format json/ndjson output, or sysinfo_fleet.py NDJSON
+    GET  /count?tpm_status=...     {"count": n}
+    GET  /hosts?ram_type=DDR4&limit=100&offset=0   {"count": n, "hosts": [...]}
+    GET  /hosts/NAME               the host's stored snapshot
+    GET  /facets/INDEX             {value: count} for one index
+
+Given a history.History, the server also appends every posted report to it.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Section statuses whose data is a real reading
+GOOD = ("ok", "cached")
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+def _field(section, name):
+    def key(sections):
+        entry = sections.get(section)
+        if not entry or entry.get("status") not in GOOD or not isinstance(entry.get("data"), dict):
+            return None
+        value = entry["data"].get(name)
+        return value if isinstance(value, str) else None
+    return key
+
+def office_licence(sections):
+    """Return the licence status of the office section ("Activated", "Not installed", ...), or None."""
+    entry = sections.get("office")
+    if not entry or entry.get("status") not in GOOD or not isinstance(entry.get("data"), dict):
+        return None
+    office = entry["data"]
+    if office.get("installed") is not True:
+        return "Not installed" if office.get("installed") is False else None
+    return office.get("license_status") or "Unknown"
+
+INDEXES = {
+    "cpu_generation": _field("cpu", "generation"),
+    "ram_type": _field("ram", "type"),
+    "tpm_status": _field("tpm", "status"),
+    "secure_boot": _field("uefi", "secure_boot"),
+    "office_licence": office_licence,
+}
+
+
+class InventoryStore:
+    """Latest sections per host, with a value -> host bitmap index per entry of INDEXES.
+
+    Thread-safe: put() and remove() change the indexes in place, so every
+    reader of them takes the same lock.
+    """
+
+    def __init__(self):
+        self.snapshots = {}
+        self._slots = {}
+        self._hosts = []
+        self._free = []
+        self._all = 0
+        self._keys = {}
+        self.indexes = {name: {} for name in INDEXES}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def put(self, host, sections, received=None):
+        """Store the sections of one report for host, keeping older good sections that failed this time."""
+        with self._lock:
+            previous = self.snapshots.get(host)
+            if previous is None:
+                slot = self._free.pop() if self._free else len(self._hosts)
+                if slot == len(self._hosts):
+                    self._hosts.append(host)
+                else:
+                    self._hosts[slot] = host
+                self._slots[host] = slot
+                self._all |= 1 << slot
+            # A new dict rather than an update, so a reader serializing the old one is not disturbed
+            stored = dict(previous["sections"]) if previous else {}
+            for name, entry in sections.items():
+                if entry.get("status") in GOOD or name not in stored:
+                    stored[name] = entry
+            self.snapshots[host] = {"host": host, "received": received if received is not None else time.time(), "sections": stored}
+            self._index(host, {name: key(stored) for name, key in INDEXES.items()})
+
+    def remove(self, host):
+        with self._lock:
+            if self.snapshots.pop(host, None) is None:
+                return
+            self._index(host, dict.fromkeys(INDEXES))
+            del self._keys[host]
+            slot = self._slots.pop(host)
+            self._hosts[slot] = None
+            self._free.append(slot)
+            self._all ^= 1 << slot
+
+    def _index(self, host, values):
+        bit = 1 << self._slots[host]
+        old = self._keys.get(host, {})
+        for name, value in values.items():
+            before = old.get(name)
+            if before == value:
+                continue
+            index = self.indexes[name]
+            if before is not None:
+                remaining = index[before] ^ bit
+                if remaining:
+                    index[before] = remaining
+                else:
+                    del index[before]
+            if value is not None:
+                index[value] = index.get(value, 0) | bit
+        self._keys[host] = values
+
+    def match(self, **filters):
+        """Return the bitmap of hosts matching filters: index name -> value or list of values."""
+        with self._lock:
+            return self._match(filters)
+
+    def _match(self, filters):
+        result = self._all
+        for name, wanted in filters.items():
+            index = self.indexes.get(name)
+            if index is None:
+                raise KeyError(f"No index {name!r} (choose from {', '.join(INDEXES)})")
+            bitmap = 0
+            for value in (wanted if isinstance(wanted, (list, tuple, set)) else (wanted,)):
+                bitmap |= index.get(value, 0)
+            result &= bitmap
+        return result
+
+    def count(self, **filters):
+        return self.match(**filters).bit_count()
+
+    def hosts(self, limit=None, offset=0, **filters):
+        """Return the hosts matching filters in slot order, skipping offset and stopping at limit."""
+        with self._lock:
+            # Held while the slots are read back, so a slot freed and reused meanwhile cannot name another host
+            bitmap = self._match(filters)
+            data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+            found = []
+            for byte in _NONZERO.finditer(data):
+                base = byte.start() * 8
+                value = data[byte.start()]
+                for bit in range(8):
+                    if value >> bit & 1:
+                        if offset:
+                            offset -= 1
+                            continue
+                        found.append(self._hosts[base + bit])
+                        if limit is not None and len(found) >= limit:
+                            return found
+            return found
+
+    def facets(self, name):
+        """Return {value: number of hosts} for one index."""
+        if name not in self.indexes:
+            raise KeyError(f"No index {name!r} (choose from {', '.join(INDEXES)})")
+        with self._lock:
+            return {value: bitmap.bit_count() for value, bitmap in self.indexes[name].items()}
+
+    def get(self, host):
+        return self.snapshots.get(host)
+
+
+def parse_reports(body, host=None):
+    """Yield (host, sections) for each report in a POST body.
+
+    The body is one Get-Systeminfo.py JSON document, its NDJSON stream, or
+    sysinfo_fleet.py NDJSON with a "host" on every line. host names the
+    machine for the first two, which do not carry one.
+    """
+    text = body.decode("utf-8") if isinstance(body, bytes) else body
+    try:
+        documents = [json.loads(text)]
+    except ValueError:
+        documents = [json.loads(line) for line in text.splitlines() if line.strip()]
+    streamed = {}
+    for document in documents:
+        if "section" in document:
+            streamed[document["section"]] = {key: document.get(key) for key in ("status", "seconds", "data")}
+        elif "sections" in document:
+            name = document.get("host") or host
+            if not name:
+                raise ValueError("A report that does not name its host")
+            if document["sections"]:
+                yield name, document["sections"]
+    if streamed:
+        if not host:
+            raise ValueError("A report that does not name its host")
+        yield host, streamed
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    history = None
+    # Headers and body are separate writes; without this each keep-alive reply waits out a delayed ACK
+    disable_nagle_algorithm = True
+    store = None
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/inventory":
+            return self._reply(404, {"error": f"No such endpoint {url.path}"})
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        host = parse_qs(url.query).get("host", [None])[0]
+        received = time.time()
+        try:
+            reports = list(parse_reports(body, host))
+        except (ValueError, AttributeError, TypeError) as e:
+            return self._reply(400, {"error": f"{e} (name it with ?host=)" if host is None else str(e), "stored": 0})
+        for name, sections in reports:
+            self.store.put(name, sections, received)
+        if self.history is not None:
+            self.history.add_many((name, sections, received) for name, sections in reports)
+        self._reply(200, {"stored": len(reports)})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            paging = {key: int(query.pop(key)[0]) for key in ("limit", "offset") if key in query}
+            filters = {name: values if len(values) > 1 else values[0] for name, values in query.items()}
+            if url.path == "/count":
+                return self._reply(200, {"count": self.store.count(**filters)})
+            if url.path == "/hosts":
+                return self._reply(200, {"count": self.store.count(**filters), "hosts": self.store.hosts(**paging, **filters)})
+            if url.path.startswith("/hosts/"):
+                snapshot = self.store.get(unquote(url.path[len("/hosts/"):]))
+                return self._reply(200, snapshot) if snapshot else self._reply(404, {"error": "Unknown host"})
+            if url.path.startswith("/facets/"):
+                return self._reply(200, self.store.facets(url.path[len("/facets/"):]))
+            if url.path == "/":
+                return self._reply(200, {"hosts": len(self.store), "indexes": list(INDEXES)})
+        except (KeyError, ValueError) as e:
+            return self._reply(400, {"error": str(e.args[0])})
+        self._reply(404, {"error": f"No such endpoint {url.path}"})
+
+    def _reply(self, code, message):
+        data = json.dumps(message).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(address, store=None, history=None):
+    """Return a ThreadingHTTPServer for store (a new InventoryStore by default) on (host, port); call serve_forever()."""
+    handler = type("Handler", (_Handler,), {"store": store if store is not None else InventoryStore(), "history": history})
+    server = ThreadingHTTPServer(address, handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,90 @@
+"""Typed values in report sections and the per-section result record.
+
+Collectors put a Quantity wherever the report shows a measured number. The
+Quantity keeps the raw value and its unit (bytes, MHz, Wh, ...) apart from the
+text the report prints, so structured output can carry the numbers as they
+were measured while the text report stays unchanged. A number the system did
+not report is a Quantity with value None (see unknown()): the report prints
+"Unknown" and structured output has null.
+"""
+
+# Statuses of a section whose data is a real reading
+GOOD = ("ok", "cached")
+
+
+class Quantity:
+    """A number, its unit and the text the report prints for it."""
+
+    __slots__ = ("value", "unit", "text")
+
+    def __init__(self, value, unit, text=None):
+        self.value = value
+        self.unit = unit
+        self.text = f"{value} {unit}" if text is None else text
+
+    def __str__(self):
+        return self.text
+
+    def __format__(self, spec):
+        return format(self.text, spec)
+
+    def __repr__(self):
+        return f"Quantity({self.value!r}, {self.unit!r}, {self.text!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Quantity) and (self.value, self.unit) == (other.value, other.unit)
+
+    __hash__ = None
+
+
+def size(num_bytes):
+    """Return a byte count shown in GB, as the report has always printed sizes."""
+    from .helpers import bytes_to_gb
+    return Quantity(num_bytes or 0, "B", bytes_to_gb(num_bytes))
+
+def unknown(unit, text="Unknown"):
+    """Return the Quantity for a number the system did not report, printed as text."""
+    return Quantity(None, unit, text)
+
+def to_plain(value, text=False):
+    """Convert a section value into JSON types; Quantities become {"value", "unit"} objects, unknown ones null.
+
+    With text=True the printed text is kept too, so from_plain() can rebuild it.
+    """
+    if isinstance(value, Quantity):
+        if value.value is None and not text:
+            return None
+        plain = {"value": value.value, "unit": value.unit}
+        if text:
+            plain["text"] = value.text
+        return plain
+    if isinstance(value, dict):
+        return {key: to_plain(item, text) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item, text) for item in value]
+    return value
+
+def from_plain(value):
+    """Rebuild the Quantities in a value stored by to_plain(value, text=True)."""
+    if isinstance(value, dict):
+        if value.keys() == {"value", "unit", "text"}:
+            return Quantity(value["value"], value["unit"], value["text"])
+        return {key: from_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [from_plain(item) for item in value]
+    return value
+
+
+class SectionResult:
+    """One finished section: how it ended ("ok", "error", "timeout", "cancelled" or "cached"), its time and value."""
+
+    def __init__(self, name, value, status="ok", seconds=0.0):
+        self.name = name
+        self.value = value
+        self.status = status
+        self.seconds = seconds
+
+    def to_dict(self):
+        """Return the section as structured output writes it; a section that did not finish has data null."""
+        return {"section": self.name, "status": self.status, "seconds": round(self.seconds, 6),
+                "data": to_plain(self.value) if self.status in GOOD else None}
@@ -0,0 +1,160 @@
+"""Per-adapter network rates: rx/tx bytes, packets, errors and drops per second.
+
+A NetIoSampler diffs the cumulative interface counters between calls. On
+Linux it re-reads /proc/net/dev into a buffer kept between calls, grown when
+the file outgrows it. Elsewhere it uses psutil.net_io_counters(pernic=True).
+Counters and rates live in array('d') blocks allocated once, like diskio.py. Each update also goes into
+a SeriesStore (timeseries.py), so every adapter keeps a history of its rates
+and top_talkers() can rank adapters over a recent window.
+
+Adapters are keyed by interface name ("eth0", "Wi-Fi"), and mac() gives the
+address used to join them to the Win32_NetworkAdapterConfiguration rows the
+GUI Network view lists. The adapters are found once, when the sampler is
+created; loopback interfaces are skipped.
+"""
+import math
+import os
+import sys
+import time
+from array import array
+
+import psutil
+
+from .sampler import Poller, read_whole
+from .timeseries import SeriesStore
+
+RATES = ("rx_bytes_per_s", "tx_bytes_per_s", "rx_packets_per_s", "tx_packets_per_s",
+         "rx_errors_per_s", "tx_errors_per_s", "rx_drops_per_s", "tx_drops_per_s")
+# /proc/net/dev columns after "name:" for each rate, in RATES order
+_PROC_COLUMNS = (0, 8, 1, 9, 2, 10, 3, 11)
+
+
+def normalize_mac(mac):
+    """Return mac as upper-case colon-separated hex, the form WMI's MACAddress uses."""
+    return mac.replace("-", ":").upper() if mac else None
+
+def _is_loopback(name):
+    return name == "lo" or name.lower().startswith("loopback")
+
+
+class NetIoSampler(Poller):
+    """Rates of every network adapter since the previous update(), with a rolling history."""
+
+    def __init__(self, interval=1.0, sink=None, history=3600, root="/"):
+        super().__init__(interval, sink)
+        self._procfs = None
+        self._macs = {}
+        if sys.platform.startswith("linux"):
+            net = os.path.join(root, "sys/class/net")
+            self.adapters = sorted(name for name in os.listdir(net) if not _is_loopback(name)) if os.path.isdir(net) else []
+            for name in self.adapters:
+                try:
+                    with open(os.path.join(net, name, "address")) as f:
+                        self._macs[name] = normalize_mac(f.read().strip())
+                except OSError:
+                    pass
+            self._procfs = os.open(os.path.join(root, "proc/net/dev"), os.O_RDONLY)
+            self._buffer = bytearray(1 << 16)
+        else:
+            self.adapters = sorted(name for name in (psutil.net_io_counters(pernic=True) or {}) if not _is_loopback(name))
+            for name, addresses in psutil.net_if_addrs().items():
+                for address in addresses:
+                    if address.family == psutil.AF_LINK:
+                        self._macs[name] = normalize_mac(address.address)
+        self._index = {name: i for i, name in enumerate(self.adapters)}
+        self._previous = array("d", bytes(8 * len(RATES) * len(self.adapters)))
+        self._current = array("d", bytes(8 * len(RATES) * len(self.adapters)))
+        self.rates = array("d", bytes(8 * len(RATES) * len(self.adapters)))
+        self.history = SeriesStore(capacity=history, tiers=())
+        self.interval_seconds = 0.0
+        self._read(self._previous)
+        self._time = time.monotonic()
+
+    def _read(self, counters):
+        width = len(RATES)
+        if self._procfs is not None:
+            self._buffer, size = read_whole(self._procfs, self._buffer)
+            for line in self._buffer[:size].splitlines()[2:]:
+                name, _, values = line.partition(b":")
+                i = self._index.get(name.strip().decode())
+                if i is None:
+                    continue
+                fields = values.split()
+                for k, column in enumerate(_PROC_COLUMNS):
+                    counters[i * width + k] = int(fields[column])
+            return
+        for name, io in (psutil.net_io_counters(pernic=True) or {}).items():
+            i = self._index.get(name)
+            if i is None:
+                continue
+            base = i * width
+            counters[base] = io.bytes_recv
+            counters[base + 1] = io.bytes_sent
+            counters[base + 2] = io.packets_recv
+            counters[base + 3] = io.packets_sent
+            counters[base + 4] = io.errin
+            counters[base + 5] = io.errout
+            counters[base + 6] = io.dropin
+            counters[base + 7] = io.dropout
+
+    def update(self):
+        """Refresh rates and the history with the traffic since the previous call; return the interval in seconds."""
+        self._read(self._current)
+        now = time.monotonic()
+        elapsed = now - self._time
+        if elapsed <= 0:
+            return self.interval_seconds
+        cur, prev, rates = self._current, self._previous, self.rates
+        for k in range(len(rates)):
+            # A counter that went backwards was reset (driver reload); count from zero
+            rates[k] = max(0.0, cur[k] - prev[k]) / elapsed
+        self._previous, self._current = cur, prev
+        self._time = now
+        self.interval_seconds = elapsed
+        point = {"time": time.time()}
+        for name in self.adapters:
+            point[f"total_bytes_per_s:{name}"] = self.rate(name, "rx_bytes_per_s") + self.rate(name, "tx_bytes_per_s")
+        self.history.append(point)
+        return elapsed
+
+    def rate(self, adapter, name):
+        """Return one rate of one adapter from the last update()."""
+        return self.rates[self._index[adapter] * len(RATES) + RATES.index(name)]
+
+    def mac(self, adapter):
+        return self._macs.get(adapter)
+
+    def adapter_for_mac(self, mac):
+        """Return the interface name with this MAC address, or None."""
+        mac = normalize_mac(mac)
+        for name, address in self._macs.items():
+            if address == mac and name in self._index:
+                return name
+        return None
+
+    def top_talkers(self, n=3, seconds=None):
+        """Return [(adapter, rx+tx bytes/s)] for the n busiest adapters, over the last update or the last seconds."""
+        ranking = []
+        for name in self.adapters:
+            if seconds is None:
+                total = self.rate(name, "rx_bytes_per_s") + self.rate(name, "tx_bytes_per_s")
+            else:
+                window = self.history.window(f"total_bytes_per_s:{name}", seconds)
+                values = [value for value in window.mean if not math.isnan(value)] if window else []
+                total = sum(values) / len(values) if values else 0.0
+            ranking.append((total, name))
+        ranking.sort(reverse=True)
+        return [(name, total) for total, name in ranking[:n]]
+
+    def sample(self):
+        """update() and return the rates as {"time": ..., rate: {adapter: value}}."""
+        self.update()
+        sample = {"time": time.time()}
+        for name in RATES:
+            sample[name] = {adapter: self.rate(adapter, name) for adapter in self.adapters}
+        return sample
+
+    def close(self):
+        if self._procfs is not None:
+            os.close(self._procfs)
+            self._procfs = None
@@ -0,0 +1,107 @@
+"""Persistent cache of the parsed Office licence status.
+
+`cscript ospp.vbs /dstatus` is the slowest call in the report, yet its answer
+only changes when Office is reinstalled, updated or re-licensed. The cache
+key is built from the ClickToRun configuration values and the ospp.vbs
+file's path, mtime and size, so the script only runs again when one of those
+changed. Hit and miss counts are kept in the cache file across runs.
+
+The entry is read from disk once and then served from memory. A hit only
+counts itself there; the file is written on a miss, and once at exit to add
+the hits counted since.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+
+from .helpers import cache_dir
+
+
+class LicenseCache:
+    """One cached licence entry plus cumulative hit/miss counters in a JSON file."""
+
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self._entry = None
+        self._hits = 0
+        self.path = path
+        self.refresh = False
+        atexit.register(self.flush)
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = os.path.join(cache_dir(), "office_license.json")
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        # Hits counted against the old file belong to it
+        self.flush()
+        with self._lock:
+            self._path = path
+            self._entry = None
+
+    @staticmethod
+    def make_key(config, ospp_state):
+        """Return the cache key for the ClickToRun config values and the ospp.vbs [path, mtime, size]."""
+        state = {"config": config, "ospp": list(ospp_state)}
+        return hashlib.sha256(json.dumps(state, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+    def get(self, key, compute):
+        """Return the licence cached under key, calling compute() on a miss or forced refresh."""
+        with self._lock:
+            if self._entry is None:
+                self._entry = self._load().get("entry") or {}
+            if not self.refresh and self._entry.get("key") == key:
+                self._hits += 1
+                return self._entry["license"]
+            license = compute()
+            self._entry = {"key": key, "license": license}
+            data = self._load()
+            data["entry"] = self._entry
+            data["misses"] += 1
+            data["hits"] += self._hits
+            self._hits = 0
+            self._save(data)
+            return license
+
+    def stats(self):
+        """Return the cumulative {"hits": n, "misses": n} counters."""
+        with self._lock:
+            data = self._load()
+            return {"hits": data["hits"] + self._hits, "misses": data["misses"]}
+
+    def flush(self):
+        """Add the hits counted in memory to the file."""
+        with self._lock:
+            if not self._hits:
+                return
+            data = self._load()
+            data["hits"] += self._hits
+            self._hits = 0
+            try:
+                self._save(data)
+            except OSError:
+                pass
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("hits", 0)
+        data.setdefault("misses", 0)
+        return data
+
+    def _save(self, data):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+license_cache = LicenseCache()
@@ -0,0 +1,93 @@
+"""Registry, file and cscript access behind the Office section.
+
+The Office section reads the ClickToRun configuration from the registry, looks
+for ospp.vbs and runs `cscript ospp.vbs /dstatus`. It does all of that through
+a probe object, so replay.py can record the answers to a fixture and serve them
+back on a machine without Office, or without Windows at all.
+"""
+import os
+import re
+import subprocess
+
+from .engine import resource
+
+CLICK_TO_RUN_KEY = r"Software\Microsoft\Office\ClickToRun\Configuration"
+OFFICE_KEY = r"Software\Microsoft\Office"
+
+
+class LiveOfficeProbe:
+    """The real registry, Program Files and cscript."""
+
+    def __init__(self):
+        self._proc = None
+        self._cancelled = False
+
+    def click_to_run(self):
+        """Return every value under the ClickToRun Configuration key; FileNotFoundError when absent."""
+        import winreg
+        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, CLICK_TO_RUN_KEY)
+        try:
+            values = {}
+            for i in range(winreg.QueryInfoKey(key)[1]):
+                name, value, _ = winreg.EnumValue(key, i)
+                values[name] = value
+            return values
+        finally:
+            winreg.CloseKey(key)
+
+    def legacy_versions(self):
+        """Return the version subkeys (16.0, 15.0, ...) of a pre-ClickToRun installation."""
+        import winreg
+        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, OFFICE_KEY)
+        try:
+            subkeys = [winreg.EnumKey(key, i) for i in range(winreg.QueryInfoKey(key)[0])]
+        finally:
+            winreg.CloseKey(key)
+        return [name for name in subkeys if re.match(r"^\d+\.\d+$", name)]
+
+    def find_ospp(self):
+        """Return the path of ospp.vbs, or None when it is not installed."""
+        for base_path in [os.environ.get("ProgramFiles", "C:\\Program Files"), os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)")]:
+            for ver in ["Office16", "Office15", "Office14"]:
+                path = os.path.join(base_path, "Microsoft Office", ver, "ospp.vbs")
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def ospp_state(self, ospp_path):
+        """Return [path, mtime_ns, size] of ospp.vbs, which changes whenever Office is updated."""
+        st = os.stat(ospp_path)
+        return [os.path.normcase(ospp_path), st.st_mtime_ns, st.st_size]
+
+    def dstatus(self, ospp_path):
+        """Return the text printed by `ospp.vbs /dstatus`."""
+        if self._cancelled:
+            raise RuntimeError("Office probe was cancelled")
+        command = f'cscript //nologo "{ospp_path}" /dstatus'
+        self._proc = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        output, _ = self._proc.communicate()
+        if self._proc.returncode:
+            raise subprocess.CalledProcessError(self._proc.returncode, command, output)
+        return output
+
+    def close(self):
+        pass
+
+    def cancel(self):
+        """Kill a cscript run that is still going; the probe cannot be used afterwards."""
+        self._cancelled = True
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+
+
+def _close_probe(probe):
+    probe.close()
+
+def _cancel_probe(probe):
+    probe.cancel()
+
+@resource("office_probe", close=_close_probe, cancel=_cancel_probe)
+def open_probe():
+    """Create the Office probe selected by replay.configure() or the environment."""
+    from .replay import make_office_probe
+    return make_office_probe()
@@ -0,0 +1,189 @@
+"""Long-lived PowerShell worker shared by every collector that needs PowerShell.
+
+A cold `powershell -Command` start costs 0.5-2 s, so instead one worker process
+stays up for the whole run and answers requests over its stdin/stdout:
+
+    request:  {"id": 1, "script": "Get-Tpm"}
+    reply:    {"id": 1, "ok": true, "result": {...}}
+              {"id": 1, "ok": false, "error": "..."}
+
+one JSON document per line. A request that outlives its timeout kills the
+worker, and a worker that has exited is restarted on the next request.
+pwsh_standin.py speaks the same protocol for running the host on Linux.
+"""
+import base64
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from .engine import resource
+
+WORKER_SCRIPT = r"""
+$ErrorActionPreference = 'Stop'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) { break }
+    $request = ConvertFrom-Json $line
+    try {
+        $result = Invoke-Expression $request.script
+        $reply = @{ id = $request.id; ok = $true; result = $result }
+    } catch {
+        $reply = @{ id = $request.id; ok = $false; error = "$($_.Exception.Message)" }
+    }
+    [Console]::Out.WriteLine((ConvertTo-Json $reply -Compress -Depth 4))
+    [Console]::Out.Flush()
+}
+"""
+
+
+class ShellError(Exception):
+    """The worker reported an error for a request, or could not answer it."""
+
+
+class ShellTimeout(ShellError, TimeoutError):
+    """A request did not get a reply within its timeout."""
+
+
+class _WorkerExited(Exception):
+    pass
+
+
+def powershell_command():
+    """Return the command line that starts the Windows PowerShell worker."""
+    encoded = base64.b64encode(WORKER_SCRIPT.encode("utf-16-le")).decode("ascii")
+    return ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-EncodedCommand", encoded]
+
+def standin_command(responses=None, latency=None):
+    """Return the command line that starts the stand-in worker, optionally with canned responses."""
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "pwsh_standin.py")]
+    if responses:
+        command.append(responses)
+    if latency:
+        command += ["--latency", str(latency)]
+    return command
+
+
+class ShellHost:
+    """Request/response client for one persistent worker process.
+
+    The worker is started lazily on the first request, so a host that is
+    never used never spawns a process. Requests are serialized.
+    """
+
+    def __init__(self, command=None, timeout=30.0):
+        self.command = list(command) if command else powershell_command()
+        self.timeout = timeout
+        self.restarts = 0
+        self._started = False
+        self._proc = None
+        self._replies = None
+        self._next_id = 0
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def run(self, script, timeout=None):
+        """Run script in the worker and return its result decoded from JSON."""
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            for attempt in range(2):
+                if self._cancelled:
+                    raise ShellError("Shell host was cancelled")
+                if self._proc is None or self._proc.poll() is not None:
+                    self._start()
+                try:
+                    return self._request(script, timeout)
+                except _WorkerExited:
+                    self._kill()
+            raise ShellError("Worker exited while handling the request")
+
+    def _start(self):
+        if self._started:
+            self.restarts += 1
+        self._started = True
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        self._proc = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      text=True, encoding="utf-8", errors="replace", bufsize=1, creationflags=flags)
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read, args=(self._proc, self._replies), daemon=True).start()
+
+    @staticmethod
+    def _read(proc, replies):
+        for line in proc.stdout:
+            replies.put(line)
+        replies.put(None)
+
+    def _request(self, script, timeout):
+        self._next_id += 1
+        request_id = self._next_id
+        try:
+            self._proc.stdin.write(json.dumps({"id": request_id, "script": script}) + "\n")
+            self._proc.stdin.flush()
+        except OSError:
+            raise _WorkerExited()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._kill()
+                raise ShellTimeout(f"No reply to {script!r} within {timeout:g}s")
+            try:
+                line = self._replies.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise _WorkerExited()
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue  # stray output that is not part of the protocol
+            if reply.get("id") != request_id:
+                continue
+            if reply.get("ok"):
+                return reply.get("result")
+            raise ShellError(reply.get("error") or "Unknown error")
+
+    def _kill(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def cancel(self):
+        """Kill the worker at once, even mid-request, and refuse further requests."""
+        self._cancelled = True
+        proc = self._proc
+        if proc is not None:
+            proc.kill()
+
+    def close(self):
+        """Ask the worker to exit, killing it if it does not."""
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+                self._proc.wait()
+            self._proc = None
+
+
+def _close_shell(shell):
+    shell.close()
+
+def _cancel_shell(shell):
+    shell.cancel()
+
+@resource("powershell", close=_close_shell, cancel=_cancel_shell)
+def start_shell():
+    """Create the PowerShell host shared by a report run; the worker starts on first use."""
+    from .replay import make_shell
+    return make_shell()
@@ -0,0 +1,61 @@
+"""Stand-in for the PowerShell worker, for exercising ShellHost without Windows.
+
+    python pwsh_standin.py [responses.json] [--latency SECONDS|recorded]
+
+Speaks the same one-JSON-document-per-line protocol as the worker started by
+pwsh.powershell_command(). responses.json maps script text to either
+{"result": <value>} or {"error": "<message>"}; a replay fixture (see
+replay.py) works too, its "powershell" part is used. --latency sleeps before
+each canned reply, either a fixed time or the "seconds" recorded with it.
+
+Two built-in scripts help test the host: "Start-Sleep -Seconds N" sleeps
+before replying, and "exit N" makes the worker exit without replying, as a
+crashed worker would.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+
+
+def answer(script, responses, latency=None):
+    """Return the reply fields for script."""
+    match = re.fullmatch(r"Start-Sleep -Seconds ([\d.]+)", script)
+    if match:
+        time.sleep(float(match.group(1)))
+        return {"ok": True, "result": None}
+    match = re.fullmatch(r"exit (\d+)", script)
+    if match:
+        sys.exit(int(match.group(1)))
+    if script in responses:
+        canned = responses[script]
+        delay = canned.get("seconds", 0) if latency == "recorded" else float(latency or 0)
+        if delay:
+            time.sleep(delay)
+        if "error" in canned:
+            return {"ok": False, "error": canned["error"]}
+        return {"ok": True, "result": canned.get("result")}
+    command = script.split()[0] if script.split() else script
+    return {"ok": False, "error": f"The term '{command}' is not recognized as the name of a cmdlet, function, script file, or operable program."}
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in PowerShell worker.")
+    parser.add_argument("responses", nargs="?", help="JSON file of canned responses or a replay fixture")
+    parser.add_argument("--latency", help="seconds to sleep before each canned reply, or 'recorded'")
+    args = parser.parse_args()
+
+    responses = {}
+    if args.responses:
+        with open(args.responses, encoding="utf-8") as f:
+            responses = json.load(f)
+        responses = responses.get("powershell", responses)
+    for line in sys.stdin:
+        request = json.loads(line)
+        reply = {"id": request["id"]}
+        reply.update(answer(request["script"], responses, args.latency))
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Record and replay of WMI and PowerShell results through fixture files.
+
+A recording run wraps the live providers and writes every projected WQL result
+and every PowerShell reply, with the time each took, to a JSON fixture:
+
+    {"wmi":        {"<wql>": {"rows": [{...}, ...], "seconds": 0.012}},
+     "powershell": {"<script>": {"result": ..., "seconds": 0.8}},
+     "office":     {"click_to_run": {...}, "ospp": "<path>", "dstatus": {"<path>": {...}}, ...},
+     "host":       {"firmware": {...}, "memory_total": 17179869184, "platform": {...}}}
+
+A replay run serves the fixture instead. WQL goes through ReplayProvider,
+PowerShell goes through the stand-in worker and the Office registry and cscript
+answers come from ReplayOfficeProbe, so the report script and the GUIs run on
+a Linux build box. What the sections read from the OS directly (the firmware
+probe, the installed memory, the platform module) goes through host().
+Latency can be injected per query, either a fixed number of seconds or
+"recorded" to reuse the timings captured in the fixture.
+
+Select the mode with configure(), or for the GUIs with the SYSINFO_REPLAY,
+SYSINFO_RECORD and SYSINFO_REPLAY_LATENCY environment variables.
+"""
+import copy
+import json
+import os
+import threading
+import time
+
+from .office_probe import LiveOfficeProbe
+from .pwsh import ShellError, ShellHost, ShellTimeout, standin_command
+from .wmi_session import LiveProvider, Record
+
+_settings = {
+    "replay": os.environ.get("SYSINFO_REPLAY"),
+    "record": os.environ.get("SYSINFO_RECORD"),
+    "latency": os.environ.get("SYSINFO_REPLAY_LATENCY"),
+}
+_write_lock = threading.Lock()
+# Fixture path -> its "host" answers, read once
+_host_answers = {}
+
+
+def configure(replay=None, record=None, latency=None):
+    """Replay from or record to a fixture file for every session opened afterwards."""
+    _settings.update(replay=replay, record=record, latency=latency)
+
+def replaying():
+    """Return True when sessions are served from a fixture."""
+    return bool(_settings["replay"])
+
+def recording():
+    """Return True when sessions are being recorded to a fixture."""
+    return bool(_settings["record"])
+
+def make_wmi_provider():
+    """Return the WMI provider selected by configure() or the environment."""
+    if _settings["replay"]:
+        return ReplayProvider(_settings["replay"], _settings["latency"])
+    if _settings["record"]:
+        return RecordingProvider(LiveProvider(), _settings["record"])
+    return LiveProvider()
+
+def make_shell():
+    """Return the PowerShell host selected by configure() or the environment."""
+    if _settings["replay"]:
+        return ShellHost(standin_command(_settings["replay"], _settings["latency"]))
+    if _settings["record"]:
+        return RecordingShell(ShellHost(), _settings["record"])
+    return ShellHost()
+
+def make_office_probe():
+    """Return the Office probe selected by configure() or the environment."""
+    if _settings["replay"]:
+        return ReplayOfficeProbe(_settings["replay"], _settings["latency"])
+    if _settings["record"]:
+        return RecordingOfficeProbe(LiveOfficeProbe(), _settings["record"])
+    return LiveOfficeProbe()
+
+def load_fixture(path):
+    """Return the fixture stored at path, or an empty one."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+    data.setdefault("wmi", {})
+    data.setdefault("powershell", {})
+    data.setdefault("office", {})
+    data.setdefault("host", {})
+    return data
+
+def _merge_fixture(path, kind, entries):
+    """Add entries to one part of the fixture at path, keeping everything already there."""
+    with _write_lock:
+        data = load_fixture(path)
+        data[kind].update(entries)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+def host(name, read):
+    """Return read(), the live answer to a direct OS query, or the fixture's answer to it when replaying.
+
+    A recording run saves the answer under name.
+    """
+    if _settings["replay"]:
+        answers = _host_answers.get(_settings["replay"])
+        if answers is None:
+            answers = _host_answers[_settings["replay"]] = load_fixture(_settings["replay"])["host"]
+        if name not in answers:
+            raise LookupError(f"No recorded host answer for: {name}")
+        # A copy, since callers may fill in the answer
+        return copy.deepcopy(answers[name])
+    value = read()
+    if _settings["record"]:
+        _merge_fixture(_settings["record"], "host", {name: value})
+    return value
+
+def _plain(value):
+    """Convert a WMI property value into something JSON can hold."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return str(value)
+
+def _select_list(wql):
+    return [prop.strip() for prop in wql[len("SELECT "):wql.index(" FROM ")].split(",")]
+
+def _latency(latency, recorded):
+    if not latency:
+        return 0.0
+    if latency == "recorded":
+        return recorded or 0.0
+    return float(latency)
+
+
+class RecordingProvider:
+    """Passes queries through to another provider and saves the results on close."""
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self._entries = {}
+
+    def connect(self):
+        self.inner.connect()
+
+    def query(self, wql):
+        start = time.perf_counter()
+        props = _select_list(wql)
+        rows = [{prop: _plain(getattr(row, prop, None)) for prop in props} for row in self.inner.query(wql)]
+        self._entries[wql] = {"rows": rows, "seconds": time.perf_counter() - start}
+        return [Record(**row) for row in rows]
+
+    def close(self):
+        _merge_fixture(self.path, "wmi", self._entries)
+        self.inner.close()
+
+
+class ReplayProvider:
+    """Serves WQL results from a fixture, optionally sleeping to mimic query latency."""
+
+    def __init__(self, path, latency=None):
+        self.path = path
+        self.latency = latency
+        self._queries = load_fixture(path)["wmi"]
+
+    def connect(self):
+        pass
+
+    def query(self, wql):
+        entry = self._queries.get(wql)
+        if entry is None:
+            raise LookupError(f"No recorded result for: {wql}")
+        delay = _latency(self.latency, entry.get("seconds"))
+        if delay:
+            time.sleep(delay)
+        return [Record(**row) for row in entry["rows"]]
+
+    def close(self):
+        pass
+
+
+class RecordingShell:
+    """A ShellHost wrapper that saves every reply to the fixture on close."""
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self._entries = {}
+
+    def run(self, script, timeout=None):
+        start = time.perf_counter()
+        try:
+            result = self.inner.run(script, timeout)
+        except ShellTimeout:
+            raise
+        except ShellError as e:
+            self._entries[script] = {"error": str(e), "seconds": time.perf_counter() - start}
+            raise
+        self._entries[script] = {"result": result, "seconds": time.perf_counter() - start}
+        return result
+
+    def close(self):
+        if self._entries:
+            _merge_fixture(self.path, "powershell", self._entries)
+        self.inner.close()
+
+    def cancel(self):
+        self.inner.cancel()
+
+
+class RecordingOfficeProbe:
+    """An Office probe wrapper that saves every answer to the fixture on close.
+
+    A missing registry key is recorded as null and raised again on replay.
+    """
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self._entries = {}
+
+    def _missing(self, name, func):
+        try:
+            value = func()
+        except FileNotFoundError:
+            self._entries[name] = None
+            raise
+        self._entries[name] = value
+        return value
+
+    def _timed(self, name, func, ospp_path):
+        start = time.perf_counter()
+        value = func(ospp_path)
+        self._entries.setdefault(name, {})[ospp_path] = {"value": value, "seconds": time.perf_counter() - start}
+        return value
+
+    def click_to_run(self):
+        return self._missing("click_to_run", self.inner.click_to_run)
+
+    def legacy_versions(self):
+        return self._missing("legacy_versions", self.inner.legacy_versions)
+
+    def find_ospp(self):
+        self._entries["ospp"] = self.inner.find_ospp()
+        return self._entries["ospp"]
+
+    def ospp_state(self, ospp_path):
+        return self._timed("ospp_state", self.inner.ospp_state, ospp_path)
+
+    def dstatus(self, ospp_path):
+        return self._timed("dstatus", self.inner.dstatus, ospp_path)
+
+    def close(self):
+        if self._entries:
+            _merge_fixture(self.path, "office", self._entries)
+        self.inner.close()
+
+    def cancel(self):
+        self.inner.cancel()
+
+
+class ReplayOfficeProbe:
+    """Serves the Office registry, ospp.vbs and cscript answers from a fixture."""
+
+    def __init__(self, path, latency=None):
+        self.path = path
+        self.latency = latency
+        self._answers = load_fixture(path)["office"]
+
+    def _answer(self, name):
+        if name not in self._answers:
+            raise LookupError(f"No recorded Office answer for: {name}")
+        return self._answers[name]
+
+    def _missing(self, name):
+        value = self._answer(name)
+        if value is None:
+            raise FileNotFoundError(name)
+        return value
+
+    def _timed(self, name, ospp_path):
+        entry = self._answer(name).get(ospp_path)
+        if entry is None:
+            raise LookupError(f"No recorded Office answer for: {name} {ospp_path}")
+        delay = _latency(self.latency, entry.get("seconds"))
+        if delay:
+            time.sleep(delay)
+        return entry["value"]
+
+    def click_to_run(self):
+        return dict(self._missing("click_to_run"))
+
+    def legacy_versions(self):
+        return list(self._missing("legacy_versions"))
+
+    def find_ospp(self):
+        return self._answer("ospp")
+
+    def ospp_state(self, ospp_path):
+        return self._timed("ospp_state", ospp_path)
+
+    def dstatus(self, ospp_path):
+        return self._timed("dstatus", ospp_path)
+
+    def close(self):
+        pass
+
+    def cancel(self):
+        pass
@@ -0,0 +1,250 @@
+"""Continuous sampling of the dynamic metrics: free memory, CPU clock, battery charge and disk free space.
+
+The report takes one snapshot; a Sampler polls only the fields that change,
+at a fixed interval, for watching a kiosk over hours. Everything static is
+worked out once when the sampler is created: which disks to watch, which
+sysfs files hold the clocks, where the battery is. On Linux those
+pseudo-files are opened once and re-read in place with os.pread, so a sample
+costs a few syscalls. Elsewhere the psutil calls behind the report's live
+fields are used. WMI is not polled, since one WQL round-trip costs
+milliseconds of CPU.
+
+    sampler = Sampler(interval=5, sink=NdjsonFile("kiosk.ndjson"))
+    sampler.run()                    # until sampler.stop() or Ctrl+C
+
+Each sample is a flat dict with the unit in the key name; a metric that
+cannot be read on this machine is None:
+
+    {"time": 1718000000.0, "memory_free_bytes": 8123456512, "cpu_mhz": 2800.0,
+     "battery_percent": 87.0, "disk_free_bytes": {"C:\\\\": 120034566144}}
+"""
+import glob
+import json
+import os
+import sys
+import threading
+import time
+
+import psutil
+
+METRICS = ("memory", "cpu", "battery", "disks")
+
+
+def local_disks():
+    """Return the mount points of the fixed local disks, as the Win32_LogicalDisk DriveType = 3 view lists them."""
+    mounts = []
+    for part in psutil.disk_partitions(all=False):
+        if sys.platform == "win32":
+            if "fixed" in part.opts:
+                mounts.append(part.mountpoint)
+        elif part.fstype not in ("squashfs", "iso9660", "") and not part.device.startswith("/dev/loop"):
+            mounts.append(part.mountpoint)
+    return mounts
+
+
+def read_whole(fd, buffer):
+    """Read the pseudo-file fd from offset 0 into buffer; return the buffer it fits in and the size read.
+
+    A read that fills the buffer may have cut the file short (a host with
+    hundreds of veth or dm devices), so the buffer is doubled and the file
+    read again. Callers keep the returned buffer for the next read.
+    """
+    while True:
+        size = os.preadv(fd, [buffer], 0)
+        if size < len(buffer):
+            return buffer, size
+        buffer = bytearray(2 * len(buffer))
+
+
+class _OpenFile:
+    """A pseudo-file kept open and re-read from offset 0 on every call."""
+
+    def __init__(self, path, size=4096):
+        self.fd = os.open(path, os.O_RDONLY)
+        self.size = size
+
+    def read(self):
+        return os.pread(self.fd, self.size, 0)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ProcfsSource:
+    """Reads the dynamic metrics from procfs/sysfs through file descriptors opened once."""
+
+    def __init__(self, root="/"):
+        self._files = []
+        self.meminfo = self._open(os.path.join(root, "proc/meminfo"))
+        self.clocks = [f for f in map(self._open, sorted(glob.glob(os.path.join(root, "sys/devices/system/cpu/cpufreq/policy*/scaling_cur_freq")))) if f]
+        # Without cpufreq (most VMs) the kernel still reports a clock in /proc/cpuinfo
+        self.cpuinfo = None if self.clocks else self._open(os.path.join(root, "proc/cpuinfo"), size=1 << 20)
+        self.battery = None
+        for supply in sorted(glob.glob(os.path.join(root, "sys/class/power_supply/*"))):
+            try:
+                with open(os.path.join(supply, "type")) as f:
+                    is_battery = f.read().strip() == "Battery"
+            except OSError:
+                continue
+            if is_battery:
+                self.battery = self._open(os.path.join(supply, "capacity"))
+                break
+
+    def _open(self, path, size=4096):
+        try:
+            handle = _OpenFile(path, size)
+        except OSError:
+            return None
+        self._files.append(handle)
+        return handle
+
+    def memory_free(self):
+        if self.meminfo is None:
+            return None
+        text = self.meminfo.read()
+        start = text.find(b"MemAvailable:")
+        if start < 0:
+            return None
+        return int(text[start + 13:text.index(b"kB", start)]) * 1024
+
+    def cpu_mhz(self):
+        if self.clocks:
+            try:
+                return sum(int(clock.read()) for clock in self.clocks) / len(self.clocks) / 1000
+            except (OSError, ValueError):
+                return None
+        if self.cpuinfo is None:
+            return None
+        speeds = [float(line.partition(b":")[2]) for line in self.cpuinfo.read().splitlines() if line.startswith(b"cpu MHz")]
+        return sum(speeds) / len(speeds) if speeds else None
+
+    def battery_percent(self):
+        if self.battery is None:
+            return None
+        try:
+            return float(self.battery.read())
+        except (OSError, ValueError):
+            return None
+
+    def close(self):
+        for handle in self._files:
+            handle.close()
+        self._files = []
+
+
+class PsutilSource:
+    """Reads the dynamic metrics through psutil, on Windows and macOS."""
+
+    def memory_free(self):
+        return psutil.virtual_memory().available
+
+    def cpu_mhz(self):
+        freq = psutil.cpu_freq()
+        return freq.current if freq and freq.current else None
+
+    def battery_percent(self):
+        battery = psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+        return float(battery.percent) if battery is not None else None
+
+    def close(self):
+        pass
+
+
+def _disk_free(mount):
+    try:
+        if hasattr(os, "statvfs"):
+            stat = os.statvfs(mount)
+            return stat.f_bavail * stat.f_frsize
+        return psutil.disk_usage(mount).free
+    except OSError:
+        return None
+
+
+class Poller:
+    """Calls sample() every interval seconds and passes each result to sink.
+
+    sink is any callable taking the sample dict, such as NdjsonFile.
+    Subclasses implement sample() and close().
+    """
+
+    def __init__(self, interval=1.0, sink=None):
+        self.interval = interval
+        self.sink = sink
+        self._stop = threading.Event()
+
+    def run(self, count=None):
+        """Sample every interval until stop() is called or count samples were taken.
+
+        Samples are due on a fixed schedule, so a slow sink does not make the
+        series drift.
+        """
+        due = time.monotonic()
+        taken = 0
+        while not self._stop.is_set() and (count is None or taken < count):
+            sample = self.sample()
+            if self.sink:
+                self.sink(sample)
+            taken += 1
+            due += self.interval
+            delay = due - time.monotonic()
+            if delay < 0:
+                # Fell behind; skip the missed slots instead of bursting
+                due = time.monotonic()
+                delay = 0
+            if count is None or taken < count:
+                self._stop.wait(delay)
+
+    def stop(self):
+        """Make run() return after the current sample; safe to call from any thread."""
+        self._stop.set()
+
+
+class Sampler(Poller):
+    """Polls free memory, CPU clock, battery charge and disk free space.
+
+    The thread CPU time spent taking samples is kept in cpu_seconds, so the
+    per-sample overhead can be checked.
+    """
+
+    def __init__(self, interval=1.0, sink=None, metrics=METRICS, disks=None, root="/"):
+        super().__init__(interval, sink)
+        self.metrics = set(metrics)
+        self.disks = (local_disks() if disks is None else list(disks)) if "disks" in self.metrics else []
+        self.source = ProcfsSource(root) if sys.platform.startswith("linux") else PsutilSource()
+        self.samples = 0
+        self.cpu_seconds = 0.0
+
+    def sample(self):
+        """Take one sample and return it."""
+        start = time.thread_time()
+        sample = {"time": time.time()}
+        if "memory" in self.metrics:
+            sample["memory_free_bytes"] = self.source.memory_free()
+        if "cpu" in self.metrics:
+            sample["cpu_mhz"] = self.source.cpu_mhz()
+        if "battery" in self.metrics:
+            sample["battery_percent"] = self.source.battery_percent()
+        if "disks" in self.metrics:
+            sample["disk_free_bytes"] = {mount: _disk_free(mount) for mount in self.disks}
+        self.cpu_seconds += time.thread_time() - start
+        self.samples += 1
+        return sample
+
+    def close(self):
+        self.source.close()
+
+
+class NdjsonFile:
+    """A sampler sink writing one JSON object per line to a path or an open stream."""
+
+    def __init__(self, target):
+        self._owned = isinstance(target, str)
+        self.stream = open(target, "a", encoding="utf-8") if self._owned else target
+
+    def __call__(self, sample):
+        self.stream.write(json.dumps(sample) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        if self._owned:
+            self.stream.close()
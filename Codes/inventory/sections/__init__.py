@@ -0,0 +1,36 @@
+"""Report sections, one collector module per section, in report order.
+
+On Linux the sections are collected from procfs and sysfs by the collectors in
+linux.py instead, unless a recorded Windows fixture is being replayed.
+"""
+import importlib
+import sys
+
+from .. import engine, replay
+from .. import office_probe  # registers the "office_probe" resource
+from .. import pwsh  # registers the "powershell" resource
+from .. import wmi_session  # registers the "wmi" resource
+
+SECTIONS = ("cpu", "ram", "board", "os", "battery", "camera", "ssd", "network", "tpm", "uefi", "office")
+# Collected only when asked for by name: they take a while or change every second
+OPTIONAL = ("processes",)
+
+_MODULES = {"os": "os_info"}
+_LINUX_SECTIONS = ("cpu", "ram", "board", "battery", "camera", "ssd", "network", "tpm", "uefi", "office")
+
+
+def backend():
+    """Return "sysfs" when the sections are read from procfs/sysfs, else "wmi"."""
+    if sys.platform.startswith("linux") and not replay.replaying():
+        return "sysfs"
+    return "wmi"
+
+def load(names=SECTIONS):
+    """Import the collector modules for names so they register with the engine."""
+    native = backend() == "sysfs"
+    for name in names:
+        module = "linux" if native and name in _LINUX_SECTIONS else _MODULES.get(name, name)
+        try:
+            importlib.import_module(f"{__name__}.{module}")
+        except ImportError as e:
+            engine.unavailable(name, e)
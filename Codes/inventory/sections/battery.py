@@ -0,0 +1,54 @@
+from ..engine import collector
+from ..helpers import wh_to_mah
+from ..model import Quantity, unknown
+
+FIELDS = ["name", "manufacturer", "chemistry", "design_capacity_wh", "full_capacity_wh", "design_capacity_mah", "full_capacity_mah", "health"]
+# Win32_Battery exposes no Manufacturer property, so that field stays "Unknown"
+PROPS = ["Name", "Chemistry", "DesignCapacity", "FullChargeCapacity", "DesignVoltage"]
+
+
+def describe(name, manufacturer, chemistry, design_capacity, full_capacity, voltage):
+    """Build the battery section from capacities in Wh and the design voltage in V."""
+    voltage = voltage or 3.7  # default 3.7V
+    health = round((full_capacity / design_capacity) * 100, 2) if design_capacity and full_capacity and design_capacity != 0 else None
+
+    def mah(watt_hours):
+        value = wh_to_mah(watt_hours, voltage)
+        return Quantity(value, "mAh") if isinstance(value, int) else unknown("mAh", value)
+    return {
+        "name": name or "Battery",
+        "manufacturer": manufacturer or "Unknown",
+        "chemistry": chemistry or None,
+        "design_capacity_wh": Quantity(design_capacity, "Wh", f"{design_capacity:.2f} Wh") if design_capacity else unknown("Wh"),
+        "full_capacity_wh": Quantity(full_capacity, "Wh", f"{full_capacity:.2f} Wh") if full_capacity else unknown("Wh"),
+        "design_capacity_mah": mah(design_capacity) if design_capacity else unknown("mAh", "N/A"),
+        "full_capacity_mah": mah(full_capacity) if full_capacity else unknown("mAh", "N/A"),
+        "health": Quantity(health, "%") if health is not None else unknown("%")
+    }
+
+def no_battery():
+    return {
+        "name": "No battery detected",
+        "manufacturer": "N/A",
+        "chemistry": None,
+        "design_capacity_wh": unknown("Wh", "N/A"),
+        "full_capacity_wh": unknown("Wh", "N/A"),
+        "design_capacity_mah": unknown("mAh", "N/A"),
+        "full_capacity_mah": unknown("mAh", "N/A"),
+        "health": unknown("%", "N/A")
+    }
+
+
+# Gather Battery Information
+@collector("battery", requires=("wmi",), fields=FIELDS)
+def collect_battery(session):
+    # Win32_Battery only has instances when a battery is installed
+    batteries = session.query("Win32_Battery", PROPS) if session else []
+    if batteries:
+        battery_static = batteries[0]
+        design_capacity = battery_static.DesignCapacity / 1000 if battery_static.DesignCapacity else None  # mWh to Wh
+        full_capacity = battery_static.FullChargeCapacity / 1000 if battery_static.FullChargeCapacity else None
+        voltage = battery_static.DesignVoltage / 1000 if battery_static.DesignVoltage else None  # mV to V
+        return describe(battery_static.Name, getattr(battery_static, "Manufacturer", None), battery_static.Chemistry,
+                        design_capacity, full_capacity, voltage)
+    return no_battery()
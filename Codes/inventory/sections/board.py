@@ -0,0 +1,16 @@
+from ..engine import collector
+
+FIELDS = ["manufacturer", "model", "serial_number"]
+PROPS = ["Manufacturer", "Product", "SerialNumber"]
+
+
+# Gather Motherboard Information
+@collector("board", requires=("wmi",), fields=FIELDS)
+def collect_board(session):
+    boards = session.query("Win32_BaseBoard", PROPS) if session else []
+    mb = boards[0] if boards else None
+    return {
+        "manufacturer": mb.Manufacturer if mb and mb.Manufacturer else "Unknown",
+        "model": mb.Product if mb and mb.Product else "Unknown",
+        "serial_number": mb.SerialNumber.strip() if mb and mb.SerialNumber else "Unknown"
+    }
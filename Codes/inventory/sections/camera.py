@@ -0,0 +1,19 @@
+from ..devices import find_device
+from ..engine import collector
+from ..helpers import estimate_camera_megapixels
+
+FIELDS = ["name", "manufacturer", "device_id", "megapixels"]
+
+
+# Gather Camera Information
+@collector("camera", requires=("wmi",), fields=FIELDS)
+def collect_camera(session):
+    camera = find_device(session, "camera") if session else None
+    if camera:
+        return {
+            "name": camera.Name if camera.Name else "Unknown",
+            "manufacturer": camera.Manufacturer if camera.Manufacturer else "Unknown",
+            "device_id": camera.DeviceID if camera.DeviceID else "Unknown",
+            "megapixels": estimate_camera_megapixels(camera.Name if camera.Name else "")
+        }
+    return {"name": "No camera detected", "manufacturer": "N/A", "device_id": "N/A", "megapixels": "N/A"}
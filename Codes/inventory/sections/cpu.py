@@ -0,0 +1,45 @@
+import psutil
+
+from ..engine import collector
+from ..helpers import get_cpu_generation
+from ..model import Quantity, unknown
+
+FIELDS = ["name", "manufacturer", "cores", "threads", "speed", "max_speed", "l1_cache", "l2_cache", "l3_cache", "family", "generation"]
+# Win32_Processor has no L1CacheSize property, so that field stays unknown
+PROPS = ["Name", "Manufacturer", "NumberOfCores", "NumberOfLogicalProcessors", "CurrentClockSpeed", "MaxClockSpeed", "L2CacheSize", "L3CacheSize", "Caption"]
+
+
+def clock(mhz):
+    return Quantity(mhz, "MHz", f"{mhz / 1000:.2f} GHz")
+
+def cache(kb):
+    return Quantity(kb, "KB", f"{kb / 1024} MB")
+
+def l1_cache(data_kb, instruction_kb):
+    """Return the L1 total in KB, with the data and instruction caches shown apart."""
+    parts = [f"{kb} KB {kind}" for kb, kind in ((data_kb, "data"), (instruction_kb, "instruction")) if kb]
+    return Quantity((data_kb or 0) + (instruction_kb or 0), "KB", " + ".join(parts))
+
+def live_cpu():
+    """Return the current clock speed, the only CPU field that changes between boots."""
+    freq = psutil.cpu_freq()
+    return {"speed": clock(freq.current)} if freq and freq.current else {}
+
+# Gather CPU Information
+@collector("cpu", requires=("wmi",), fields=FIELDS, live=live_cpu)
+def collect_cpu(session):
+    processors = session.query("Win32_Processor", PROPS) if session else []
+    cpu = processors[0] if processors else None
+    return {
+        "name": cpu.Name.strip() if cpu and cpu.Name else "Unknown",
+        "manufacturer": cpu.Manufacturer if cpu and cpu.Manufacturer else "Unknown",
+        "cores": cpu.NumberOfCores if cpu and cpu.NumberOfCores else None,
+        "threads": cpu.NumberOfLogicalProcessors if cpu and cpu.NumberOfLogicalProcessors else None,
+        "speed": clock(cpu.CurrentClockSpeed) if cpu and cpu.CurrentClockSpeed else unknown("MHz"),
+        "max_speed": clock(cpu.MaxClockSpeed) if cpu and cpu.MaxClockSpeed else unknown("MHz"),
+        "l1_cache": cache(cpu.L1CacheSize) if cpu and hasattr(cpu, 'L1CacheSize') and cpu.L1CacheSize else unknown("KB"),
+        "l2_cache": cache(cpu.L2CacheSize) if cpu and hasattr(cpu, 'L2CacheSize') and cpu.L2CacheSize else unknown("KB"),
+        "l3_cache": cache(cpu.L3CacheSize) if cpu and hasattr(cpu, 'L3CacheSize') and cpu.L3CacheSize else unknown("KB"),
+        "family": cpu.Caption if cpu and cpu.Caption else "Unknown",
+        "generation": get_cpu_generation(cpu.Name if cpu and cpu.Name else "")
+    }
@@ -0,0 +1,119 @@
+"""Collectors for Linux, filled from procfs and sysfs (see inventory/sysfs.py).
+
+They produce the same fields as the WMI collectors but need no resources, so
+a Linux report never opens a WMI session or starts PowerShell.
+"""
+import platform
+
+from .. import firmware, replay, sysfs
+from ..engine import collector
+from ..helpers import MEMORY_TYPES, estimate_camera_megapixels, get_cpu_generation
+from ..model import Quantity, size, unknown
+# Importing the WMI modules for their FIELDS and shared formatting also registers
+# their collectors; the ones defined below replace them
+from . import battery, board, camera, cpu, network, office, ram, ssd, tpm, uefi
+
+# POWER_SUPPLY_TECHNOLOGY to the Win32_Battery Chemistry codes the report shows
+CHEMISTRY = {"NiCd": 4, "NiMH": 5, "Li-ion": 6, "Li-poly": 8, "Unknown": 2}
+
+
+@collector("cpu", fields=cpu.FIELDS, live=cpu.live_cpu)
+def collect_cpu():
+    info = sysfs.cpu()
+    caches = info["cache_kb"]
+    arch = {"GenuineIntel": "Intel64", "AuthenticAMD": "AMD64"}.get(info["vendor"], platform.machine())
+    return {
+        "name": info["name"] or "Unknown",
+        "manufacturer": info["vendor"] or "Unknown",
+        "cores": info["cores"] or None,
+        "threads": info["threads"] or None,
+        "speed": cpu.clock(info["current_mhz"]) if info["current_mhz"] else unknown("MHz"),
+        "max_speed": cpu.clock(info["max_mhz"]) if info["max_mhz"] else unknown("MHz"),
+        "l1_cache": cpu.l1_cache(caches.get("L1d"), caches.get("L1i")) if caches.get("L1d") or caches.get("L1i") else unknown("KB"),
+        "l2_cache": cpu.cache(caches["L2"]) if caches.get("L2") else unknown("KB"),
+        "l3_cache": cpu.cache(caches["L3"]) if caches.get("L3") else unknown("KB"),
+        "family": f"{arch} Family {info['family']} Model {info['model']} Stepping {info['stepping']}" if info["family"] else "Unknown",
+        "generation": get_cpu_generation(info["name"] or "")
+    }
+
+@collector("ram", fields=ram.FIELDS)
+def collect_ram():
+    devices = sysfs.memory_devices()
+    first_ram = devices[0] if devices else {}
+    return {
+        "total": size(sysfs.memory_total_bytes()),
+        "type": MEMORY_TYPES.get(first_ram.get("memory_type")),
+        "speed": Quantity(first_ram["speed_mts"], "MHz") if first_ram.get("speed_mts") else unknown("MHz"),
+        "manufacturer": first_ram.get("manufacturer") or "Unknown",
+        "part_number": first_ram.get("part_number") or "Unknown",
+        "serial_number": first_ram.get("serial_number") or "Unknown"
+    }
+
+@collector("board", fields=board.FIELDS)
+def collect_board():
+    ids = sysfs.dmi()
+    return {
+        "manufacturer": ids["board_vendor"] or "Unknown",
+        "model": ids["board_name"] or "Unknown",
+        "serial_number": ids["board_serial"] or "Unknown"
+    }
+
+@collector("battery", fields=battery.FIELDS)
+def collect_battery():
+    found = sysfs.batteries()
+    if not found:
+        return battery.no_battery()
+    bat = found[0]
+    return battery.describe(bat["name"], bat["manufacturer"], CHEMISTRY.get(bat["technology"], 1 if bat["technology"] else None),
+                            bat["design_wh"], bat["full_wh"], bat["voltage"])
+
+@collector("camera", fields=camera.FIELDS)
+def collect_camera():
+    found = sysfs.cameras()
+    if found:
+        cam = found[0]
+        return {
+            "name": cam["name"] or "Unknown",
+            "manufacturer": cam["manufacturer"] or "Unknown",
+            "device_id": cam["device_id"] or "Unknown",
+            "megapixels": estimate_camera_megapixels(cam["name"] or "")
+        }
+    return {"name": "No camera detected", "manufacturer": "N/A", "device_id": "N/A", "megapixels": "N/A"}
+
+@collector("ssd")
+def collect_ssd():
+    ssd_details = []
+    for disk in sysfs.disks():
+        # The kernel flags non-rotational media, so no model-name guessing is needed
+        if not disk["rotational"]:
+            ssd_details.append(ssd.describe(disk["model"] or disk["name"], disk["vendor"], disk["size_bytes"],
+                                            disk["interface"], disk["serial_number"]))
+    return ssd_details
+
+@collector("network")
+def collect_network():
+    return [network.describe(f"{adapter['name']} ({adapter['driver']})" if adapter["driver"] else adapter["name"],
+                             adapter["mac"], adapter["ip"], adapter["subnet"], adapter["gateway"], adapter["dns"])
+            for adapter in sysfs.network()]
+
+@collector("tpm", fields=tpm.FIELDS)
+def collect_tpm():
+    chip = sysfs.tpm()
+    if chip is None:
+        return {"present": False, "ready": False, "version": "N/A", "status": "No TPM detected"}
+    return {
+        "present": True,
+        "ready": bool(chip["ready"]),
+        # sysfs has no firmware version, so this is the TPM spec version
+        "version": f"{chip['version_major']}.0" if chip["version_major"] else "Unknown",
+        "status": "Enabled and Ready" if chip["ready"] else "Not Ready or Disabled"
+    }
+
+@collector("uefi", fields=uefi.FIELDS)
+def collect_uefi():
+    # /sys/firmware/efi/efivars has the SecureBoot variable, so there is no PowerShell fallback
+    return uefi.describe(replay.host("firmware", firmware.probe))
+
+@collector("office", fields=office.FIELDS)
+def collect_office():
+    return office.not_installed()
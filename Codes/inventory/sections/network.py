@@ -0,0 +1,23 @@
+from ..engine import collector
+
+PROPS = ["Description", "MACAddress", "IPAddress", "IPSubnet", "DefaultIPGateway", "DNSServerSearchOrder"]
+
+
+def describe(description, mac, ip, subnet, gateway, dns):
+    """Build one adapter entry; the address fields are lists of strings."""
+    return {
+        "description": description or "Unknown",
+        "mac": mac or "Unknown",
+        "ip": list(ip or []),
+        "subnet": list(subnet or []),
+        "gateway": list(gateway or []),
+        "dns": list(dns or []),
+    }
+
+
+# Gather Network Adapter Information
+@collector("network", requires=("wmi",))
+def collect_network(session):
+    adapters = session.query("Win32_NetworkAdapterConfiguration", PROPS, where="IPEnabled = TRUE") if session else []
+    return [describe(adapter.Description, adapter.MACAddress, adapter.IPAddress, adapter.IPSubnet,
+                     adapter.DefaultIPGateway, adapter.DNSServerSearchOrder) for adapter in adapters]
@@ -0,0 +1,52 @@
+import re
+
+from ..engine import collector
+from ..office_cache import license_cache
+
+FIELDS = ["installed", "install_type", "version", "edition", "license_status", "product_key"]
+
+
+def read_license(probe, ospp_path):
+    """Run ospp.vbs /dstatus and return {"status": ..., "product_key": last 5 chars or None}."""
+    license_output = probe.dstatus(ospp_path)
+    license_status = "Unknown"
+    if "LICENSE STATUS:  ---LICENSED---" in license_output:
+        license_status = "Activated"
+    elif "LICENSE STATUS:  ---UNLICENSED---" in license_output:
+        license_status = "Not Activated"
+    elif "LICENSE STATUS:  ---GRACE---" in license_output:
+        license_status = "In Grace Period (Trial or Expired)"
+    match = re.search(r"Last 5 characters of installed product key: (\w{5})", license_output)
+    return {"status": license_status, "product_key": match.group(1) if match else None}
+
+def not_installed():
+    """Return the section for a machine without Office."""
+    return {"installed": False, "install_type": None, "version": None, "edition": None, "license_status": None, "product_key": None}
+
+
+# Gather Microsoft Office Details
+@collector("office", requires=("office_probe",), fields=FIELDS)
+def get_office_details(probe):
+    """Return the installation as FIELDS; license_status is None where it cannot be checked."""
+    try:
+        config = probe.click_to_run()
+        if "ProductReleaseIds" not in config:
+            raise FileNotFoundError("ProductReleaseIds")
+    except FileNotFoundError:
+        try:
+            subkeys = probe.legacy_versions()
+        except Exception:
+            return not_installed()
+        if not subkeys:
+            return not_installed()
+        return {"installed": True, "install_type": "Legacy", "version": max(subkeys), "edition": None,
+                "license_status": None, "product_key": None}
+    office_version = config["ProductReleaseIds"]
+    office = {"installed": True, "install_type": "ClickToRun", "version": office_version, "edition": office_version,
+              "license_status": None, "product_key": None}
+    ospp_path = probe.find_ospp()
+    if ospp_path:
+        license = license_cache.get(license_cache.make_key(config, probe.ospp_state(ospp_path)), lambda: read_license(probe, ospp_path))
+        office["license_status"] = license["status"]
+        office["product_key"] = license["product_key"]
+    return office
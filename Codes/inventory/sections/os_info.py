@@ -0,0 +1,16 @@
+import platform
+
+from .. import replay
+from ..engine import collector
+
+FIELDS = ["version", "build"]
+
+
+# Gather OS Information
+@collector("os", fields=FIELDS)
+def collect_os():
+    info = replay.host("platform", lambda: {"system": platform.system(), "release": platform.release(), "version": platform.version()})
+    return {
+        "version": f"{info['system']} {info['release']}",
+        "build": info["version"]
+    }
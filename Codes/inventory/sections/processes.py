@@ -0,0 +1,31 @@
+import time
+
+from ..engine import collector
+from ..model import Quantity, size
+from ..procs import ProcessSampler
+
+FIELDS = ["count", "cpu", "memory"]
+TOP_N = 5
+# CPU % needs two readings; the section waits this long between them
+SAMPLE_SECONDS = 0.5
+
+
+def describe(row):
+    return {
+        "pid": row["pid"],
+        "name": row["name"],
+        "cpu": Quantity(round(row["cpu_percent"], 1), "%", f"{row['cpu_percent']:.1f}%"),
+        "memory": size(row["rss_bytes"]),
+    }
+
+# Gather the busiest processes right now
+@collector("processes", fields=FIELDS)
+def collect_processes():
+    sampler = ProcessSampler(n=TOP_N, keys=("cpu", "memory"))
+    time.sleep(SAMPLE_SECONDS)
+    sampler.update()
+    return {
+        "count": sampler.count,
+        "cpu": [describe(row) for row in sampler.rows("cpu")],
+        "memory": [describe(row) for row in sampler.rows("memory")],
+    }
@@ -0,0 +1,25 @@
+import psutil
+
+from .. import replay
+from ..engine import collector
+from ..helpers import MEMORY_TYPES
+from ..model import Quantity, size, unknown
+
+FIELDS = ["total", "type", "speed", "manufacturer", "part_number", "serial_number"]
+PROPS = ["SMBIOSMemoryType", "Speed", "Manufacturer", "PartNumber", "SerialNumber"]
+
+
+# Gather RAM Information
+@collector("ram", requires=("wmi",), fields=FIELDS)
+def collect_ram(session):
+    ram = session.query("Win32_PhysicalMemory", PROPS) if session else []
+    total_ram = replay.host("memory_total", lambda: psutil.virtual_memory().total if hasattr(psutil, 'virtual_memory') else 0)
+    first_ram = ram[0] if ram else None
+    return {
+        "total": size(total_ram),
+        "type": MEMORY_TYPES.get(first_ram.SMBIOSMemoryType) if first_ram else None,
+        "speed": Quantity(first_ram.Speed, "MHz") if first_ram and first_ram.Speed else unknown("MHz"),
+        "manufacturer": first_ram.Manufacturer if first_ram and first_ram.Manufacturer else "Unknown",
+        "part_number": first_ram.PartNumber.strip() if first_ram and first_ram.PartNumber else "Unknown",
+        "serial_number": first_ram.SerialNumber.strip() if first_ram and first_ram.SerialNumber else "Unknown"
+    }
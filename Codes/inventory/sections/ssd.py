@@ -0,0 +1,32 @@
+from ..engine import collector
+from ..model import size
+
+PROPS = ["Model", "Manufacturer", "Size", "InterfaceType", "SerialNumber", "MediaType"]
+# Keys of each SSD entry; the section itself is a list of them
+FIELDS = ["model", "manufacturer", "size", "interface", "serial_number"]
+
+
+def describe(model, manufacturer, size_bytes, interface, serial_number):
+    """Build one SSD entry; an empty section list means no SSD was found."""
+    return {
+        "model": model,
+        "manufacturer": manufacturer or "Unknown",
+        "size": size(size_bytes),
+        "interface": interface or "Unknown",
+        "serial_number": serial_number or "Unknown",
+    }
+
+
+# Gather SSD Information
+@collector("ssd", requires=("wmi",))
+def collect_ssd(session):
+    ssd_details = []
+    if session:
+        disks = session.query("Win32_DiskDrive", PROPS)
+        for disk in disks:
+            media_type = (disk.MediaType or '').lower()
+            model = disk.Model.lower() if disk.Model else ""
+            if "ssd" in media_type or "ssd" in model:
+                ssd_details.append(describe(disk.Model, disk.Manufacturer, int(disk.Size) if disk.Size else 0,
+                                            disk.InterfaceType, disk.SerialNumber.strip() if disk.SerialNumber else None))
+    return ssd_details
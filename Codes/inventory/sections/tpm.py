@@ -0,0 +1,21 @@
+from ..engine import collector
+from ..pwsh import ShellError, ShellTimeout
+
+FIELDS = ["present", "ready", "version", "status"]
+
+
+# Gather TPM Information
+@collector("tpm", requires=("powershell",), fields=FIELDS)
+def collect_tpm(shell):
+    try:
+        tpm_data = shell.run("Get-Tpm")
+    except ShellTimeout:
+        raise
+    except ShellError:
+        return {"present": False, "ready": False, "version": "N/A", "status": "No TPM detected"}
+    return {
+        "present": bool(tpm_data.get("TpmPresent", False)),
+        "ready": bool(tpm_data.get("TpmReady", False)),
+        "version": tpm_data.get("ManufacturerVersion", "Unknown"),
+        "status": "Enabled and Ready" if tpm_data.get("TpmPresent") and tpm_data.get("TpmReady") else "Not Ready or Disabled"
+    }
@@ -0,0 +1,39 @@
+from .. import firmware, replay
+from ..engine import collector
+from ..pwsh import ShellError
+
+FIELDS = ["status", "secure_boot"]
+
+
+def describe(fw):
+    """Build the section from a firmware.probe() result."""
+    uefi_info = {}
+    if fw["mode"] == "UEFI":
+        if fw["secure_boot"] is None:
+            uefi_info["status"] = "Enabled (UEFI Mode, Secure Boot status unknown)"
+            uefi_info["secure_boot"] = "Unknown"
+        else:
+            uefi_info["status"] = "Enabled (UEFI Mode with Secure Boot)" if fw["secure_boot"] else "Enabled (UEFI Mode without Secure Boot)"
+            uefi_info["secure_boot"] = "Enabled" if fw["secure_boot"] else "Disabled"
+    elif fw["mode"] == "BIOS":
+        uefi_info["status"] = "Disabled (Legacy/BIOS Mode)"
+        uefi_info["secure_boot"] = "N/A"
+    else:
+        # GetFirmwareType answered neither BIOS nor UEFI
+        uefi_info["status"] = "Unknown"
+        uefi_info["secure_boot"] = "Unknown"
+    return uefi_info
+
+
+# Gather UEFI Status
+@collector("uefi", requires=("powershell",), fields=FIELDS)
+def collect_uefi(shell):
+    # A failed probe reaches the engine, which reports the section as an error
+    fw = replay.host("firmware", firmware.probe)
+    if fw["mode"] == "UEFI" and fw["secure_boot"] is None:
+        # Firmware did not report it directly; ask the shared PowerShell worker
+        try:
+            fw["secure_boot"] = bool(shell.run("Confirm-SecureBootUEFI"))
+        except ShellError:
+            pass
+    return describe(fw)
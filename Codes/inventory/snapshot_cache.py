@@ -0,0 +1,153 @@
+"""On-disk cache of report sections, each with its own validity policy.
+
+Motherboard serials, CPU models, BIOS versions and RAM part numbers do not
+change while the machine is up, so those sections are kept until the next
+reboot. Sections that drift (battery wear, hot-pluggable cameras) get a TTL in
+seconds, and live counters are never cached. Office has its own licence cache
+(office_cache.py) and is not kept here. The whole snapshot is dropped
+when the boot ID or the hardware signature changes.
+"""
+import json
+import os
+import sys
+import time
+
+import psutil
+
+from .helpers import cache_dir
+from .model import from_plain, to_plain
+
+UNTIL_REBOOT = "boot"
+NEVER = 0
+# Bumped whenever the shape of a stored section changes
+FORMAT = 5
+
+SECTION_POLICIES = {
+    "cpu": UNTIL_REBOOT,
+    "ram": UNTIL_REBOOT,
+    "board": UNTIL_REBOOT,
+    "os": UNTIL_REBOOT,
+    "battery": 300,
+    "camera": 300,
+    "ssd": UNTIL_REBOOT,
+    "network": 300,
+    "tpm": UNTIL_REBOOT,
+    "uefi": UNTIL_REBOOT,
+    # office is left out: office_cache.license_cache already skips ospp.vbs until
+    # Office changes, and a snapshot hit would ignore --refresh-office
+}
+
+
+def boot_id():
+    """Return an identifier that changes on every boot."""
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        return str(round(psutil.boot_time()))
+
+def hardware_signature():
+    """Return a cheap fingerprint of the installed hardware for change detection."""
+    battery = psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+    signature = [
+        psutil.cpu_count(),
+        psutil.virtual_memory().total,
+        sorted(part.device for part in psutil.disk_partitions()),
+        battery is not None,
+    ]
+    if sys.platform.startswith("linux"):
+        for bus in ("/sys/bus/pci/devices", "/sys/bus/usb/devices", "/sys/block"):
+            try:
+                signature.append(sorted(os.listdir(bus)))
+            except OSError:
+                signature.append(None)
+    elif sys.platform == "win32":
+        import winreg
+        for enum_key in (r"SYSTEM\CurrentControlSet\Enum\USB", r"SYSTEM\CurrentControlSet\Enum\PCI"):
+            try:
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, enum_key) as key:
+                    signature.append(winreg.QueryInfoKey(key)[0])
+            except OSError:
+                signature.append(None)
+    return signature
+
+def _has_error(value):
+    if isinstance(value, str):
+        return value.startswith("Error")
+    if isinstance(value, dict):
+        return any(_has_error(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_error(item) for item in value)
+    return False
+
+
+class SnapshotCache:
+    """Report sections persisted to a JSON file and served while their policy allows.
+
+    Pass an instance as engine.run(cache=...). Sections whose value carries an
+    error are never stored.
+    """
+
+    def __init__(self, path=None, policies=SECTION_POLICIES):
+        self.path = path or os.path.join(cache_dir(), "snapshot.json")
+        self.policies = policies
+        self._boot_id = boot_id()
+        self._hardware = hardware_signature()
+        self._sections = self._load()
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("format") != FORMAT or data.get("boot_id") != self._boot_id or data.get("hardware") != self._hardware:
+            return {}
+        return data.get("sections", {})
+
+    def get(self, name):
+        """Return (True, value) for a still-valid cached section, else (False, None)."""
+        policy = self.policies.get(name, NEVER)
+        entry = self._sections.get(name)
+        if policy == NEVER or entry is None:
+            return False, None
+        if policy != UNTIL_REBOOT and time.time() - entry["time"] > policy:
+            return False, None
+        return True, from_plain(entry["value"])
+
+    def put(self, name, value):
+        """Store a freshly collected section if its policy allows caching."""
+        if self.policies.get(name, NEVER) == NEVER or _has_error(value):
+            return
+        self._sections[name] = {"time": time.time(), "value": to_plain(value, text=True)}
+        self._dirty = True
+
+    def revalidate(self):
+        """Drop every section if the hardware changed since the cache was loaded; return True if it did.
+
+        A short-lived report process never needs this, but a long-running one
+        (the resident agent) must notice a disk or dock being plugged in.
+        """
+        hardware = hardware_signature()
+        if hardware == self._hardware:
+            return False
+        self._hardware = hardware
+        self.clear()
+        return True
+
+    def clear(self):
+        """Forget every cached section."""
+        self._sections = {}
+        self._dirty = True
+
+    def save(self):
+        """Write the snapshot back to disk if anything changed."""
+        if not self._dirty:
+            return
+        data = {"format": FORMAT, "boot_id": self._boot_id, "hardware": self._hardware, "sections": self._sections}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+        self._dirty = False
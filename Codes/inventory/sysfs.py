@@ -0,0 +1,281 @@
+"""Hardware inventory read straight from procfs and sysfs on Linux.
+
+Every reader opens a handful of small pseudo-files (one read each) under
+/proc, /sys/class/dmi, /sys/class/power_supply, /sys/block, /sys/class/net and
+/sys/class/tpm, and never starts a subprocess, so a full inventory costs a few
+milliseconds. Values are returned raw, with the unit in the key name; the
+Linux collectors in sections/linux.py format them like the WMI ones.
+
+Each reader takes the filesystem root, so a captured tree can stand in for
+the live one.
+"""
+import glob
+import os
+import socket
+import struct
+
+import psutil
+
+
+def _read(root, path):
+    """Return the stripped text of root/path, or None when it cannot be read."""
+    try:
+        with open(os.path.join(root, path), encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _read_int(root, path):
+    text = _read(root, path)
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return None
+
+def _uevent(root, path):
+    """Return the KEY=value pairs of a uevent file as a dict."""
+    pairs = {}
+    for line in (_read(root, path) or "").splitlines():
+        key, _, value = line.partition("=")
+        pairs[key] = value
+    return pairs
+
+def _link_name(root, path):
+    """Return the last component of the symlink at root/path, or None."""
+    target = os.path.join(root, path)
+    return os.path.basename(os.path.realpath(target)) if os.path.lexists(target) else None
+
+def _cpu_count(cpu_list):
+    """Return how many CPUs a list such as "0-3,8" names."""
+    count = 0
+    for part in cpu_list.split(","):
+        first, _, last = part.partition("-")
+        count += int(last) - int(first) + 1 if last else 1
+    return count
+
+
+def cpu(root="/"):
+    """Return the first processor's identity, topology, clocks and cache totals in KB ("L1d", "L1i", "L2", "L3")."""
+    blocks = []
+    for block in (_read(root, "proc/cpuinfo") or "").split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            key, _, value = line.partition(":")
+            fields[key.strip()] = value.strip()
+        if "processor" in fields:
+            blocks.append(fields)
+    first = blocks[0] if blocks else {}
+    threads = len(blocks) or os.cpu_count()
+    cores = len({(b.get("physical id"), b.get("core id")) for b in blocks}) if "core id" in first else None
+
+    cache_kb = {}
+    for index in glob.glob(os.path.join(root, "sys/devices/system/cpu/cpu0/cache/index*")):
+        level = _read(index, "level")
+        size = _read(index, "size")
+        shared = _read(index, "shared_cpu_list")
+        if not level or not size or not size.endswith("K"):
+            continue
+        # Named as lscpu does: L1d and L1i, then L2, L3 for unified caches
+        name = f"L{level}" + {"Data": "d", "Instruction": "i"}.get(_read(index, "type"), "")
+        # sysfs gives one instance's size; count the instances to get the total
+        instances = max(1, threads // _cpu_count(shared)) if shared else 1
+        cache_kb[name] = cache_kb.get(name, 0) + int(size[:-1]) * instances
+
+    max_khz = _read_int(root, "sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq")
+    return {
+        "name": first.get("model name"),
+        "vendor": first.get("vendor_id"),
+        "family": first.get("cpu family"),
+        "model": first.get("model"),
+        "stepping": first.get("stepping"),
+        "cores": cores,
+        "threads": threads,
+        "current_mhz": float(first["cpu MHz"]) if first.get("cpu MHz") else None,
+        "max_mhz": max_khz / 1000 if max_khz else None,
+        "cache_kb": cache_kb,
+    }
+
+def memory_total_bytes(root="/"):
+    """Return MemTotal from /proc/meminfo in bytes."""
+    for line in (_read(root, "proc/meminfo") or "").splitlines():
+        if line.startswith("MemTotal:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+def _smbios_strings(raw, length):
+    """Return the string set that follows an SMBIOS structure's formatted area."""
+    return [s.decode("ascii", "replace").strip() for s in raw[length:].split(b"\0\0", 1)[0].split(b"\0")]
+
+def memory_devices(root="/"):
+    """Return the populated SMBIOS type 17 (Memory Device) entries.
+
+    The raw tables are only readable by root; other users get an empty list.
+    """
+    devices = []
+    for entry in sorted(glob.glob(os.path.join(root, "sys/firmware/dmi/entries/17-*"))):
+        try:
+            with open(os.path.join(entry, "raw"), "rb") as f:
+                raw = f.read()
+        except OSError:
+            continue
+        length = raw[1]
+        if length < 0x1B:
+            continue
+        size = struct.unpack_from("<H", raw, 0x0C)[0]
+        if size == 0:
+            continue  # empty slot
+        strings = _smbios_strings(raw, length)
+
+        def text(offset):
+            number = raw[offset]
+            return strings[number - 1] if 0 < number <= len(strings) else None
+        devices.append({
+            "memory_type": raw[0x12],
+            "speed_mts": struct.unpack_from("<H", raw, 0x15)[0] or None,
+            "manufacturer": text(0x17),
+            "serial_number": text(0x18),
+            "part_number": text(0x1A),
+        })
+    return devices
+
+def dmi(root="/"):
+    """Return the board and BIOS identity from /sys/class/dmi/id; serials need root."""
+    names = ["board_vendor", "board_name", "board_serial", "sys_vendor", "product_name", "product_serial", "bios_version"]
+    return {name: _read(root, f"sys/class/dmi/id/{name}") for name in names}
+
+def batteries(root="/"):
+    """Return every system battery (not peripheral ones) with energies in Wh and voltage in V."""
+    found = []
+    for supply in sorted(glob.glob(os.path.join(root, "sys/class/power_supply/*"))):
+        props = _uevent(supply, "uevent")
+        if props.get("POWER_SUPPLY_TYPE") != "Battery" or props.get("POWER_SUPPLY_SCOPE") == "Device":
+            continue
+        voltage = int(props["POWER_SUPPLY_VOLTAGE_MIN_DESIGN"]) / 1e6 if props.get("POWER_SUPPLY_VOLTAGE_MIN_DESIGN") else None
+
+        def energy_wh(kind):
+            if props.get(f"POWER_SUPPLY_ENERGY_{kind}"):
+                return int(props[f"POWER_SUPPLY_ENERGY_{kind}"]) / 1e6  # uWh
+            if props.get(f"POWER_SUPPLY_CHARGE_{kind}") and voltage:
+                return int(props[f"POWER_SUPPLY_CHARGE_{kind}"]) / 1e6 * voltage  # uAh
+            return None
+        found.append({
+            "name": props.get("POWER_SUPPLY_MODEL_NAME") or os.path.basename(supply),
+            "manufacturer": props.get("POWER_SUPPLY_MANUFACTURER"),
+            "technology": props.get("POWER_SUPPLY_TECHNOLOGY"),
+            "design_wh": energy_wh("FULL_DESIGN"),
+            "full_wh": energy_wh("FULL"),
+            "voltage": voltage,
+            "capacity_percent": int(props["POWER_SUPPLY_CAPACITY"]) if props.get("POWER_SUPPLY_CAPACITY") else None,
+        })
+    return found
+
+def disks(root="/"):
+    """Return the physical block devices; loop, ram, zram and device-mapper nodes are skipped."""
+    found = []
+    for block in sorted(glob.glob(os.path.join(root, "sys/block/*"))):
+        name = os.path.basename(block)
+        if not os.path.isdir(os.path.join(block, "device")):
+            continue
+        path = os.path.realpath(block)
+        if name.startswith("nvme"):
+            interface = "NVMe"
+        elif name.startswith("mmcblk"):
+            interface = "MMC"
+        elif "/usb" in path:
+            interface = "USB"
+        elif "/ata" in path:
+            interface = "SATA"
+        elif name.startswith("vd"):
+            interface = "virtio"
+        else:
+            interface = "SCSI"
+        sectors = _read_int(block, "size")
+        found.append({
+            "name": name,
+            "model": _read(block, "device/model"),
+            "vendor": _read(block, "device/vendor"),
+            "serial_number": _read(block, "device/serial"),
+            "size_bytes": sectors * 512 if sectors is not None else None,  # always 512-byte units
+            "rotational": _read(block, "queue/rotational") == "1",
+            "interface": interface,
+        })
+    return found
+
+def _default_gateways(root):
+    """Return {interface: [gateway, ...]} from the IPv4 routing table."""
+    gateways = {}
+    for line in (_read(root, "proc/net/route") or "").splitlines()[1:]:
+        fields = line.split()
+        if len(fields) > 3 and fields[1] == "00000000" and int(fields[3], 16) & 0x2:
+            gateways.setdefault(fields[0], []).append(socket.inet_ntoa(struct.pack("<I", int(fields[2], 16))))
+    return gateways
+
+def _nameservers(root):
+    servers = []
+    for line in (_read(root, "etc/resolv.conf") or "").splitlines():
+        fields = line.split()
+        if len(fields) > 1 and fields[0] == "nameserver":
+            servers.append(fields[1])
+    return servers
+
+def network(root="/", addresses=None):
+    """Return every non-loopback interface that has an IP address, with its gateways and DNS servers.
+
+    addresses defaults to psutil.net_if_addrs(), which reads them with getifaddrs().
+    """
+    addresses = psutil.net_if_addrs() if addresses is None else addresses
+    gateways = _default_gateways(root)
+    dns = _nameservers(root)
+    found = []
+    for net in sorted(glob.glob(os.path.join(root, "sys/class/net/*"))):
+        name = os.path.basename(net)
+        if _read(net, "type") == "772":  # ARPHRD_LOOPBACK
+            continue
+        ips, masks = [], []
+        for addr in addresses.get(name, []):
+            if addr.family in (socket.AF_INET, socket.AF_INET6):
+                ips.append(addr.address.split("%")[0])
+                if addr.family == socket.AF_INET and addr.netmask:
+                    masks.append(addr.netmask)
+        if not ips:
+            continue
+        found.append({
+            "name": name,
+            "driver": _link_name(net, "device/driver"),
+            "mac": (_read(net, "address") or "").upper() or None,
+            "ip": ips,
+            "subnet": masks,
+            "gateway": gateways.get(name, []),
+            "dns": dns,
+        })
+    return found
+
+def tpm(root="/"):
+    """Return the first TPM's spec version and state, or None when there is none."""
+    chips = sorted(glob.glob(os.path.join(root, "sys/class/tpm/tpm*")))
+    if not chips:
+        return None
+    chip = chips[0]
+    major = _read_int(chip, "tpm_version_major")
+    # TPM 1.2 chips expose enabled/active flags; a bound TPM 2.0 driver means it is usable
+    enabled = _read_int(chip, "device/enabled")
+    active = _read_int(chip, "device/active")
+    ready = (enabled, active) == (1, 1) if enabled is not None and active is not None else major == 2
+    return {"version_major": major, "ready": ready, "description": _read(chip, "device/description")}
+
+def cameras(root="/"):
+    """Return the video capture devices with their USB vendor and path."""
+    found = []
+    for video in sorted(glob.glob(os.path.join(root, "sys/class/video4linux/video*"))):
+        # Each camera registers a metadata node too; index 0 is the capture one
+        if _read(video, "index") not in (None, "0"):
+            continue
+        # device is the USB interface; its parent holds the vendor and product IDs
+        usb = os.path.realpath(os.path.join(video, "device", ".."))
+        vendor, product = _read(usb, "idVendor"), _read(usb, "idProduct")
+        found.append({
+            "name": _read(video, "name"),
+            "manufacturer": _read(usb, "manufacturer"),
+            "device_id": f"USB\\VID_{vendor.upper()}&PID_{product.upper()}" if vendor and product else os.path.basename(video),
+        })
+    return found
@@ -0,0 +1,102 @@
+"""Static/dynamic data model behind the sysinfo GUIs.
+
+Every view splits its WMI properties into two tiers. The static tier
+(Manufacturer, Windows Directory, disk sizes, ...) is read once and kept, in
+memory and in a snapshot cache that lasts until reboot. The dynamic tier (free
+memory, free disk space, current clock, addresses) is the only part re-queried
+when a window is refreshed.
+"""
+import os
+
+from .helpers import cache_dir
+from .snapshot_cache import UNTIL_REBOOT, SnapshotCache
+from .wmi_session import Record
+
+
+class TierSpec:
+    """How one view maps onto a WMI class.
+
+    key names the property that joins the two tiers for multi-instance
+    classes (disks, adapters); single-instance classes leave it as None.
+    """
+
+    def __init__(self, wmi_class, static, dynamic=(), key=None, where=None):
+        self.wmi_class = wmi_class
+        self.static = list(static)
+        self.dynamic = list(dynamic)
+        self.key = key
+        self.where = where
+
+
+VIEWS = {
+    "os": TierSpec("Win32_OperatingSystem",
+                   static=["Name", "Version", "Manufacturer", "OSArchitecture", "BootDevice", "SystemDrive", "TotalVisibleMemorySize", "WindowsDirectory"],
+                   dynamic=["FreePhysicalMemory"]),
+    "computer": TierSpec("Win32_ComputerSystem",
+                         static=["Manufacturer", "Model", "NumberOfProcessors", "SystemType", "TotalPhysicalMemory", "Domain"]),
+    "bios": TierSpec("Win32_BIOS", static=["SerialNumber", "SMBIOSBIOSVersion"]),
+    "disks": TierSpec("Win32_LogicalDisk", static=["MediaType", "Size"], dynamic=["FreeSpace"],
+                      key="DeviceID", where="DriveType = 3"),  # DriveType 3 corresponds to local disks
+    "cpu": TierSpec("Win32_Processor",
+                    static=["Name", "NumberOfCores", "NumberOfLogicalProcessors", "MaxClockSpeed", "L2CacheSize"],
+                    dynamic=["CurrentClockSpeed"], key="DeviceID"),
+    "network": TierSpec("Win32_NetworkAdapterConfiguration", static=["Description", "MACAddress"],
+                        dynamic=["IPAddress", "IPSubnet", "DefaultIPGateway", "DNSServerSearchOrder"],
+                        key="Index", where="IPEnabled = TRUE"),
+}
+
+STATIC_POLICIES = {f"static:{name}": UNTIL_REBOOT for name in VIEWS}
+
+
+def gui_cache():
+    """Return the snapshot cache that keeps the GUIs' static tiers until reboot."""
+    return SnapshotCache(os.path.join(cache_dir(), "gui_snapshot.json"), policies=STATIC_POLICIES)
+
+
+class SystemModel:
+    """Tiered reads of the GUI views over one WmiSession."""
+
+    def __init__(self, session, cache=None, views=VIEWS):
+        self.session = session
+        self.cache = cache
+        self.views = views
+        self._static = {}
+
+    def read(self, name):
+        """Return the view's Records: the kept static tier merged with a fresh dynamic tier."""
+        spec = self.views[name]
+        static = self._static_tier(name)
+        if not spec.dynamic:
+            return static
+        live = self.session.query(spec.wmi_class, spec.dynamic + ([spec.key] if spec.key else []), spec.where, refresh=True)
+        if spec.key is None:
+            return [Record(**vars(base), **vars(row)) for base, row in zip(static, live)]
+        by_key = {getattr(row, spec.key): row for row in static}
+        if any(getattr(row, spec.key) not in by_key for row in live):
+            # A disk or adapter appeared since the static tier was read
+            by_key = {getattr(row, spec.key): row for row in self._static_tier(name, reload=True)}
+        return [Record(**{**vars(by_key.get(getattr(row, spec.key), Record())), **vars(row)}) for row in live]
+
+    def _static_tier(self, name, reload=False):
+        if name in self._static and not reload:
+            return self._static[name]
+        cache_name = f"static:{name}"
+        if self.cache is not None and not reload:
+            hit, rows = self.cache.get(cache_name)
+            if hit:
+                self._static[name] = [Record(**row) for row in rows]
+                return self._static[name]
+        spec = self.views[name]
+        rows = self.session.query(spec.wmi_class, spec.static + ([spec.key] if spec.key else []), spec.where, refresh=True)
+        self._static[name] = rows
+        if self.cache is not None:
+            self.cache.put(cache_name, [vars(row) for row in rows])
+            self.cache.save()
+        return rows
+
+    def refresh_static(self):
+        """Drop the kept static tiers so the next read fetches them again."""
+        self._static = {}
+        if self.cache is not None:
+            self.cache.clear()
+            self.cache.save()
@@ -0,0 +1,207 @@
+"""Compact in-memory history for sampler output: fixed-size columnar rings with downsampled tiers.
+
+A SeriesStore keeps each metric in its own array('d') ring, next to a shared
+timestamp ring, so a sample costs 8 bytes per metric instead of a dict.
+Coarser tiers keep the min, max and mean of every step-second bucket, which
+is how a week fits in a few megabytes:
+
+    store = SeriesStore()                      # 1 h at full rate, 1 day of minutes, 1 week of 15 min
+    Sampler(interval=1, sink=store.append).run()
+    window = store.window("memory_free_bytes", seconds=600)
+    window.time, window.mean                   # memoryviews, no copy
+
+Every ring holds its values twice over (slot i and slot i + capacity), so the
+newest n values are always one contiguous slice. A window is then a
+memoryview into the ring with no copying, at the cost of twice the storage.
+Missing readings (None) are stored as NaN. Nested dicts in a sample, like the
+sampler's disk_free_bytes, become one metric per key ("disk_free_bytes:C:\\").
+"""
+import math
+from array import array
+from bisect import bisect_left
+
+NAN = float("nan")
+# (step seconds, capacity) of the downsampled tiers
+DEFAULT_TIERS = ((60, 1440), (900, 672))
+
+
+class Ring:
+    """Fixed-capacity ring of doubles whose newest values are always contiguous."""
+
+    __slots__ = ("capacity", "data")
+
+    def __init__(self, capacity, fill=0.0):
+        self.capacity = capacity
+        self.data = array("d", [fill]) * (2 * capacity)
+
+    def put(self, slot, value):
+        self.data[slot] = self.data[slot + self.capacity] = value
+
+    def newest(self, end, count):
+        """Return a memoryview of the count values written before slot end."""
+        stop = end + self.capacity
+        return memoryview(self.data)[stop - count:stop]
+
+
+class Window:
+    """Zero-copy views of one metric over a time range.
+
+    For the full-rate tier step is None and min, max and mean are the same
+    view of the raw values.
+    """
+
+    __slots__ = ("step", "time", "min", "max", "mean")
+
+    def __init__(self, step, time, low, high, mean):
+        self.step = step
+        self.time = time
+        self.min = low
+        self.max = high
+        self.mean = mean
+
+    def __len__(self):
+        return len(self.time)
+
+
+class Tier:
+    """One resolution level: a timestamp ring plus value rings per metric, sharing one write position."""
+
+    def __init__(self, capacity, step=None):
+        self.capacity = capacity
+        self.step = step
+        self.time = Ring(capacity)
+        self.rings = {}
+        self.next = 0
+        self.count = 0
+        # The bucket being accumulated: start time and metric -> [min, max, sum, n]
+        self.bucket = None
+        self.pending = {}
+
+    def columns(self, metric):
+        """Return the metric's rings, (value,) or (min, max, mean), creating them NaN-filled for the history so far."""
+        rings = self.rings.get(metric)
+        if rings is None:
+            rings = self.rings[metric] = tuple(Ring(self.capacity, NAN) for _ in range(1 if self.step is None else 3))
+        return rings
+
+    def write(self, timestamp, values):
+        """Append one point: metric -> value for the raw tier, metric -> (min, max, mean) otherwise."""
+        slot = self.next
+        self.time.put(slot, timestamp)
+        for metric, rings in self.rings.items():
+            point = values.get(metric)
+            if self.step is None:
+                rings[0].put(slot, NAN if point is None else point)
+            else:
+                for ring, value in zip(rings, point or (NAN, NAN, NAN)):
+                    ring.put(slot, value)
+        self.next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def accumulate(self, timestamp, values):
+        """Fold a raw sample into the current bucket, writing the previous bucket out when a new one starts."""
+        bucket = timestamp - timestamp % self.step
+        if bucket != self.bucket:
+            self.flush()
+            self.bucket = bucket
+        for metric, value in values.items():
+            if value is None or math.isnan(value):
+                continue
+            acc = self.pending.get(metric)
+            if acc is None:
+                self.pending[metric] = [value, value, value, 1]
+            else:
+                acc[0] = min(acc[0], value)
+                acc[1] = max(acc[1], value)
+                acc[2] += value
+                acc[3] += 1
+
+    def flush(self):
+        """Write out the bucket being accumulated, if any."""
+        if self.bucket is None:
+            return
+        for metric in self.pending:
+            self.columns(metric)
+        self.write(self.bucket, {metric: (low, high, total / n) for metric, (low, high, total, n) in self.pending.items()})
+        self.bucket = None
+        self.pending = {}
+
+    def window(self, metric, since):
+        """Return a Window of the points at or after since, or None if the metric was never seen."""
+        rings = self.rings.get(metric)
+        if rings is None:
+            return None
+        times = self.time.newest(self.next, self.count)
+        start = bisect_left(times, since)
+        views = [ring.newest(self.next, self.count)[start:] for ring in rings]
+        if self.step is None:
+            return Window(None, times[start:], views[0], views[0], views[0])
+        return Window(self.step, times[start:], *views)
+
+    def oldest(self):
+        return self.time.newest(self.next, self.count)[0] if self.count else None
+
+    def nbytes(self):
+        rings = [self.time] + [ring for rings in self.rings.values() for ring in rings]
+        return sum(ring.data.itemsize * len(ring.data) for ring in rings)
+
+
+def flatten(sample):
+    """Return the numeric fields of a sampler sample as metric -> value, one metric per nested key."""
+    values = {}
+    for key, value in sample.items():
+        if key == "time":
+            continue
+        if isinstance(value, dict):
+            for sub, item in value.items():
+                values[f"{key}:{sub}"] = item
+        else:
+            values[key] = value
+    return values
+
+
+class SeriesStore:
+    """Per-metric ring buffers at full rate plus min/max/mean tiers; pass append as a Sampler sink."""
+
+    def __init__(self, capacity=3600, tiers=DEFAULT_TIERS):
+        self.raw = Tier(capacity)
+        self.tiers = [Tier(size, step) for step, size in sorted(tiers)]
+
+    def append(self, sample):
+        """Store one sample dict with a "time" key, such as a Sampler reading."""
+        timestamp = sample["time"]
+        values = flatten(sample)
+        for metric in values:
+            self.raw.columns(metric)
+        self.raw.write(timestamp, values)
+        for tier in self.tiers:
+            tier.accumulate(timestamp, values)
+
+    def metrics(self):
+        return list(self.raw.rings)
+
+    def window(self, metric, seconds=None, now=None):
+        """Return a Window of metric over the last seconds, from the finest tier that still covers them.
+
+        Without seconds the whole full-rate tier is returned. Points of a
+        coarser tier appear once their bucket is complete. Returns None for a
+        metric that was never sampled.
+        """
+        if self.raw.count == 0:
+            return None
+        if now is None:
+            now = self.raw.time.newest(self.raw.next, 1)[0]
+        since = -math.inf if seconds is None else now - seconds
+        tier = self.raw
+        for coarser in self.tiers:
+            oldest = tier.oldest()
+            if seconds is None or (oldest is not None and oldest <= since):
+                break
+            # Keep the finer tier while the coarser one has not filled in yet
+            if coarser.count:
+                tier = coarser
+        return tier.window(metric, since)
+
+    def nbytes(self):
+        """Return the bytes held by every ring, which does not grow once each metric has been seen."""
+        return self.raw.nbytes() + sum(tier.nbytes() for tier in self.tiers)
@@ -0,0 +1,192 @@
+"""Shared WMI session serving projected WQL queries as plain Python records.
+
+Every provider call runs on the session's own thread, so one connection can be
+shared by collectors running on any thread. Queries select only the
+properties the caller needs and the rows are copied into Records, so reading
+a field afterwards is an attribute lookup rather than another COM round-trip.
+
+The session talks to WMI through a provider: LiveProvider wraps wmi.WMI(),
+and replay.py adds providers that record results to fixture files and serve
+them back without Windows.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from .engine import resource
+
+
+class Record(SimpleNamespace):
+    """One WMI instance reduced to the selected properties."""
+
+
+def build_wql(wmi_class, props, where=None):
+    """Return the projected WQL statement for wmi_class."""
+    wql = f"SELECT {', '.join(props)} FROM {wmi_class}"
+    if where:
+        wql += f" WHERE {where}"
+    return wql
+
+
+class SessionThread:
+    """Runs submitted calls one at a time on a single daemon thread.
+
+    Like a one-worker ThreadPoolExecutor, except that a call which never
+    returns (a hung WMI provider) does not keep the process alive at exit.
+    """
+
+    def __init__(self, name="wmi"):
+        self._calls = queue.Queue()
+        threading.Thread(target=self._loop, name=name, daemon=True).start()
+
+    def _loop(self):
+        while True:
+            call = self._calls.get()
+            if call is None:
+                return
+            future, func, args = call
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+
+    def submit(self, func, *args):
+        future = Future()
+        self._calls.put((future, func, args))
+        return future
+
+    def shutdown(self):
+        """Stop the thread once the calls already submitted have run."""
+        self._calls.put(None)
+
+
+class LiveProvider:
+    """The real WMI service through the wmi package. Every method runs on the session thread."""
+
+    def connect(self):
+        import wmi
+        import pythoncom
+        pythoncom.CoInitialize()
+        self._conn = wmi.WMI()
+
+    def query(self, wql):
+        """Return the rows for wql; _raw_query enumerates forward-only, so callers may stop early."""
+        return self._conn._raw_query(wql)
+
+    def close(self):
+        import pythoncom
+        self._conn = None
+        pythoncom.CoUninitialize()
+
+
+class WmiSession:
+    """One WMI connection with a per-class cache of materialized query results.
+
+    Results are kept for the lifetime of the session, so each class is only
+    queried once however many callers read it. refresh=True is a live read of
+    exactly the requested properties that bypasses the cache, for values that
+    change between reads.
+    """
+
+    def __init__(self, provider=None):
+        if provider is None:
+            from .replay import make_wmi_provider
+            provider = make_wmi_provider()
+        self._provider = provider
+        self._thread = SessionThread()
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._declared = {}
+        self._cancelled = False
+        try:
+            self._thread.submit(provider.connect).result()
+        except Exception:
+            self._thread.shutdown()
+            raise
+
+    def declare(self, wmi_class, props, where=None):
+        """Add props to the projection used the first time wmi_class is queried."""
+        with self._lock:
+            self._declared.setdefault((wmi_class, where), set()).update(props)
+
+    def query(self, wmi_class, props, where=None, refresh=False, limit=None):
+        """Return the Records of wmi_class with only props selected.
+
+        With limit set the enumeration stops after that many rows instead of
+        materializing every match.
+        """
+        return self.query_many([(wmi_class, props, where)], refresh, limit)[0]
+
+    def query_many(self, specs, refresh=False, limit=None):
+        """Run several (class, props, where) queries in one trip to the session thread."""
+        if self._cancelled:
+            raise RuntimeError("WMI session was cancelled")
+        results = [None] * len(specs)
+        todo = []
+        with self._lock:
+            for i, (wmi_class, props, where) in enumerate(specs):
+                key = (wmi_class, where, limit)
+                if refresh:
+                    todo.append((i, key, list(props)))
+                    continue
+                cached = self._cache.get(key)
+                if cached and cached[0].issuperset(props):
+                    results[i] = cached[1]
+                    continue
+                wanted = set(props) | self._declared.get((wmi_class, where), set())
+                if cached:
+                    wanted |= cached[0]
+                todo.append((i, key, sorted(wanted)))
+        if todo:
+            fetched = self._thread.submit(self._fetch, [(key, wanted) for _, key, wanted in todo]).result()
+            with self._lock:
+                for (i, key, wanted), records in zip(todo, fetched):
+                    if not refresh:
+                        self._cache[key] = (frozenset(wanted), records)
+                    results[i] = records
+        return results
+
+    def _fetch(self, queries):
+        results = []
+        for (wmi_class, where, limit), props in queries:
+            records = []
+            for row in self._provider.query(build_wql(wmi_class, props, where)):
+                records.append(Record(**{prop: getattr(row, prop, None) for prop in props}))
+                if limit is not None and len(records) >= limit:
+                    break
+            results.append(records)
+        return results
+
+    def clear(self):
+        """Drop the cached query results but keep the connection open."""
+        with self._lock:
+            self._cache = {}
+
+    def close(self):
+        """Close the provider and stop the session thread."""
+        self._thread.submit(self._provider.close).result()
+        self._thread.shutdown()
+
+    def cancel(self):
+        """Give up on the session without waiting for a query that may never return."""
+        self._cancelled = True
+        self._thread.shutdown()
+
+
+# Initialize WMI
+def _close_session(session):
+    session.close()
+
+def _cancel_session(session):
+    session.cancel()
+
+@resource("wmi", close=_close_session, cancel=_cancel_session)
+def connect():
+    """Open the WMI session shared by every collector in a report run."""
+    try:
+        return WmiSession()
+    except Exception as e:
+        print(f"Error initializing WMI: {e}")
+        return None
@@ -0,0 +1,60 @@
+"""Resident inventory agent for Get-Systeminfo.py and the sysinfo GUIs.
+
+While it runs, the report script and the GUIs fetch their data from it over
+a local socket (a named pipe on Windows) instead of opening WMI themselves;
+see inventory/agent.py for the client and inventory/agent_server.py for
+the agent. Without an agent they collect directly, as before.
+
+    python sysinfo_agent.py              # run in the foreground until stopped
+    python sysinfo_agent.py --status
+    python sysinfo_agent.py --stop
+    python sysinfo_agent.py --listen     # also answer fleet sweeps over TCP (sysinfo_fleet.py)
+"""
+import argparse
+import sys
+
+from inventory import agent, fleet, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the inventory warm and answer queries from the report script and GUIs.")
+    parser.add_argument("--status", action="store_true", help="print whether an agent is running and exit")
+    parser.add_argument("--stop", action="store_true", help="ask the running agent to exit")
+    parser.add_argument("--sample", metavar="SECONDS", type=float,
+                        help="also sample free memory, CPU clock, battery and disk free space every SECONDS and keep their history")
+    parser.add_argument("--listen", metavar="HOST[:PORT]", nargs="?", const="0.0.0.0",
+                        help=f"also serve fleet sweeps over TCP on HOST (all interfaces by default), port {fleet.PORT} unless given")
+    parser.add_argument("--fleet-key", metavar="FILE", help="file holding the key shared with sysinfo_fleet.py (default: fleet.key in the cache folder)")
+    parser.add_argument("--replay", metavar="FIXTURE", help="serve a recorded fixture instead of the live system")
+    parser.add_argument("--replay-latency", metavar="SECONDS", help="sleep this long per replayed query, or 'recorded'")
+    args = parser.parse_args()
+
+    if args.status or args.stop:
+        client = agent.connect()
+        if client is None:
+            print(f"No agent is running at {agent.address()}")
+            sys.exit(1)
+        with client:
+            if args.stop:
+                client.request({"op": "stop"})
+                print("Agent stopped")
+            else:
+                info = client.request({"op": "ping"})
+                print(f"Agent {info['pid']} at {agent.address()}, up {info['uptime']:.0f}s, "
+                      f"backend {info['backend']}, open: {', '.join(info['resources']) or 'none'}")
+        return
+
+    # The agent's own modules (sampler, caches, psutil) are not needed for --status and --stop
+    from inventory.agent_server import Agent
+    if args.replay:
+        replay.configure(replay=args.replay, latency=args.replay_latency)
+    listen = fleet.parse_host(args.listen) if args.listen else None
+    server = Agent(sample_interval=args.sample, listen=listen, fleet_key=fleet.fleet_key(args.fleet_key) if listen else None)
+    print(f"Agent listening on {agent.address()}" + (f" and {listen[0]}:{listen[1]}" if listen else ""))
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
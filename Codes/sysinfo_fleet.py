@@ -0,0 +1,75 @@
+"""Collect the inventory of many hosts at once from their agents, as one NDJSON stream.
+
+Every host runs `python sysinfo_agent.py --listen` with the same fleet key
+(see inventory/fleet.py). The hosts file lists one host per line, optionally
+as host:port.
+
+    python sysinfo_fleet.py hosts.txt --out fleet.ndjson
+    python sysinfo_fleet.py hosts.txt --only cpu,ram,tpm --every 3600
+
+Each host is one line of the output as soon as it is done, and a last
+{"fleet": ...} line tallies the sweep and lists the hosts that failed.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from inventory import fleet, sections
+
+
+def section_list(text):
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    known = sections.SECTIONS + sections.OPTIONAL
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown section {', '.join(unknown)} (choose from {', '.join(known)})")
+    return names
+
+async def sweep(args, stream):
+    hosts = fleet.read_hosts(args.hosts)
+    client = fleet.Fleet(fleet.fleet_key(args.key), concurrency=args.concurrency, host_timeout=args.host_timeout,
+                         port=args.port)
+    try:
+        while True:
+            start = time.monotonic()
+            writer = fleet.NdjsonWriter(stream)
+            async for result in client.sweep(hosts, args.only, timeout=args.timeout, refresh=args.refresh):
+                writer.write(result)
+            tally = writer.finish(time.monotonic() - start)
+            print(f"{tally['hosts']} hosts in {tally['wall_seconds']:.1f}s: {tally['ok']} ok, {tally['partial']} partial, "
+                  f"{tally['timeout']} timed out, {tally['error']} failed", file=sys.stderr)
+            if not args.every:
+                return tally
+            # Keep the sweeps on a fixed schedule; connections are reused between them
+            await asyncio.sleep(max(0.0, args.every - (time.monotonic() - start)))
+    finally:
+        await client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the inventory agents of many hosts concurrently.")
+    parser.add_argument("hosts", help="file with one host (or host:port) per line")
+    parser.add_argument("--only", type=section_list, metavar="SECTIONS", help="comma-separated sections to ask for (default: all)")
+    parser.add_argument("--out", metavar="FILE", help="write the NDJSON here instead of standard output")
+    parser.add_argument("--key", metavar="FILE", help="file holding the fleet key (default: fleet.key in the cache folder)")
+    parser.add_argument("--port", type=int, default=fleet.PORT, help=f"agent port for hosts listed without one (default: {fleet.PORT})")
+    parser.add_argument("--concurrency", type=int, default=256, help="hosts queried at once (default: 256)")
+    parser.add_argument("--host-timeout", type=float, default=10.0, metavar="SECONDS",
+                        help="give up on a host after SECONDS, keeping the sections it sent (default: 10)")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS", help="per-collector timeout on the hosts")
+    parser.add_argument("--refresh", action="store_true", help="make the agents collect afresh instead of using their caches")
+    parser.add_argument("--every", type=float, metavar="SECONDS", help="sweep again every SECONDS until interrupted")
+    args = parser.parse_args()
+
+    stream = open(args.out, "a" if args.every else "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        tally = asyncio.run(sweep(args, stream))
+    except KeyboardInterrupt:
+        return
+    finally:
+        if args.out:
+            stream.close()
+    sys.exit(1 if tally["hosts"] and not tally["ok"] else 0)
+
+if __name__ == "__main__":
+    main()
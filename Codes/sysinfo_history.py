@@ -0,0 +1,58 @@
+"""Load inventory reports into the SQLite history and query the newest snapshot of each host.
+
+    python sysinfo_history.py import fleet.ndjson                   # sysinfo_fleet.py output
+    python sysinfo_history.py import report.json --host PC-042      # Get-Systeminfo.py --format json
+    python sysinfo_history.py query battery "health < 70"
+    python sysinfo_history.py query tpm "status = 'No TPM detected'"
+
+The tables and their columns are listed in inventory/history.py. Pass --db
+to use a file other than history.sqlite in the cache folder.
+"""
+import argparse
+import os
+import sys
+
+from inventory import ingest
+from inventory.history import TABLES, History
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep and query the inventory history.")
+    parser.add_argument("--db", metavar="FILE", help="history database (default: history.sqlite in the cache folder)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="store the reports in JSON or NDJSON files")
+    load.add_argument("files", nargs="+")
+    load.add_argument("--host", help="host name for reports that do not carry one (Get-Systeminfo.py output)")
+    query = commands.add_parser("query", help="print the rows of TABLE in each host's newest snapshot matching WHERE")
+    query.add_argument("table", choices=list(TABLES))
+    query.add_argument("where", nargs="?", default="1", help="SQL condition on the table's columns (default: every host)")
+    args = parser.parse_args()
+
+    try:
+        history = History(args.db)
+    except ValueError as e:
+        sys.exit(str(e))
+    try:
+        if args.command == "import":
+            for path in args.files:
+                with open(path, "rb") as f:
+                    body = f.read()
+                try:
+                    reports = list(ingest.parse_reports(body, args.host))
+                except ValueError as e:
+                    sys.exit(f"{path}: {e}" + ("; pass --host" if args.host is None else ""))
+                received = os.path.getmtime(path)
+                print(f"{path}: {history.add_many((host, sections, received) for host, sections in reports)} snapshots")
+            return
+        rows = history.latest(args.table, args.where)
+        for row in rows:
+            del row["snapshot_id"]
+            host = row.pop("host")
+            row.pop("received")
+            print(f"{host}: " + ", ".join(f"{name}={value}" for name, value in row.items() if value is not None))
+        print(f"{len(rows)} rows", file=sys.stderr)
+    finally:
+        history.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Inventory ingestion server: keeps the latest report of every host and answers fleet queries.
+
+    python sysinfo_ingest.py --bind 0.0.0.0:8470
+    python Get-Systeminfo.py --format json | curl --data-binary @- "http://server:8470/inventory?host=$HOSTNAME"
+    python sysinfo_fleet.py hosts.txt | curl --data-binary @- http://server:8470/inventory
+    curl "http://server:8470/count?tpm_status=No+TPM+detected&secure_boot=Disabled"
+
+See inventory/ingest.py for the endpoints. The latest reports are held in
+memory and restarting the server starts it empty; with --history every
+posted report is also kept in a SQLite file (see sysinfo_history.py).
+"""
+import argparse
+import sys
+
+from inventory import fleet, ingest
+from inventory.history import History
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accept inventory reports over HTTP and answer filter and count queries.")
+    parser.add_argument("--bind", default="127.0.0.1:8470", metavar="HOST:PORT", help="address to listen on (default: 127.0.0.1:8470)")
+    parser.add_argument("--history", metavar="FILE", nargs="?", const="",
+                        help="also append every report to this SQLite history (default file: history.sqlite in the cache folder)")
+    args = parser.parse_args()
+
+    try:
+        history = History(args.history or None) if args.history is not None else None
+    except ValueError as e:
+        sys.exit(str(e))
+    server = ingest.make_server(fleet.parse_host(args.bind, 8470), history=history)
+    print(f"Ingesting on http://{args.bind}/inventory")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if history is not None:
+            history.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
-import wmi
 import wx
 import wx.lib.agw.shapedbutton as SB
 
+from inventory import agent, details
+from inventory.diskio import DiskIoSampler
+from inventory.netio import NetIoSampler
+from inventory.procs import ProcessSampler
+from inventory.tiers import SystemModel, gui_cache
+from inventory.wmi_session import WmiSession
+
+AUTO_REFRESH_MS = 2000
+
 class SystemInfoFrame(wx.Frame):
     def __init__(self):
         if not wx.GetApp():
@@ -11,7 +19,14 @@ class SystemInfoFrame(wx.Frame):
 
         super().__init__(None, title="System Information", size=(500, 500))
         
-        self.c = wmi.WMI()
+        # Served by the resident agent (sysinfo_agent.py) when one is running
+        self.model = agent.gui_model(lambda: SystemModel(WmiSession(), cache=gui_cache()))
+        # Disk activity is shown per refresh of the System Information window
+        self.disk_io = DiskIoSampler()
+        # Live bandwidth per adapter for the Network Info window
+        self.net_io = NetIoSampler()
+        # What is using the machine right now, refreshed with the window
+        self.procs = ProcessSampler(n=10)
         panel = wx.Panel(self)
         
         main_sizer = wx.BoxSizer(wx.VERTICAL)
@@ -30,6 +45,10 @@ class SystemInfoFrame(wx.Frame):
         cpu_button.Refresh()
         cpu_button.Bind(wx.EVT_BUTTON, self.on_cpu_info)
 
+        process_button = SB.SButton(panel, label="Processes", size=(100, 50))
+        process_button.Refresh()
+        process_button.Bind(wx.EVT_BUTTON, self.on_process_info)
+
         network_button = SB.SButton(panel, label="Network Info", size=(100, 50))
         network_button.Refresh()
         network_button.Bind(wx.EVT_BUTTON, self.on_network_info)
@@ -37,6 +56,7 @@ class SystemInfoFrame(wx.Frame):
         button_sizer.Add(os_button, 0, wx.ALL, 5)
         button_sizer.Add(sys_button, 0, wx.ALL, 5)
         button_sizer.Add(cpu_button, 0, wx.ALL, 5)
+        button_sizer.Add(process_button, 0, wx.ALL, 5)
         button_sizer.Add(network_button, 0, wx.ALL, 5)
 
         main_sizer.Add(button_sizer, 0, wx.CENTER)
@@ -54,99 +74,64 @@ class SystemInfoFrame(wx.Frame):
         self.SetBackgroundColour(wx.Colour(240, 240, 255))  # Soft blue background
 
     def on_os_info(self, event):
-        details = self.fetch_os_details()
-        self.show_details("OS Information", details)
+        self.show_details("OS Information", self.fetch_os_details)
 
     def on_sys_info(self, event):
-        details = self.fetch_hw_details()
-        self.show_details("System Information", details)
+        self.show_details("System Information", self.fetch_hw_details)
 
     def on_cpu_info(self, event):
-        details = self.fetch_cpu_details()
-        self.show_details("CPU Information", details)
+        self.show_details("CPU Information", self.fetch_cpu_details)
+
+    def on_process_info(self, event):
+        self.show_details("Top Processes", self.fetch_process_details)
 
     def on_network_info(self, event):
-        details = self.fetch_network_details()
-        self.show_details("Network Information", details)
+        self.show_details("Network Information", self.fetch_network_details)
 
     def fetch_os_details(self):
-        os_info = self.c.Win32_OperatingSystem()[0]
-        return f"""
-OS Name: {os_info.Name.split('|')[0]}
-Version: {os_info.Version}
-Manufacturer: {os_info.Manufacturer}
-Architecture: {os_info.OSArchitecture}
-Boot Device: {os_info.BootDevice}
-System Drive: {os_info.SystemDrive}
-Total Visible Memory: {int(os_info.TotalVisibleMemorySize) // 1024} MB
-Free Physical Memory: {int(os_info.FreePhysicalMemory) // 1024} MB
-Windows Directory: {os_info.WindowsDirectory}
-""".strip()
+        return details.os_details(self.model)
 
     def fetch_hw_details(self):
-        computer_info = self.c.Win32_ComputerSystem()[0]
-        bios_info = self.c.Win32_BIOS()[0]
-        
-        disk_details = self.get_disk_info()
-        
-        return f"""
-Manufacturer: {computer_info.Manufacturer}
-Model: {computer_info.Model}
-Serial Number: {bios_info.SerialNumber}
-Number of Processors: {computer_info.NumberOfProcessors}
-System Type: {computer_info.SystemType}
-BIOS Version: {bios_info.SMBIOSBIOSVersion}
-Total Physical Memory: {int(computer_info.TotalPhysicalMemory) // (1024**2)} MB
-Domain Name: {computer_info.Domain}
-{disk_details}
-""".strip()
+        return details.hw_details(self.model, self.disk_io)
 
     def get_disk_info(self):
-        disk_info = ""
-        for disk in self.c.Win32_LogicalDisk(DriveType=3):  # DriveType 3 corresponds to local disks
-            total_size = int(disk.Size) // (1024**3)  # Convert to GB
-            free_space = int(disk.FreeSpace) // (1024**3)  # Convert to GB
-            disk_info += f"\nDisk {disk.DeviceID} ({disk.MediaType}):\n"
-            disk_info += f"  Total Size: {total_size} GB\n"
-            disk_info += f"  Free Space: {free_space} GB\n"
-        
-        return disk_info.strip()
+        return details.disk_info(self.model, self.disk_io)
 
     def fetch_cpu_details(self):
-        cpu_info = self.c.Win32_Processor()[0]
-        return f"""
-CPU Name: {cpu_info.Name}
-Number of Cores: {cpu_info.NumberOfCores}
-Number of Logical Processors: {cpu_info.NumberOfLogicalProcessors}
-Current Clock Speed: {cpu_info.CurrentClockSpeed} MHz
-Max Clock Speed: {cpu_info.MaxClockSpeed} MHz
-L2 Cache Size: {cpu_info.L2CacheSize} KB
-""".strip()
+        return details.cpu_details(self.model)
+
+    def fetch_process_details(self):
+        return details.process_details(self.procs)
 
     def fetch_network_details(self):
-        network_info = ""
-        for adapter in self.c.Win32_NetworkAdapterConfiguration(IPEnabled=True):
-            network_info += f"""
-Network Adapter: {adapter.Description}
-MAC Address: {adapter.MACAddress}
-IP Address: {', '.join(adapter.IPAddress) if adapter.IPAddress else 'None'}
-Subnet Mask: {adapter.IPSubnet[0] if adapter.IPSubnet else 'None'}
-Default Gateway: {', '.join(adapter.DefaultIPGateway) if adapter.DefaultIPGateway else 'None'}
-DNS Servers: {', '.join(adapter.DNSServerSearchOrder) if adapter.DNSServerSearchOrder else 'None'}
-"""
-        return network_info.strip()
-
-    def show_details(self, title, details):
+        return details.network_details(self.model, self.net_io)
+
+    def show_details(self, title, fetch):
         info_frame = wx.Frame(self, title=title, size=(400, 300))
         text_ctrl = wx.TextCtrl(info_frame, style=wx.TE_MULTILINE|wx.TE_READONLY)
-        text_ctrl.SetValue(details)
+        text_ctrl.SetValue(fetch())
         
         copy_button = wx.Button(info_frame, label="Copy to Clipboard")
-        copy_button.Bind(wx.EVT_BUTTON, lambda e: wx.TheClipboard.SetData(wx.TextDataObject(details)))
+        copy_button.Bind(wx.EVT_BUTTON, lambda e: wx.TheClipboard.SetData(wx.TextDataObject(text_ctrl.GetValue())))
+
+        # Refreshing only re-queries the dynamic fields; see inventory/tiers.py
+        refresh_button = wx.Button(info_frame, label="Refresh")
+        refresh_button.Bind(wx.EVT_BUTTON, lambda e: text_ctrl.SetValue(fetch()))
+
+        timer = wx.Timer(info_frame)
+        info_frame.Bind(wx.EVT_TIMER, lambda e: text_ctrl.SetValue(fetch()), timer)
+        auto_refresh = wx.CheckBox(info_frame, label="Auto-refresh")
+        auto_refresh.Bind(wx.EVT_CHECKBOX, lambda e: timer.Start(AUTO_REFRESH_MS) if e.IsChecked() else timer.Stop())
+        info_frame.Bind(wx.EVT_CLOSE, lambda e: (timer.Stop(), e.Skip()))
+
+        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        button_sizer.Add(copy_button, 0, wx.ALL, 5)
+        button_sizer.Add(refresh_button, 0, wx.ALL, 5)
+        button_sizer.Add(auto_refresh, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         
         sizer = wx.BoxSizer(wx.VERTICAL)
         sizer.Add(text_ctrl, 1, wx.EXPAND | wx.ALL, 5)
-        sizer.Add(copy_button, 0, wx.ALL | wx.CENTER, 5)
+        sizer.Add(button_sizer, 0, wx.CENTER)
         
         info_frame.SetSizer(sizer)
         info_frame.Show()
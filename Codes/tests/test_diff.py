@@ -0,0 +1,38 @@
+from inventory import diff
+
+
+def ssd(data, status="ok"):
+    return {"ssd": {"status": status, "data": data}}
+
+
+def test_disks_with_repeated_serials_are_compared_whole():
+    a = {"model": "A", "serial_number": "Unknown"}
+    b = {"model": "B", "serial_number": "Unknown"}
+    c = {"model": "C", "serial_number": "Unknown"}
+    changes = diff.diff(ssd([a, b]), ssd([c, b]))
+    assert changes == [{"section": "ssd", "change": "removed", "old": a},
+                       {"section": "ssd", "change": "added", "new": c}]
+
+
+def test_adapter_without_mac_is_not_lost():
+    old = {"network": {"status": "ok", "data": [{"name": "eth0", "mac": None}, {"name": "wlan0", "mac": "aa:bb"}]}}
+    new = {"network": {"status": "ok", "data": [{"name": "wlan0", "mac": "aa:bb"}]}}
+    assert diff.diff(old, new) == [{"section": "network", "change": "removed", "old": {"name": "eth0", "mac": None}}]
+
+
+def test_identical_devices_count_as_many():
+    disk = {"model": "A", "serial_number": "Unknown"}
+    assert diff.diff(ssd([disk, disk]), ssd([disk])) == [{"section": "ssd", "change": "removed", "old": disk}]
+
+
+def test_unique_serials_match_by_device():
+    old = ssd([{"model": "A", "serial_number": "S1", "size": 1}, {"model": "B", "serial_number": "S2", "size": 2}])
+    new = ssd([{"model": "B", "serial_number": "S2", "size": 2}, {"model": "A", "serial_number": "S1", "size": 3}])
+    assert diff.diff(old, new) == [{"section": "ssd", "change": "changed", "device": "S1", "field": "size", "old": 1, "new": 3}]
+
+
+def test_unchanged_and_unavailable_sections():
+    disks = [{"model": "A", "serial_number": "S1"}]
+    assert diff.diff(ssd(disks), ssd(list(disks))) == []
+    assert diff.diff(ssd(disks), ssd(None, status="timeout")) == [
+        {"section": "ssd", "change": "unavailable", "old": "ok", "new": "timeout"}]
@@ -0,0 +1,29 @@
+import os
+
+from inventory.diskio import DiskIoSampler
+
+
+def diskstats_line(major, minor, name, reads, read_sectors, writes, written_sectors):
+    return f"{major:4d} {minor:7d} {name} {reads} 0 {read_sectors} 0 {writes} 0 {written_sectors} 0 0 0 0 0 0 0 0 0 0\n"
+
+
+def test_diskstats_longer_than_the_buffer(tmp_path):
+    block = tmp_path / "sys/block/sda"
+    os.makedirs(block / "device")
+    os.makedirs(block / "queue")
+    (block / "size").write_text("1000\n")
+    (block / "queue/rotational").write_text("0\n")
+    os.makedirs(tmp_path / "proc")
+    # Enough device-mapper entries to push sda past 64 KiB, as on a host running many containers
+    lines = [diskstats_line(253, n, f"dm-{n}", 1, 8, 1, 8) for n in range(2000)]
+    stats = tmp_path / "proc/diskstats"
+    stats.write_text("".join(lines) + diskstats_line(8, 0, "sda", 10, 80, 20, 160))
+    assert stats.stat().st_size > 1 << 16
+
+    io = DiskIoSampler(root=str(tmp_path))
+    assert io.disks == ["sda"]
+    stats.write_text("".join(lines) + diskstats_line(8, 0, "sda", 30, 280, 20, 160))
+    io.update()
+    assert io.rate("sda", "read_iops") > 0
+    assert io.rate("sda", "read_bytes_per_s") > 0
+    assert io.rate("sda", "write_iops") == 0
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from inventory import engine
+
+
+@pytest.fixture
+def registry():
+    """Register collectors for one test only."""
+    collectors, resources = dict(engine._collectors), dict(engine._resources)
+    yield
+    engine._collectors.clear()
+    engine._collectors.update(collectors)
+    engine._resources.clear()
+    engine._resources.update(resources)
+
+
+def test_plan_adds_what_collectors_require(registry):
+    engine.resource("t_session")(lambda: "session")
+    engine.collector("t_a", requires=("t_session",))(lambda session: session)
+    engine.collector("t_b", requires=("t_a",))(lambda a: a)
+    assert set(engine._plan(["t_b"])) == {"t_b", "t_a", "t_session"}
+    with pytest.raises(KeyError):
+        engine._plan(["t_missing"])
+
+
+@pytest.mark.parametrize("requires, cycle", [
+    ({"t_a": ("t_b",), "t_b": ("t_c",), "t_c": ("t_a",)}, "t_a -> t_b -> t_c -> t_a"),
+    ({"t_a": ("t_a",)}, "t_a -> t_a"),
+])
+def test_cycles_are_rejected_before_anything_runs(registry, requires, cycle):
+    ran = []
+    for name, deps in requires.items():
+        engine.collector(name, requires=deps)(lambda *args, name=name: ran.append(name))
+    with pytest.raises(ValueError, match=f"Dependency cycle: {cycle}"):
+        engine.run(["t_a"])
+    assert ran == []
+
+
+def test_collectors_run_concurrently_and_after_their_resources(registry):
+    opened, closed = [], []
+    engine.resource("t_session", close=closed.append)(lambda: opened.append("session") or "session")
+
+    def slow(session):
+        time.sleep(0.2)
+        return {"session": session, "thread": threading.current_thread().name}
+    engine.collector("t_a", requires=("t_session",))(slow)
+    engine.collector("t_b", requires=("t_session",))(slow)
+    report = engine.run(["t_a", "t_b"])
+    assert report.wall < 0.35
+    assert report.sections["t_a"]["session"] == report.sections["t_b"]["session"] == "session"
+    assert opened == ["session"] and closed == ["session"]
+
+    sequential = engine.run(["t_a", "t_b"], sequential=True)
+    assert sequential.wall >= 0.4
+
+
+def test_timeout_abandons_one_collector_and_keeps_the_rest(registry):
+    release = threading.Event()
+    engine.collector("t_hung", fields=["value"])(lambda: release.wait(5))
+    engine.collector("t_fast", fields=["value"])(lambda: {"value": 1})
+    seen = {}
+    try:
+        report = engine.run(["t_hung", "t_fast"], timeout=0.1, on_section=lambda result: seen.update({result.name: result.status}))
+    finally:
+        release.set()
+    assert report.timed_out == {"t_hung"}
+    assert report.sections["t_hung"] == {"value": "Timed out after 0.1s"}
+    assert report.sections["t_fast"] == {"value": 1}
+    assert seen == {"t_hung": "timeout", "t_fast": "ok"}
+
+
+def test_per_collector_timeout_and_report_deadline(registry):
+    release = threading.Event()
+    engine.collector("t_hung", timeout=0.05)(lambda: release.wait(5))
+    engine.collector("t_slow")(lambda: release.wait(5))
+    try:
+        report = engine.run(["t_hung", "t_slow"], timeout=10, deadline=0.2)
+    finally:
+        release.set()
+    assert report.timed_out == {"t_hung", "t_slow"}
+    assert str(report.errors["t_hung"]) == "Timed out after 0.05s"
+    assert str(report.errors["t_slow"]) == "Timed out (report deadline of 0.2s)"
+    assert report.wall < 1
+
+
+def test_errors_fill_the_section_and_are_reported(registry):
+    def fail():
+        raise OSError("probe failed")
+    engine.collector("t_broken", fields=["status", "secure_boot"])(fail)
+    statuses = {}
+    report = engine.run(["t_broken"], on_section=lambda result: statuses.update({result.name: result.to_dict()}))
+    assert report.sections["t_broken"] == {"status": "Error: probe failed", "secure_boot": "Error: probe failed"}
+    assert isinstance(report.errors["t_broken"], OSError)
+    assert statuses["t_broken"]["status"] == "error"
+    assert statuses["t_broken"]["data"] is None
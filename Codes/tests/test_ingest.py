@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from inventory.ingest import InventoryStore
+
+
+def sections(generation="12th Gen", ram_type="DDR4", tpm="Enabled and Ready", secure_boot="Enabled", tpm_status="ok"):
+    return {
+        "cpu": {"status": "ok", "data": {"generation": generation}},
+        "ram": {"status": "ok", "data": {"type": ram_type}},
+        "tpm": {"status": tpm_status, "data": {"status": tpm} if tpm_status == "ok" else None},
+        "uefi": {"status": "ok", "data": {"secure_boot": secure_boot}},
+        "office": {"status": "ok", "data": {"installed": False}},
+    }
+
+
+def test_concurrent_put_and_reads():
+    store = InventoryStore()
+    errors = []
+    done = threading.Event()
+
+    def writer(worker):
+        try:
+            # Many distinct values, so the index dicts grow and shrink while readers walk them
+            for i in range(3000):
+                store.put(f"pc-{worker}-{i % 300}", sections(generation=f"gen-{(i * 7 + worker) % 500}"))
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not done.is_set():
+                store.facets("cpu_generation")
+                store.count(cpu_generation=["gen-1", "gen-2"], ram_type="DDR4")
+                store.hosts(limit=20, ram_type="DDR4")
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert len(store) == 1200
+    assert sum(store.facets("cpu_generation").values()) == 1200
+    assert store.count(ram_type="DDR4") == 1200
+
+
+def filled_store():
+    store = InventoryStore()
+    store.put("pc-1", sections(ram_type="DDR4", secure_boot="Enabled"))
+    store.put("pc-2", sections(ram_type="DDR5", secure_boot="Disabled"))
+    store.put("pc-3", sections(ram_type="DDR4", secure_boot="Disabled", tpm="No TPM detected"))
+    store.put("pc-4", sections(ram_type="DDR3", secure_boot="N/A"))
+    return store
+
+
+def test_filters_and_or_values_and_and_names():
+    store = filled_store()
+    assert store.count() == 4
+    assert store.count(ram_type="DDR4") == 2
+    assert store.count(ram_type=["DDR4", "DDR5"]) == 3
+    assert store.count(ram_type=["DDR4", "DDR5"], secure_boot="Disabled") == 2
+    assert store.count(ram_type="DDR4", secure_boot="Disabled", tpm_status="No TPM detected") == 1
+    assert store.count(ram_type="LPDDR5") == 0
+    assert store.hosts(secure_boot=["Disabled", "N/A"]) == ["pc-2", "pc-3", "pc-4"]
+    assert store.hosts(limit=2, offset=1) == ["pc-2", "pc-3"]
+    assert store.facets("ram_type") == {"DDR4": 2, "DDR5": 1, "DDR3": 1}
+    assert store.facets("office_licence") == {"Not installed": 4}
+    with pytest.raises(KeyError):
+        store.count(bios="UEFI")
+    with pytest.raises(KeyError):
+        store.facets("bios")
+
+
+def test_failed_section_keeps_the_last_good_value():
+    store = filled_store()
+    store.put("pc-1", sections(ram_type="DDR5", tpm_status="timeout"))
+    assert store.count(tpm_status="Enabled and Ready") == 3
+    assert store.count(ram_type="DDR5") == 2
+    assert store.get("pc-1")["sections"]["tpm"]["status"] == "ok"
+
+
+def test_changed_and_removed_hosts_leave_no_stale_bits():
+    store = filled_store()
+    store.put("pc-2", sections(ram_type="DDR4"))
+    assert store.facets("ram_type") == {"DDR4": 3, "DDR3": 1}
+    store.remove("pc-1")
+    assert len(store) == 3
+    assert store.count(ram_type="DDR4") == 2
+    # The freed slot is reused by the next new host
+    store.put("pc-5", sections(ram_type="DDR5"))
+    assert store.hosts(ram_type="DDR5") == ["pc-5"]
+    assert store.count() == 4
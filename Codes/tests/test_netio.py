@@ -0,0 +1,29 @@
+import os
+
+from inventory.netio import NetIoSampler
+
+HEADER = ("Inter-|   Receive                                                |  Transmit\n"
+          " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n")
+
+
+def dev_line(name, rx_bytes, tx_bytes):
+    return f"{name:>16}: {rx_bytes} 10 0 0 0 0 0 0 {tx_bytes} 20 0 0 0 0 0 0\n"
+
+
+def test_net_dev_longer_than_the_buffer(tmp_path):
+    os.makedirs(tmp_path / "sys/class/net/eth0")
+    (tmp_path / "sys/class/net/eth0/address").write_text("aa:bb:cc:dd:ee:ff\n")
+    os.makedirs(tmp_path / "proc/net")
+    # Enough veth pairs to push eth0 past 64 KiB, as on a container host
+    veths = "".join(dev_line(f"veth{n:06x}", 1, 1) for n in range(1500))
+    dev = tmp_path / "proc/net/dev"
+    dev.write_text(HEADER + veths + dev_line("eth0", 1000, 2000))
+    assert dev.stat().st_size > 1 << 16
+
+    io = NetIoSampler(root=str(tmp_path))
+    assert io.adapters == ["eth0"]
+    assert io.mac("eth0") == "AA:BB:CC:DD:EE:FF"
+    dev.write_text(HEADER + veths + dev_line("eth0", 5000, 2000))
+    io.update()
+    assert io.rate("eth0", "rx_bytes_per_s") > 0
+    assert io.rate("eth0", "tx_bytes_per_s") == 0
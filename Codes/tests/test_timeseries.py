@@ -0,0 +1,48 @@
+import math
+
+from inventory.timeseries import SeriesStore
+
+
+def test_full_rate_ring_wraps_and_stays_in_order():
+    store = SeriesStore(capacity=4, tiers=())
+    for t in range(10):
+        store.append({"time": float(t), "memory_free_bytes": t * 10.0})
+    window = store.window("memory_free_bytes")
+    assert list(window.time) == [6.0, 7.0, 8.0, 9.0]
+    assert list(window.mean) == [60.0, 70.0, 80.0, 90.0]
+    assert list(store.window("memory_free_bytes", seconds=1.5).time) == [8.0, 9.0]
+
+
+def test_missing_readings_and_new_metrics_are_nan():
+    store = SeriesStore(capacity=8, tiers=())
+    store.append({"time": 0.0, "cpu_mhz": 2000.0})
+    store.append({"time": 1.0, "cpu_mhz": None, "disk_free_bytes": {"/": 5.0}})
+    cpu = list(store.window("cpu_mhz").mean)
+    disk = list(store.window("disk_free_bytes:/").mean)
+    assert cpu[0] == 2000.0 and math.isnan(cpu[1])
+    assert math.isnan(disk[0]) and disk[1] == 5.0
+    assert store.window("battery_percent") is None
+
+
+def test_coarse_tier_keeps_min_max_mean_of_each_bucket():
+    store = SeriesStore(capacity=5, tiers=((10, 4),))
+    for t in range(35):
+        store.append({"time": float(t), "cpu_mhz": float(t % 10)})
+    # The raw ring covers only the last 5 s, so 30 s comes from the 10 s tier; the open bucket is not shown yet
+    window = store.window("cpu_mhz", seconds=30)
+    assert window.step == 10
+    assert list(window.time) == [10.0, 20.0]
+    assert list(window.min) == [0.0, 0.0]
+    assert list(window.max) == [9.0, 9.0]
+    assert list(window.mean) == [4.5, 4.5]
+
+
+def test_memory_stays_flat_once_every_tier_has_the_metric():
+    store = SeriesStore(capacity=16)
+    # The 15 min tier creates its rings when its first bucket closes
+    for t in range(1000):
+        store.append({"time": float(t), "cpu_mhz": 1.0})
+    size = store.nbytes()
+    for t in range(1000, 20000):
+        store.append({"time": float(t), "cpu_mhz": 1.0})
+    assert store.nbytes() == size
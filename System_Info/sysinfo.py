@@ -1,76 +1,80 @@
-import wmi
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk
 
+# The shared inventory package lives next to the other scripts in Codes/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Codes"))
+from inventory import agent, details
+from inventory.diskio import DiskIoSampler
+from inventory.tiers import SystemModel, gui_cache
+from inventory.wmi_session import WmiSession
+
+AUTO_REFRESH_MS = 2000
+
 def fetch_os_details():
-    os_info = c.Win32_OperatingSystem()[0]
-    details = f"""
-OS Name: {os_info.Name.split('|')[0]}
-Version: {os_info.Version}
-Manufacturer: {os_info.Manufacturer}
-Architecture: {os_info.OSArchitecture}
-Boot Device: {os_info.BootDevice}
-System Drive: {os_info.SystemDrive}
-Total Visible Memory: {int(os_info.TotalVisibleMemorySize) // 1024} MB
-Free Physical Memory: {int(os_info.FreePhysicalMemory) // 1024} MB
-Windows Directory: {os_info.WindowsDirectory}
-"""
-    return details.strip()
+    return details.os_details(model)
 
 def fetch_hw_details():
-    computer_info = c.Win32_ComputerSystem()[0]
-    bios_info = c.Win32_BIOS()[0]
-    
-    # Getting disk information
-    disk_details = get_disk_info()
-
-    details = f"""
-Manufacturer: {computer_info.Manufacturer}
-Model: {computer_info.Model}
-Serial Number: {bios_info.SerialNumber}
-Number of Processors: {computer_info.NumberOfProcessors}
-System Type: {computer_info.SystemType}
-BIOS Version: {bios_info.SMBIOSBIOSVersion}
-Total Physical Memory: {int(computer_info.TotalPhysicalMemory) // (1024**2)} MB
-Domain Name: {computer_info.Domain}
-{disk_details}
-"""
-    return details.strip()
+    return details.hw_details(model, disk_io)
 
 def get_disk_info():
-    # Initialize WMI to fetch disk data
-    disk_info = ""
-    for disk in c.Win32_LogicalDisk(DriveType=3):  # DriveType 3 corresponds to local disks
-        total_size = int(disk.Size) // (1024**3)  # Convert to GB
-        free_space = int(disk.FreeSpace) // (1024**3)  # Convert to GB
-        disk_info += f"\nDisk {disk.DeviceID} ({disk.MediaType}):\n"
-        disk_info += f"  Total Size: {total_size} GB\n"
-        disk_info += f"  Free Space: {free_space} GB\n"
-    
-    return disk_info.strip()
-
-def display_details(details, title):
+    return details.disk_info(model, disk_io)
+
+def display_details(fetch, title):
     # Create a new window to display the information
     info_window = tk.Toplevel(root)
     info_window.title(title)
 
-    # Display details
+    # Display details; refreshing only re-queries the dynamic fields
     text_widget = tk.Text(info_window, wrap=tk.WORD, height=20, width=60)
-    text_widget.insert(tk.END, details)
-    text_widget.config(state=tk.DISABLED)
     text_widget.pack(padx=10, pady=10)
 
+    def show_details():
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert(tk.END, fetch())
+        text_widget.config(state=tk.DISABLED)
+
+    show_details()
+
     # Add a copy button
     def copy_to_clipboard():
         root.clipboard_clear()
-        root.clipboard_append(details)
+        root.clipboard_append(text_widget.get("1.0", tk.END).strip())
         root.update()  # Ensures the clipboard is updated
 
     copy_btn = ttk.Button(info_window, text="Copy to Clipboard", command=copy_to_clipboard)
     copy_btn.pack(pady=10)
 
-# Create the WMI object
-c = wmi.WMI()
+    refresh_btn = ttk.Button(info_window, text="Refresh", command=show_details)
+    refresh_btn.pack(pady=5)
+
+    # Auto-refresh re-runs the fetch every AUTO_REFRESH_MS while ticked
+    auto_refresh = tk.BooleanVar(value=False)
+    pending = []
+
+    def tick():
+        pending.clear()
+        if auto_refresh.get():
+            show_details()
+            pending.append(info_window.after(AUTO_REFRESH_MS, tick))
+
+    def toggle_auto_refresh():
+        for after_id in pending:
+            info_window.after_cancel(after_id)
+        pending.clear()
+        if auto_refresh.get():
+            pending.append(info_window.after(AUTO_REFRESH_MS, tick))
+
+    auto_btn = ttk.Checkbutton(info_window, text="Auto-refresh", variable=auto_refresh, command=toggle_auto_refresh)
+    auto_btn.pack(pady=5)
+
+# Ask the resident agent (sysinfo_agent.py) if one is running, else create the
+# shared WMI session and the static/dynamic data model here
+model = agent.gui_model(lambda: SystemModel(WmiSession(), cache=gui_cache()))
+# Disk activity is shown per refresh of the System Information window
+disk_io = DiskIoSampler()
 
 # Main GUI window
 root = tk.Tk()
@@ -78,11 +82,11 @@ root.title("System Information")
 root.geometry("300x250")
 
 # Button for OS information
-btn_os = ttk.Button(root, text="OS Information", command=lambda: display_details(fetch_os_details(), "OS Information"))
+btn_os = ttk.Button(root, text="OS Information", command=lambda: display_details(fetch_os_details, "OS Information"))
 btn_os.pack(expand=True, pady=10)
 
 # Button for System (Hardware) information
-btn_sys = ttk.Button(root, text="System Information", command=lambda: display_details(fetch_hw_details(), "System Information"))
+btn_sys = ttk.Button(root, text="System Information", command=lambda: display_details(fetch_hw_details, "System Information"))
 btn_sys.pack(expand=True, pady=10)
 
 root.mainloop()
@@ -92,4 +96,4 @@ root.mainloop()
 #pip install pyinstaller
 #pip install tkinter
 #pip install wmi-client-wrapper-py3
-#pyinstaller --onefile --noconsole --icon=icon.ico sysinfo.py
+#pyinstaller sysinfo.spec   (onedir build: run dist/sysinfo/sysinfo.exe)
@@ -3,32 +3,32 @@
 
 a = Analysis(
     ['sysinfo.py'],
-    pathex=[],
+    pathex=['../Codes'],
     binaries=[],
     datas=[],
-    hiddenimports=['wmi'],
+    hiddenimports=['wmi', 'pythoncom'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Used by the resident agent, fleet sweeps and the ingest server, never by this GUI
+    excludes=['inventory.agent_server', 'inventory.fleet', 'inventory.ingest', 'inventory.history'],
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
+# A onedir build: a onefile exe unpacks Python and every module to a temporary
+# folder on every start before any of the GUI code runs
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='sysinfo',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
     upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +36,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name='sysinfo',
+)